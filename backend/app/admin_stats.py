@@ -0,0 +1,203 @@
+"""
+Materialized admin dashboard statistics
+
+The dashboard used to download every blog post, publication, project and
+message just to count them. The numbers now live in admin_stats, one row
+per (stat, key), and are adjusted inside the same transaction as every
+write, like publication_facets:
+
+    blog        total / published / draft
+    paper       total
+    research    total
+    message     total / unread
+    blog_month  "YYYY-MM" -> blog posts created that month
+
+Every write touches its entity's rows, so the newest updated_at of an
+entity is its last-updated time. Rows are changed with one
+INSERT ... ON CONFLICT (stat, key) DO UPDATE SET count = count + n,
+so concurrent writers never lose a change or race to create a row. Loading the dashboard is one SELECT over this small table.
+
+Usage:
+    python -m app.admin_stats rebuild
+"""
+
+import sys
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, insert
+
+from .models import AdminStat, BlogPost, ContactMessage, Publication, ResearchProject
+
+# Entity -> the keys it always has a row for
+ENTITIES = {
+    "blog": ("total", "published", "draft"),
+    "paper": ("total",),
+    "research": ("total",),
+    "message": ("total", "unread"),
+}
+
+
+def stat_keys(entity, item):
+    """The (stat, key) rows one blog post / publication / project / message counts towards"""
+    if item is None:
+        return []
+    keys = [(entity, "total")]
+    if entity == "blog":
+        keys.append(("blog", "published" if item.published else "draft"))
+        if item.created_at:
+            keys.append(("blog_month", item.created_at.strftime("%Y-%m")))
+    elif entity == "message" and not item.read:
+        keys.append(("message", "unread"))
+    return keys
+
+
+def _upsert(dialect_name):
+    """INSERT ... ON CONFLICT (stat, key) DO UPDATE SET count = count + :delta"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    statement = insert(AdminStat.__table__)
+    return statement.on_conflict_do_update(
+        index_elements=["stat", "key"],
+        set_={
+            "count": AdminStat.__table__.c.count + bindparam("delta"),
+            "updated_at": statement.excluded.updated_at,
+        },
+    )
+
+
+def adjust(db, stat, key, delta):
+    """Add `delta` to one row (creating it if needed) and mark it updated"""
+    db.execute(_upsert(db.get_bind().dialect.name), {
+        "stat": stat,
+        "key": key,
+        "count": max(delta, 0),
+        "delta": delta,
+        "updated_at": datetime.utcnow(),
+    })
+
+
+def apply_change(db, entity, before, after):
+    """
+    Adjust counts for one item going from `before` to `after`
+    (stat_keys() lists; either may be empty for create / delete).
+    Always touches the entity's "total" row.
+    """
+    deltas = Counter(after)
+    deltas.subtract(Counter(before))
+    deltas[(entity, "total")] += 0
+    for (stat, key), delta in deltas.items():
+        if delta or key == "total":
+            adjust(db, stat, key, delta)
+
+
+def touch(db, entity):
+    """Mark an entity updated by a write that changes no counts"""
+    adjust(db, entity, "total", 0)
+
+
+def _counts(db, entity):
+    """{(stat, key): count} for one entity, straight from its table"""
+    counts = {(entity, key): 0 for key in ENTITIES[entity]}
+    if entity == "blog":
+        for published, count in db.query(BlogPost.published, func.count(BlogPost.id)).group_by(BlogPost.published):
+            counts[("blog", "published" if published else "draft")] += count
+            counts[("blog", "total")] += count
+        for (created_at,) in db.query(BlogPost.created_at).filter(BlogPost.created_at.is_not(None)):
+            month = ("blog_month", created_at.strftime("%Y-%m"))
+            counts[month] = counts.get(month, 0) + 1
+    elif entity == "paper":
+        counts[("paper", "total")] = db.query(func.count(Publication.id)).scalar()
+    elif entity == "research":
+        counts[("research", "total")] = db.query(func.count(ResearchProject.id)).scalar()
+    else:
+        counts[("message", "total")] = db.query(func.count(ContactMessage.id)).scalar()
+        counts[("message", "unread")] = db.query(func.count(ContactMessage.id))\
+            .filter(ContactMessage.read.is_not(True))\
+            .scalar()
+    return counts
+
+
+def _replace(db, stats, counts):
+    now = datetime.utcnow()
+    db.query(AdminStat).filter(AdminStat.stat.in_(stats)).delete(synchronize_session=False)
+    if counts:
+        db.execute(insert(AdminStat), [
+            {"stat": stat, "key": key, "count": count, "updated_at": now}
+            for (stat, key), count in counts.items()
+        ])
+
+
+def recount(db, entity):
+    """Recompute one entity's rows (after bulk UPDATE / DELETE); caller commits"""
+    stats = [entity, "blog_month"] if entity == "blog" else [entity]
+    _replace(db, stats, _counts(db, entity))
+
+
+def rebuild_stats(db):
+    """Recompute every row from scratch"""
+    counts = {}
+    for entity in ENTITIES:
+        counts.update(_counts(db, entity))
+    _replace(db, list(ENTITIES) + ["blog_month"], counts)
+    db.commit()
+    return len(counts)
+
+
+def ensure_stats(db):
+    """Build stats once for databases that predate them"""
+    if db.query(AdminStat).first() is None:
+        rows = rebuild_stats(db)
+        print(f"✅ Built {rows} admin statistics")
+
+
+def get_stats(db, months: int = 12):
+    """Dashboard numbers: counts and last-updated time per entity, recent posts per month"""
+    result = {entity: {key: 0 for key in keys} for entity, keys in ENTITIES.items()}
+    for entity in result:
+        result[entity]["last_updated"] = None
+    per_month = []
+    for row in db.query(AdminStat):
+        if row.stat == "blog_month":
+            if row.count > 0:
+                per_month.append({"month": row.key, "count": row.count})
+            continue
+        if row.stat not in result:
+            continue
+        entity = result[row.stat]
+        entity[row.key] = row.count
+        if row.updated_at and (entity["last_updated"] is None or row.updated_at > entity["last_updated"]):
+            entity["last_updated"] = row.updated_at
+
+    per_month.sort(key=lambda item: item["month"])
+    return {
+        "blogs": result["blog"],
+        "papers": result["paper"],
+        "research": result["research"],
+        "messages": result["message"],
+        "posts_per_month": per_month[-months:],
+    }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv != ["rebuild"]:
+        print("Usage: python -m app.admin_stats rebuild")
+        return 1
+
+    from .database import SessionLocal, init_db
+
+    init_db()
+    db = SessionLocal()
+    try:
+        rows = rebuild_stats(db)
+    finally:
+        db.close()
+    print(f"✅ Rebuilt {rows} admin statistics")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Admission control and load shedding
+
+All routes are sync, so they run in the fixed-size AnyIO threadpool and
+then wait for a DB connection. Under a spike, requests pile up in those
+queues until clients time out without an answer. This middleware admits
+each request into a per-class concurrency limit first:
+
+    health        /health, /ready, /api/health
+    auth          /api/auth/*
+    contact_post  POST /api/contact/
+    admin_write   any other POST / PUT / PATCH / DELETE
+    public_read   everything else (GET / HEAD)
+
+A request that cannot get a slot within ADMISSION_QUEUE_TIMEOUT_SECONDS,
+or finds ADMISSION_MAX_QUEUE requests of its class already waiting, is
+answered right away with 503 and Retry-After. Limits are per worker
+process. Keep their sum below the threadpool size, so health checks and
+logins always have reserved capacity.
+"""
+
+import asyncio
+import json
+
+from . import metrics
+from .config import settings
+
+DEFAULT_LIMITS = {
+    "health": 2,
+    "auth": 2,
+    "contact_post": 4,
+    "admin_write": 4,
+    "public_read": 24,
+}
+
+_HEALTH_PATHS = ("/health", "/ready", "/api/health")
+
+
+def classify(method: str, path: str):
+    """Route class of a request"""
+    if path in _HEALTH_PATHS:
+        return "health"
+    if path.startswith("/api/auth/"):
+        return "auth"
+    if method == "POST" and path in ("/api/contact", "/api/contact/"):
+        return "contact_post"
+    if method in ("POST", "PUT", "PATCH", "DELETE"):
+        return "admin_write"
+    return "public_read"
+
+
+def parse_limits(value: str):
+    """ "public_read=24,auth=2" -> dict merged over DEFAULT_LIMITS"""
+    limits = dict(DEFAULT_LIMITS)
+    for item in (value or "").split(","):
+        if "=" in item:
+            name, limit = item.split("=", 1)
+            if name.strip() in limits:
+                limits[name.strip()] = max(1, int(limit))
+    return limits
+
+
+class Gate:
+    """A concurrency limit with a bounded number of waiters"""
+
+    def __init__(self, name: str, limit: int, max_queue: int):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def acquire(self, timeout: float):
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            return False
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        self.admitted += 1
+        return True
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self):
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+class AdmissionControlMiddleware:
+    """Pure ASGI middleware - no per-request Request/Response objects"""
+
+    def __init__(self, app, limits=None, queue_timeout=None, max_queue=None, retry_after=None):
+        self.app = app
+        self.queue_timeout = settings.ADMISSION_QUEUE_TIMEOUT_SECONDS if queue_timeout is None else queue_timeout
+        self.retry_after = settings.ADMISSION_RETRY_AFTER_SECONDS if retry_after is None else retry_after
+        limits = limits or parse_limits(settings.ADMISSION_LIMITS)
+        max_queue = settings.ADMISSION_MAX_QUEUE if max_queue is None else max_queue
+        self.gates = {name: Gate(name, limit, max_queue) for name, limit in limits.items()}
+        gates.update(self.gates)
+
+    async def __call__(self, scope, receive, send):
+        # CORS preflights are answered by CORSMiddleware without touching a route
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        gate = self.gates[classify(scope["method"], scope["path"])]
+        if not await gate.acquire(self.queue_timeout):
+            gate.rejected += 1
+            metrics.increment(f"admission.rejected.{gate.name}")
+            await self._reject(send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+
+    async def _reject(self, send):
+        body = json.dumps({
+            "error": "Service Unavailable",
+            "detail": "The server is busy - please retry shortly",
+            "status_code": 503,
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+# Gates of the running app by class name, for telemetry
+gates = {}
+
+
+def stats():
+    return {name: gate.stats() for name, gate in gates.items()}
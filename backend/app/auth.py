@@ -39,24 +39,24 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """Verify JWT token from Authorization header"""
-    token = credentials.credentials
-    
+def token_username(token: str) -> Optional[str]:
+    """Username of a valid JWT, or None (for checks outside a route dependency)"""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials"
-            )
-        return username
     except JWTError:
+        return None
+    return payload.get("sub")
+
+
+def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Verify JWT token from Authorization header"""
+    username = token_username(credentials.credentials)
+    if username is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
         )
+    return username
 
 
 def authenticate_admin(username: str, password: str) -> bool:
@@ -0,0 +1,455 @@
+"""
+Bulk import of publications from BibTeX / RIS files
+
+Files are parsed incrementally, one entry at a time, so large exported
+libraries never need to fit in memory. Records are normalized into
+Publication rows and deduplicated by DOI (unique index), falling back to
+fuzzy title matching within the same year. Rows are written in batches,
+one transaction per batch.
+
+Usage:
+    python -m app.bibimport library.bib [--overwrite] [--batch-size 200]
+"""
+
+import argparse
+import difflib
+import io
+import re
+import sys
+
+from .citations import invalidate_citations
+from .facets import apply_change, facet_values, sync_authors
+from .models import Publication
+from . import admin_stats, related
+
+TITLE_MATCH_RATIO = 0.92
+# Above this many new / changed rows, rebuild the related-content index
+# in one pass instead of updating it row by row
+RELATED_REBUILD_THRESHOLD = 50
+
+_BIB_FIELD_MAP = {
+    "title": "title",
+    "author": "authors",
+    "journal": "journal",
+    "booktitle": "journal",
+    "year": "year",
+    "doi": "doi",
+    "url": "pdf_url",
+    "abstract": "abstract",
+}
+
+_RIS_FIELD_MAP = {
+    "TI": "title",
+    "T1": "title",
+    "AU": "authors",
+    "A1": "authors",
+    "JO": "journal",
+    "JF": "journal",
+    "T2": "journal",
+    "PY": "year",
+    "Y1": "year",
+    "DO": "doi",
+    "UR": "pdf_url",
+    "AB": "abstract",
+    "N2": "abstract",
+}
+
+_RIS_LINE = re.compile(r"^([A-Z][A-Z0-9])  - ?(.*)$")
+# Only a line starting with "@type{" / "@type(" opens an entry - not an
+# "@" in a comment, an e-mail address or preamble text
+_BIB_ENTRY_START = re.compile(r"^\s*@\s*\w+\s*[{(]")
+# Marker field of a record that could not be parsed; counted as an error
+PARSE_ERROR = "_error"
+
+
+# ============================================================================
+# Parsers
+# ============================================================================
+def _entry_closed(line, state):
+    """Scan one line of an entry; True once its closing } or ) is reached"""
+    for char in line:
+        if state["escaped"]:
+            state["escaped"] = False
+        elif char == "\\":
+            state["escaped"] = True
+        elif state["opener"] is None:
+            if char in "{(":
+                state["opener"] = char
+                state["depth"] = 1
+        elif char == "{" or (char == "(" and state["opener"] == "(" and state["braces"] == 0):
+            state["depth"] += 1
+            state["braces"] += char == "{"
+        elif char == "}" or (char == ")" and state["opener"] == "(" and state["braces"] == 0):
+            state["depth"] -= 1
+            state["braces"] -= char == "}"
+            if state["depth"] == 0:
+                return True
+    return False
+
+
+def iter_bibtex(lines):
+    """
+    Yield one dict of raw fields per BibTeX entry (@string macros are expanded).
+    Entries that cannot be parsed are yielded as {PARSE_ERROR: first line}.
+    """
+    buffer = []
+    state = None
+    macros = {}
+
+    for line in lines:
+        if state is None:
+            if not _BIB_ENTRY_START.match(line):
+                continue
+            line = line.lstrip()
+            state = {"opener": None, "depth": 0, "braces": 0, "escaped": False}
+
+        buffer.append(line)
+        if _entry_closed(line, state):
+            text = "".join(buffer)
+            buffer, state = [], None
+            entry = _parse_bibtex_entry(text, macros)
+            if entry is not None:
+                yield entry
+
+    if buffer:
+        yield {PARSE_ERROR: buffer[0].strip()[:200]}  # Unterminated entry at the end of the file
+
+
+def _parse_bibtex_entry(text, macros):
+    """Raw fields, None for @comment / @preamble / @string, or a PARSE_ERROR record"""
+    match = re.match(r"@\s*(\w+)\s*[{(]", text)
+    if not match:
+        return {PARSE_ERROR: text.split("\n", 1)[0].strip()[:200]}
+    entry_type = match.group(1).lower()
+    if entry_type in ("comment", "preamble"):
+        return None
+
+    pos = match.end()
+    fields = {"_type": entry_type}
+    if entry_type != "string":
+        key = re.match(r"\s*([^,\s]*)\s*,", text[pos:])
+        if not key:
+            return {PARSE_ERROR: text.split("\n", 1)[0].strip()[:200]}
+        fields["_key"] = key.group(1)
+        pos += key.end()
+
+    field = re.compile(r"\s*(\w[\w-]*)\s*=\s*")
+    while pos < len(text):
+        m = field.match(text, pos)
+        if not m:
+            break
+        name = m.group(1).lower()
+        pos = m.end()
+        value, pos = _read_bibtex_value(text, pos, macros)
+        fields[name] = " ".join(value.split())
+        # Skip to the next field
+        while pos < len(text) and text[pos] in ", \t\r\n":
+            pos += 1
+
+    if entry_type == "string":
+        macros.update((k, v) for k, v in fields.items() if not k.startswith("_"))
+        return None
+    return fields
+
+
+def _read_bibtex_value(text, pos, macros):
+    if pos >= len(text):
+        return "", pos
+    opener = text[pos]
+    if opener in "{\"":
+        closer = "}" if opener == "{" else "\""
+        depth = 0
+        start = pos + 1
+        pos += 1
+        while pos < len(text):
+            char = text[pos]
+            if char == "\\":
+                pos += 2
+                continue
+            if char == "{":
+                depth += 1
+            elif char == "}" and (depth > 0 or closer == "\""):
+                depth -= 1
+            elif char == closer and depth == 0:
+                return text[start:pos].replace("{", "").replace("}", ""), pos + 1
+            pos += 1
+        return text[start:], pos
+
+    # Bare value: number or macro name
+    m = re.match(r"[^,})\s]*", text[pos:])
+    value = m.group(0)
+    return macros.get(value.lower(), value), pos + m.end()
+
+
+def iter_ris(lines):
+    """Yield one dict of raw fields per RIS record (repeated tags become lists)"""
+    record = {}
+    last_tag = None
+
+    for line in lines:
+        line = line.rstrip("\r\n").lstrip("﻿")
+        match = _RIS_LINE.match(line)
+        if not match:
+            # Continuation of the previous value
+            if last_tag and line.strip():
+                values = record[last_tag]
+                values[-1] = f"{values[-1]} {line.strip()}"
+            continue
+
+        tag, value = match.group(1), match.group(2).strip()
+        if tag == "ER":
+            if record:
+                yield record
+            record, last_tag = {}, None
+            continue
+        record.setdefault(tag, []).append(value)
+        last_tag = tag
+
+    if record:
+        yield record
+
+
+# ============================================================================
+# Normalization
+# ============================================================================
+def normalize_doi(doi):
+    if not doi:
+        return None
+    doi = doi.strip()
+    doi = re.sub(r"^(https?://(dx\.)?doi\.org/|doi:\s*)", "", doi, flags=re.IGNORECASE)
+    return doi.lower() or None
+
+
+def normalize_title(title):
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", (title or "").lower()).split())
+
+
+def _parse_year(value):
+    match = re.search(r"\d{4}", value or "")
+    return int(match.group(0)) if match else None
+
+
+def normalize_bibtex(entry):
+    if PARSE_ERROR in entry:
+        return entry
+    record = {}
+    for source, target in _BIB_FIELD_MAP.items():
+        if entry.get(source) and target not in record:
+            record[target] = entry[source]
+    if "authors" in record:
+        record["authors"] = "; ".join(a.strip() for a in re.split(r"\s+and\s+", record["authors"]) if a.strip())
+    return _finish(record)
+
+
+def normalize_ris(entry):
+    record = {}
+    for source, target in _RIS_FIELD_MAP.items():
+        if entry.get(source) and target not in record:
+            record[target] = entry[source]
+    if "authors" in record:
+        record["authors"] = "; ".join(record["authors"])
+    for name, value in list(record.items()):
+        if isinstance(value, list):
+            record[name] = value[0]
+    return _finish(record)
+
+
+def _finish(record):
+    if "year" in record:
+        record["year"] = _parse_year(str(record["year"]))
+    record["doi"] = normalize_doi(record.get("doi"))
+    if record.get("title"):
+        record["title"] = record["title"].strip()[:300]
+    if record.get("authors"):
+        record["authors"] = record["authors"][:500]
+    if record.get("journal"):
+        record["journal"] = record["journal"][:200]
+    return record
+
+
+def iter_records(fileobj, file_format):
+    """Normalized records from a text file object in 'bibtex' or 'ris' format"""
+    if file_format == "ris":
+        return (normalize_ris(entry) for entry in iter_ris(fileobj))
+    return (normalize_bibtex(entry) for entry in iter_bibtex(fileobj))
+
+
+def detect_format(filename):
+    return "ris" if (filename or "").lower().endswith(".ris") else "bibtex"
+
+
+# ============================================================================
+# Import
+# ============================================================================
+class Importer:
+    """Writes normalized records to the database in batches"""
+
+    def __init__(self, db, overwrite=False, batch_size=200):
+        self.db = db
+        # Keep rows usable across batch commits without reloading each one
+        self.db.expire_on_commit = False
+        self.overwrite = overwrite
+        self.batch_size = batch_size
+        self.report = {"created": 0, "updated": 0, "skipped": 0, "errors": 0}
+        self._titles_by_year = {}
+        self._changed_ids = []
+        self._created = []
+
+    def run(self, records):
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                self._import_batch(batch)
+                batch = []
+        if batch:
+            self._import_batch(batch)
+
+        for publication_id in self._changed_ids:
+            invalidate_citations(publication_id)
+        self._update_related()
+        return self.report
+
+    def _update_related(self):
+        changed = self._created + [self.db.get(Publication, i) for i in self._changed_ids]
+        if len(changed) > RELATED_REBUILD_THRESHOLD:
+            related.rebuild_related(self.db, "paper")
+            return
+        try:
+            for publication in changed:
+                if publication is not None:
+                    related.update_item(self.db, "paper", publication)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            print(f"⚠️  Could not update related publications: {e}")
+
+    def _import_batch(self, batch):
+        db = self.db
+        dois = {r["doi"] for r in batch if r.get("doi")}
+        by_doi = {}
+        if dois:
+            for publication in db.query(Publication).filter(Publication.doi.in_(dois)):
+                by_doi[publication.doi] = publication
+
+        created = []
+        counts = {"created": 0, "updated": 0, "skipped": 0, "errors": 0}
+        changed_ids = []
+        try:
+            for record in batch:
+                if PARSE_ERROR in record:
+                    print(f"⚠️  Could not parse entry: {record[PARSE_ERROR]}")
+                    counts["errors"] += 1
+                    continue
+                if not record.get("title") or not record.get("authors"):
+                    counts["skipped"] += 1
+                    continue
+
+                existing = by_doi.get(record.get("doi")) or self._match_title(record)
+                if existing is None:
+                    publication = Publication(**record)
+                    db.add(publication)
+                    sync_authors(db, publication)
+                    apply_change(db, None, facet_values(publication))
+                    created.append(publication)
+                    if publication.doi:
+                        by_doi[publication.doi] = publication
+                    self._remember_title(publication)
+                    counts["created"] += 1
+                elif self._merge(existing, record):
+                    changed_ids.append(existing.id)
+                    counts["updated"] += 1
+                else:
+                    counts["skipped"] += 1
+
+            if created or changed_ids:
+                admin_stats.adjust(db, "paper", "total", len(created))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self._titles_by_year.clear()
+            print(f"❌ Import batch failed: {e}")
+            self.report["errors"] += len(batch)
+            return
+
+        for name, count in counts.items():
+            self.report[name] += count
+        self._changed_ids.extend(changed_ids)
+        self._created.extend(created)
+
+    def _merge(self, publication, record):
+        """Copy imported values onto an existing row; True if anything changed"""
+        before = facet_values(publication)
+        changed = False
+        for name, value in record.items():
+            if value in (None, ""):
+                continue
+            current = getattr(publication, name)
+            if current in (None, "") or (self.overwrite and current != value):
+                # Never take a DOI another row already owns
+                if name == "doi" and current not in (None, ""):
+                    continue
+                setattr(publication, name, value)
+                changed = True
+        
+        if changed:
+            sync_authors(self.db, publication)
+            apply_change(self.db, before, facet_values(publication))
+        return changed
+
+    def _match_title(self, record):
+        year = record.get("year")
+        title = normalize_title(record["title"])
+        for candidate_title, publication in self._candidates(year):
+            if difflib.SequenceMatcher(None, title, candidate_title).ratio() >= TITLE_MATCH_RATIO:
+                # A different DOI means a different paper, however close the title
+                if record.get("doi") and publication.doi and publication.doi != record["doi"]:
+                    continue
+                return publication
+        return None
+
+    def _candidates(self, year):
+        if year not in self._titles_by_year:
+            rows = self.db.query(Publication).filter(Publication.year == year)
+            self._titles_by_year[year] = [(normalize_title(p.title), p) for p in rows]
+        return self._titles_by_year[year]
+
+    def _remember_title(self, publication):
+        self._candidates(publication.year).append((normalize_title(publication.title), publication))
+
+
+def import_file(db, fileobj, file_format, overwrite=False, batch_size=200):
+    """Import a text file object and return the created/updated/skipped report"""
+    importer = Importer(db, overwrite=overwrite, batch_size=batch_size)
+    return importer.run(iter_records(fileobj, file_format))
+
+
+def open_text(binary_file):
+    """Wrap a binary upload so it can be read line by line as text"""
+    return io.TextIOWrapper(binary_file, encoding="utf-8", errors="replace")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import publications from BibTeX / RIS")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["bibtex", "ris"])
+    parser.add_argument("--overwrite", action="store_true", help="Replace existing values instead of only filling gaps")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    from .database import SessionLocal, init_db
+
+    init_db()
+    db = SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8", errors="replace") as f:
+            report = import_file(db, f, args.format or detect_format(args.path), args.overwrite, args.batch_size)
+    finally:
+        db.close()
+
+    print(f"✅ Import finished: {report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
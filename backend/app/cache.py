@@ -0,0 +1,100 @@
+"""
+In-process caches that stay consistent across workers
+Every cache is registered on the invalidation bus, so invalidate() in one
+worker evicts the entry in all of them.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from .invalidation import bus
+
+_MISSING = object()
+
+
+def _wire_key(key):
+    # Keys travel as JSON, which turns tuples into lists
+    return list(key) if isinstance(key, tuple) else key
+
+
+def _local_key(key):
+    return tuple(key) if isinstance(key, list) else key
+
+
+class LocalCache:
+    """
+    Small LRU cache with an optional TTL.
+
+    Keys must be strings, numbers or tuples of those so they can be sent
+    over the bus. Use get_or_load() when filling from the database: a value
+    loaded while an invalidation arrived is returned but not stored, so a
+    slow reader can never put stale data back into the cache.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        bus.subscribe(f"cache:{name}", self._on_invalidate)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_load(self, key, loader):
+        """Return the cached value, calling loader() to fill it on a miss"""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            generation = self._generation
+        value = loader()
+        with self._lock:
+            if generation == self._generation:
+                self._store(key, value)
+        return value
+
+    def invalidate(self, key=None):
+        """Evict one key (or everything when key is None) in every worker"""
+        bus.publish(f"cache:{self.name}", {"key": _wire_key(key)})
+
+    def clear_local(self):
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def _store(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        self._data[key] = (value, expires)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def _on_invalidate(self, payload):
+        key = _local_key((payload or {}).get("key"))
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
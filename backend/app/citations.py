@@ -0,0 +1,192 @@
+"""
+Citation formatting for publications
+Generates BibTeX, RIS, APA and MLA from the structured fields
+(title / authors / journal / year / doi). Rendered strings are cached per
+publication; call invalidate_citations() whenever a publication changes.
+"""
+
+import re
+
+from .cache import LocalCache
+
+FORMATS = ("bibtex", "ris", "apa", "mla")
+
+MEDIA_TYPES = {
+    "bibtex": "application/x-bibtex",
+    "ris": "application/x-research-info-systems",
+    "apa": "text/plain",
+    "mla": "text/plain",
+}
+
+# (publication id, format) -> rendered citation
+citation_cache = LocalCache("citations", maxsize=4096)
+
+_INITIALS = re.compile(r"^([A-Z]\.?\s*-?)+$")
+
+
+# ============================================================================
+# Author parsing
+# ============================================================================
+def split_authors(authors: str):
+    """
+    Split the free-text authors field into (family, given) tuples.
+    Understands "A. Smith, B. Jones", "Smith, A.; Jones, B.",
+    "Smith, A., Jones, B." and "A. Smith and B. Jones".
+    """
+    if not authors:
+        return []
+
+    text = authors.replace(" & ", " and ").strip()
+    if ";" in text:
+        parts = text.split(";")
+    else:
+        parts = re.split(r",\s*and\s+|\s+and\s+|,", text)
+    parts = [p.strip() for p in parts if p.strip()]
+
+    # "Smith, A., Jones, B." splits into surname / initials pairs - rejoin them
+    if ";" not in text and len(parts) % 2 == 0 and all(_INITIALS.match(p) for p in parts[1::2]):
+        parts = [f"{family}, {given}" for family, given in zip(parts[::2], parts[1::2])]
+
+    names = []
+    for part in parts:
+        if part.lower() in ("et al", "et al."):
+            continue
+        if "," in part:
+            family, given = part.split(",", 1)
+        elif " " in part:
+            given, family = part.rsplit(" ", 1)
+        else:
+            family, given = part, ""
+        names.append((family.strip(), given.strip()))
+    return names
+
+
+def _initials(given: str):
+    return " ".join(f"{name[0]}." for name in re.split(r"[\s.]+", given) if name)
+
+
+def _doi_url(doi: str):
+    doi = doi.strip()
+    if doi.startswith("http"):
+        return doi
+    return f"https://doi.org/{doi}"
+
+
+# ============================================================================
+# Formatters
+# ============================================================================
+def citation_key(publication):
+    """
+    BibTeX key like "smith2022paper-12". The publication id keeps keys
+    unique in export.bib when two papers share author, year and first word.
+    """
+    names = split_authors(publication.authors)
+    family = names[0][0] if names else "anon"
+    first_word = next((w for w in re.findall(r"[A-Za-z]+", publication.title or "") if len(w) > 3), "")
+    key = re.sub(r"[^a-z0-9]", "", f"{family}{publication.year or ''}{first_word}".lower()) or "pub"
+    return f"{key}-{publication.id}"
+
+
+def _bibtex_escape(value):
+    return str(value).replace("{", "\\{").replace("}", "\\}")
+
+
+def format_bibtex(publication):
+    names = split_authors(publication.authors)
+    fields = [("title", publication.title)]
+    if names:
+        fields.append(("author", " and ".join(f"{f}, {g}" if g else f for f, g in names)))
+    if publication.journal:
+        fields.append(("journal", publication.journal))
+    if publication.year:
+        fields.append(("year", publication.year))
+    if publication.doi:
+        fields.append(("doi", publication.doi))
+    if publication.pdf_url:
+        fields.append(("url", publication.pdf_url))
+
+    body = ",\n".join(f"  {name} = {{{_bibtex_escape(value)}}}" for name, value in fields)
+    return f"@article{{{citation_key(publication)},\n{body}\n}}\n"
+
+
+def format_ris(publication):
+    lines = ["TY  - JOUR"]
+    for family, given in split_authors(publication.authors):
+        lines.append(f"AU  - {family}, {given}" if given else f"AU  - {family}")
+    lines.append(f"TI  - {publication.title}")
+    if publication.journal:
+        lines.append(f"JO  - {publication.journal}")
+    if publication.year:
+        lines.append(f"PY  - {publication.year}")
+    if publication.doi:
+        lines.append(f"DO  - {publication.doi}")
+    if publication.pdf_url:
+        lines.append(f"UR  - {publication.pdf_url}")
+    if publication.abstract:
+        lines.append(f"AB  - {' '.join(publication.abstract.split())}")
+    lines.append("ER  - ")
+    return "\n".join(lines) + "\n"
+
+
+def format_apa(publication):
+    names = [f"{family}, {_initials(given)}".rstrip(", ") for family, given in split_authors(publication.authors)]
+    if len(names) > 20:
+        authors = ", ".join(names[:19]) + ", ... " + names[-1]
+    elif len(names) > 1:
+        authors = ", ".join(names[:-1]) + ", & " + names[-1]
+    else:
+        authors = names[0] if names else ""
+
+    year = publication.year or "n.d."
+    citation = f"{authors} ({year}). {publication.title.rstrip('.')}."
+    if publication.journal:
+        citation += f" {publication.journal}."
+    if publication.doi:
+        citation += f" {_doi_url(publication.doi)}"
+    return citation.strip()
+
+
+def format_mla(publication):
+    names = split_authors(publication.authors)
+    if len(names) >= 3:
+        family, given = names[0]
+        authors = f"{family}, {given}, et al." if given else f"{family}, et al."
+    elif len(names) == 2:
+        (family, given), (family2, given2) = names
+        first = f"{family}, {given}," if given else family
+        second = f"{given2} {family2}" if given2 else family2
+        authors = f"{first} and {second}."
+    elif names:
+        family, given = names[0]
+        authors = f"{family}, {given}." if given else f"{family}."
+    else:
+        authors = ""
+
+    citation = f"{authors} “{publication.title.rstrip('.')}.”"
+    details = [publication.journal, str(publication.year) if publication.year else None]
+    details = [d for d in details if d]
+    if details:
+        citation += " " + ", ".join(details)
+    if publication.doi:
+        citation += f", doi:{publication.doi.strip()}"
+    return citation.strip() + "."
+
+
+_FORMATTERS = {
+    "bibtex": format_bibtex,
+    "ris": format_ris,
+    "apa": format_apa,
+    "mla": format_mla,
+}
+
+
+def render_citation(publication, fmt: str):
+    """Rendered citation for a publication, served from the cache when possible"""
+    formatter = _FORMATTERS[fmt]
+    return citation_cache.get_or_load((publication.id, fmt), lambda: formatter(publication))
+
+
+def invalidate_citations(publication_id: int):
+    """Drop every cached format of a publication (in all workers)"""
+    for fmt in FORMATS:
+        citation_cache.invalidate((publication_id, fmt))
@@ -0,0 +1,41 @@
+"""
+Optimistic concurrency for admin edits
+
+BlogPost, ResearchProject and Publication carry a `version` column
+(SQLAlchemy's version_id_col), so every UPDATE is issued as
+`... WHERE id = :id AND version = :version` and bumps the version.
+PATCH requests send the version they were editing; if someone saved in
+between, the request gets 409 instead of silently overwriting them.
+"""
+
+from fastapi import HTTPException
+from sqlalchemy.orm.exc import StaleDataError
+
+STALE_DETAIL = "This item was changed by someone else - reload it and try again"
+
+
+def stale_error():
+    return HTTPException(status_code=409, detail=STALE_DETAIL)
+
+
+def apply_patch(instance, patch):
+    """
+    Copy the fields set on a *Update schema onto a model instance.
+    Only values that actually differ are assigned, so the UPDATE touches
+    just those columns. Returns the changed field names; raises 409 if
+    patch.version is not the instance's current version.
+    """
+    changes = patch.model_dump(exclude_unset=True)
+    expected = changes.pop("version")
+    if instance.version != expected:
+        raise stale_error()
+
+    changed = []
+    for key, value in changes.items():
+        if getattr(instance, key) != value:
+            setattr(instance, key, value)
+            changed.append(key)
+    return changed
+
+
+__all__ = ["StaleDataError", "apply_patch", "stale_error"]
@@ -11,13 +11,84 @@ class Settings:
     
     # Optional settings
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./portfolio.db")
+    DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")  # Optional read replica
     ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000")
     ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
     
+    # Connection pools - reads and writes are pooled separately
+    DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "5"))
+    DB_READ_MAX_OVERFLOW = int(os.getenv("DB_READ_MAX_OVERFLOW", "10"))
+    DB_WRITE_POOL_SIZE = int(os.getenv("DB_WRITE_POOL_SIZE", "2"))
+    DB_WRITE_MAX_OVERFLOW = int(os.getenv("DB_WRITE_MAX_OVERFLOW", "3"))
+    DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "3600"))
+    # Threads for sync route handlers (AnyIO default is 40)
+    THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "40"))
+    # Seconds an admin's reads stay on the primary after a write
+    READ_AFTER_WRITE_SECONDS = float(os.getenv("READ_AFTER_WRITE_SECONDS", "10"))
+    # Background DB probe reported by /ready and /api/health
+    DB_PROBE_INTERVAL_SECONDS = float(os.getenv("DB_PROBE_INTERVAL_SECONDS", "30"))
+    # Admission control (app/admission.py): per-route-class concurrency limits
+    ADMISSION_CONTROL_ENABLED = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+    ADMISSION_LIMITS = os.getenv("ADMISSION_LIMITS", "")  # e.g. "public_read=24,admin_write=4"
+    ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "5"))
+    ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "50"))
+    ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "2"))
+    # Structured logging (app/logs.py): JSON lines written by a background thread
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    # Successful requests are sampled per route; errors and slow requests are always logged
+    LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")  # e.g. "GET /api/blogs/=0.1,/media/=0.01"
+    LOG_DEFAULT_SAMPLE_RATE = float(os.getenv("LOG_DEFAULT_SAMPLE_RATE", "1.0"))
+    LOG_SLOW_REQUEST_MS = float(os.getenv("LOG_SLOW_REQUEST_MS", "1000"))
+    # Replayable traffic trace (JSONL, no bodies / secrets) for benchmarks/replay.py
+    TRACE_FILE = os.getenv("TRACE_FILE")
+    # On-demand profiler (app/profiler.py): collapsed-stack profiles on disk
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "./profiles")
+    PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+    PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "2"))
+    # Apply pending schema migrations (app/migrations) at startup
+    AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "true").lower() == "true"
+    
+    # Blog revision history: a full snapshot every N revisions, deltas between
+    BLOG_REVISION_SNAPSHOT_EVERY = int(os.getenv("BLOG_REVISION_SNAPSHOT_EVERY", "10"))
+    
+    # Related content (app/related.py): neighbours stored per blog post / publication
+    RELATED_TOP_K = int(os.getenv("RELATED_TOP_K", "10"))
+    
+    # Blog view counters (app/views.py): buffered per worker, flushed in batches
+    VIEW_FLUSH_INTERVAL_SECONDS = float(os.getenv("VIEW_FLUSH_INTERVAL_SECONDS", "30"))
+    VIEW_FLUSH_MAX_PENDING = int(os.getenv("VIEW_FLUSH_MAX_PENDING", "1000"))
+    POPULAR_CACHE_SECONDS = float(os.getenv("POPULAR_CACHE_SECONDS", "60"))
+    
+    # Uploaded media (images, PDFs)
+    MEDIA_ROOT = os.getenv("MEDIA_ROOT", "./media")
+    # Absolute origin of this API, prefixed to stored media / PDF URLs - the
+    # frontend is served from another origin, so relative URLs would hit the SPA.
+    # Falls back to the URL Render assigns the service.
+    MEDIA_BASE_URL = (os.getenv("MEDIA_BASE_URL") or os.getenv("RENDER_EXTERNAL_URL") or "").rstrip("/")
+    IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+    IMAGE_MAX_UPLOAD_BYTES = int(os.getenv("IMAGE_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+    PDF_MAX_UPLOAD_BYTES = int(os.getenv("PDF_MAX_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+    # Internal nginx location for X-Accel-Redirect (sendfile) - unset to serve from the app
+    MEDIA_ACCEL_REDIRECT = os.getenv("MEDIA_ACCEL_REDIRECT")
+    
+    # Contact spam pre-filter
+    SPAM_DEDUP_WINDOW_SECONDS = int(os.getenv("SPAM_DEDUP_WINDOW_SECONDS", "3600"))
+    SPAM_MAX_LINKS = int(os.getenv("SPAM_MAX_LINKS", "3"))
+    SPAM_BLOOM_CAPACITY = int(os.getenv("SPAM_BLOOM_CAPACITY", "10000"))
+    
     # Email settings
     RESEND_API_KEY = os.getenv("RESEND_API_KEY")
     EMAIL_FROM = os.getenv("EMAIL_FROM", "onboarding@resend.dev")
     EMAIL_TO = os.getenv("EMAIL_TO")
+    # Contact notification digests: batch messages into one email per
+    # interval / per N messages; the first message after a quiet period
+    # is still sent immediately
+    CONTACT_DIGEST_ENABLED = os.getenv("CONTACT_DIGEST_ENABLED", "false").lower() == "true"
+    CONTACT_DIGEST_INTERVAL_SECONDS = float(os.getenv("CONTACT_DIGEST_INTERVAL_SECONDS", "600"))
+    CONTACT_DIGEST_MAX_MESSAGES = int(os.getenv("CONTACT_DIGEST_MAX_MESSAGES", "20"))
+    CONTACT_DIGEST_QUIET_SECONDS = float(os.getenv("CONTACT_DIGEST_QUIET_SECONDS", "1800"))
     
     def validate(self):
         """Validate required environment variables"""
@@ -32,6 +103,9 @@ class Settings:
         if self.ENVIRONMENT == "production" and "localhost" in self.ALLOWED_ORIGINS:
             errors.append("ALLOWED_ORIGINS should not include localhost in production")
         
+        if self.ENVIRONMENT == "production" and not self.MEDIA_BASE_URL:
+            errors.append("MEDIA_BASE_URL must be set to the public API URL in production")
+        
         if errors:
             raise ValueError(f"Configuration errors:\n" + "\n".join(f"  - {e}" for e in errors))
         
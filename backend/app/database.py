@@ -4,14 +4,21 @@ Supports both SQLite (local dev) and PostgreSQL (production on Render)
 This version fixes the disappearing blogs issue on Render's free tier
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
+from fastapi import Request
+import hashlib
+import threading
+import time
 import os
 from dotenv import load_dotenv
 from sqlalchemy import text
 
+from .config import settings
+from .invalidation import bus
+from .telemetry import InstrumentedQueuePool, record_thread_wait
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -19,13 +26,24 @@ load_dotenv()
 # Defaults to SQLite for local development if DATABASE_URL is not set
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./portfolio.db")
 
+# Optional read replica. When unset, read-only routes still get their own
+# connection pool, but it points at the primary database.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL") or None
+
+
 # ============================================================================
 # CRITICAL FIX FOR RENDER
 # ============================================================================
 # Render provides postgres:// URLs but SQLAlchemy requires postgresql://
 # This conversion is necessary for PostgreSQL connections to work on Render
-if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+def _normalize_url(url):
+    if url and url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
+DATABASE_URL = _normalize_url(DATABASE_URL)
+DATABASE_READ_URL = _normalize_url(DATABASE_READ_URL)
 
 # Print AFTER conversion, check the final URL
 if "postgresql" in DATABASE_URL or "postgres" in DATABASE_URL:
@@ -33,32 +51,64 @@ if "postgresql" in DATABASE_URL or "postgres" in DATABASE_URL:
 elif "sqlite" in DATABASE_URL:
     print("⚠️  Using SQLite (local development)")
 
+if DATABASE_READ_URL:
+    print("📖 Read-only routes will use DATABASE_READ_URL")
+
+
 # ============================================================================
-# Create database engine with optimized configuration
+# Create database engines with optimized configuration
 # ============================================================================
-if "sqlite" in DATABASE_URL:
-    # SQLite configuration for local development
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False},  # Required for SQLite with FastAPI
-        echo=False  # Set to True to see all SQL queries in console (useful for debugging)
-    )
-else:
+def _create_engine(url, pool_size, max_overflow):
+    """Create an engine with its own connection pool"""
+    if "sqlite" in url:
+        # SQLite configuration for local development
+        return create_engine(
+            url,
+            connect_args={"check_same_thread": False},  # Required for SQLite with FastAPI
+            poolclass=InstrumentedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            echo=False  # Set to True to see all SQL queries in console (useful for debugging)
+        )
+
     # PostgreSQL configuration for production on Render
     # Uses connection pooling for better performance and reliability
-    engine = create_engine(
-        DATABASE_URL,
-        poolclass=QueuePool,        # Use connection pooling
-        pool_size=5,                # Keep 5 connections ready in the pool
-        max_overflow=10,            # Allow up to 10 additional connections if needed
+    return create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,  # Connection pooling with checkout telemetry
+        pool_size=pool_size,        # Connections kept ready in the pool
+        max_overflow=max_overflow,  # Additional connections allowed under load
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,  # Max wait for a free connection
         pool_pre_ping=True,         # Verify connections are alive before using them
-        pool_recycle=3600,          # Recycle connections after 1 hour (3600 seconds)
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,  # Recycle connections periodically
         echo=False                  # Set to True to see all SQL queries in console
     )
 
-# Create session factory
-# This is used to create database sessions for each request
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Primary engine - used for writes. It has a pool of its own so that a
+# spike of public GET requests can never starve admin writes.
+write_engine = _create_engine(
+    DATABASE_URL,
+    pool_size=settings.DB_WRITE_POOL_SIZE,
+    max_overflow=settings.DB_WRITE_MAX_OVERFLOW,
+)
+
+# Read engine - the replica if configured, otherwise the primary again
+read_engine = _create_engine(
+    DATABASE_READ_URL or DATABASE_URL,
+    pool_size=settings.DB_READ_POOL_SIZE,
+    max_overflow=settings.DB_READ_MAX_OVERFLOW,
+)
+
+# The primary engine keeps its old name for scripts and create_all()
+engine = write_engine
+
+# Create session factories
+# These are used to create database sessions for each request
+WriteSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=write_engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+SessionLocal = WriteSessionLocal
 
 # Base class for all database models
 # All your models (Blog, Research, Contact, etc.) should inherit from this
@@ -66,22 +116,128 @@ Base = declarative_base()
 
 
 # ============================================================================
-# Database session dependency
+# Read-your-writes stickiness
 # ============================================================================
-def get_db():
+# After a client writes, its reads are pinned to the primary for
+# READ_AFTER_WRITE_SECONDS so it never reads stale data from a lagging
+# replica. Clients are keyed by a hash of their Authorization header,
+# so only authenticated (admin) traffic can become sticky. Only a
+# committed transaction counts as a write - failed, rolled back or
+# rejected (4xx) requests leave the client on the read pool.
+#
+# The mark is set from the commit itself, before the response is sent,
+# and published on the invalidation bus so that every worker process
+# pins the client - the next request may land on any of them. Expiry
+# times are wall-clock so they mean the same thing in every worker.
+_sticky_until = {}
+_sticky_lock = threading.Lock()
+
+
+def _client_key(request: Request):
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()
+
+
+def _apply_sticky(payload):
+    now = time.time()
+    with _sticky_lock:
+        _sticky_until[payload["key"]] = max(_sticky_until.get(payload["key"], 0), payload["until"])
+        # Forget expired clients so the table stays small
+        if len(_sticky_until) > 1000:
+            for expired in [k for k, until in _sticky_until.items() if until <= now]:
+                del _sticky_until[expired]
+
+
+bus.subscribe("db.sticky", _apply_sticky)
+
+
+@event.listens_for(WriteSessionLocal, "after_commit")
+def _remember_commit(session):
+    request = session.info.get("request")
+    if request is not None:
+        mark_recent_write(request)
+
+
+def mark_recent_write(request: Request):
+    """Pin this client's reads to the primary in every worker for a short window"""
+    key = _client_key(request)
+    if key is None:
+        return
+
+    until = time.time() + settings.READ_AFTER_WRITE_SECONDS
+    with _sticky_lock:
+        current = _sticky_until.get(key, 0)
+    # A request that commits many times only needs to tell the other
+    # workers once; re-publish when half the window has gone by
+    if current >= until - settings.READ_AFTER_WRITE_SECONDS / 2:
+        return
+    bus.publish("db.sticky", {"key": key, "until": until})
+
+
+def is_sticky(request: Request):
+    """True if this client wrote recently and must read from the primary"""
+    key = _client_key(request)
+    if key is None:
+        return False
+    with _sticky_lock:
+        until = _sticky_until.get(key)
+    return until is not None and until > time.time()
+
+
+# ============================================================================
+# Database session dependencies
+# ============================================================================
+def get_write_db(request: Request):
     """
-    Dependency function that provides a database session to FastAPI routes.
-    Automatically manages session lifecycle (creation and cleanup).
-    
+    Dependency that provides a session on the primary database.
+    Use it for every route that inserts, updates or deletes.
+
     Usage in FastAPI endpoints:
         from sqlalchemy.orm import Session
-        from database import get_db
-        
-        @app.get("/api/blogs")
-        def get_blogs(db: Session = Depends(get_db)):
-            blogs = db.query(Blog).all()
-            return blogs
-    
+        from database import get_write_db
+
+        @router.post("/api/blogs")
+        def create_blog(db: Session = Depends(get_write_db)):
+            ...
+
+    The session is automatically closed after the request completes,
+    even if an error occurs.
+    """
+    record_thread_wait()
+    db = WriteSessionLocal()
+    # Lets the after_commit hook pin this client as soon as it commits
+    db.info["request"] = request
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request):
+    """
+    Dependency that provides a session for read-only routes.
+    Uses the read pool (or replica), unless this client wrote within the
+    last READ_AFTER_WRITE_SECONDS - then it reads from the primary.
+    """
+    record_thread_wait()
+    if is_sticky(request):
+        db = WriteSessionLocal()
+    else:
+        db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_db():
+    """
+    Dependency function that provides a session on the primary database.
+    Kept for scripts and older callers - routes should use get_read_db
+    or get_write_db so reads and writes don't share one pool.
+
     The session is automatically closed after the request completes,
     even if an error occurs.
     """
@@ -127,6 +283,12 @@ def init_db():
             init_db()
     """
     Base.metadata.create_all(bind=engine)
+
+    # A local SQLite "replica" (two-file testing setup) needs the tables too.
+    # Real replicas get their schema through replication.
+    if DATABASE_READ_URL and "sqlite" in DATABASE_READ_URL:
+        Base.metadata.create_all(bind=read_engine)
+
     print("✅ Database tables initialized")
 
 
@@ -152,13 +314,14 @@ def drop_all_tables():
 # Run tests when this file is executed directly
 # ============================================================================
 if __name__ == "__main__":
-    # This code only runs when you execute: python database.py
+    # This code only runs when you execute: python -m app.database
     # It's useful for testing your database configuration
     
     print("="*50)
     print("Database Configuration Test")
     print("="*50)
     print(f"Database URL: {DATABASE_URL}")
+    print(f"Read URL: {DATABASE_READ_URL or '(primary)'}")
     print(f"Database Type: {'PostgreSQL' if 'postgresql' in DATABASE_URL else 'SQLite'}")
     print("="*50)
     
@@ -0,0 +1,187 @@
+"""
+Publication facets: normalized authors and precomputed facet counts
+
+Publication.authors stays the free-text source of truth; sync_authors()
+mirrors it into the authors / publication_authors tables. Facet counts
+(per year, journal and author) live in publication_facets and are
+adjusted inside the same transaction as every write, so listing facets
+is a single small read instead of a GROUP BY over all publications.
+Counts change with an atomic upsert / UPDATE ... SET count = count + n,
+so concurrent writers never lose an update.
+
+Usage:
+    python -m app.facets rebuild
+"""
+
+import re
+import sys
+
+from sqlalchemy import delete, func, update
+from sqlalchemy.exc import IntegrityError
+
+from .citations import split_authors
+from .models import Author, Publication, PublicationAuthor, PublicationFacet
+
+FACETS = ("year", "journal", "author")
+
+
+def normalize_author(name: str):
+    return " ".join(re.sub(r"[^\w,]+", " ", (name or "").lower()).split())
+
+
+def author_names(authors: str):
+    """Display names ("Family, Given") parsed from the free-text field"""
+    names = []
+    for family, given in split_authors(authors):
+        name = f"{family}, {given}" if given else family
+        if name and name not in names:
+            names.append(name[:200])
+    return names
+
+
+def facet_values(publication):
+    """The facet values a publication contributes to, e.g. {"year": ["2024"]}"""
+    if publication is None:
+        return {facet: [] for facet in FACETS}
+    return {
+        "year": [str(publication.year)] if publication.year else [],
+        "journal": [publication.journal.strip()] if publication.journal and publication.journal.strip() else [],
+        "author": author_names(publication.authors),
+    }
+
+
+def _get_or_create_author(db, name):
+    normalized = normalize_author(name)
+    author = db.query(Author).filter(Author.normalized_name == normalized).first()
+    if author is not None:
+        return author
+
+    # Another transaction may insert the same new author first; the
+    # savepoint keeps the rest of this transaction usable if it does
+    savepoint = db.begin_nested()  # Flushes pending rows before the savepoint
+    try:
+        author = Author(name=name, normalized_name=normalized)
+        db.add(author)
+        db.flush()
+        savepoint.commit()
+    except IntegrityError:
+        savepoint.rollback()
+        author = db.query(Author).filter(Author.normalized_name == normalized).one()
+    return author
+
+
+def sync_authors(db, publication):
+    """Rebuild a publication's author links from its authors field"""
+    links = []
+    seen = set()
+    for position, name in enumerate(author_names(publication.authors)):
+        author = _get_or_create_author(db, name)
+        if author.id in seen:
+            continue
+        seen.add(author.id)
+        links.append(PublicationAuthor(author=author, author_id=author.id, position=position))
+    publication.author_links = links
+
+
+def apply_change(db, before, after):
+    """
+    Adjust facet counts for one publication going from `before` to `after`
+    (facet_values() dicts; either may be empty for create / delete).
+    """
+    for facet in FACETS:
+        old = set(before.get(facet, [])) if before else set()
+        new = set(after.get(facet, [])) if after else set()
+        for value in old - new:
+            _adjust(db, facet, value, -1)
+        for value in new - old:
+            _adjust(db, facet, value, 1)
+
+
+def _upsert(dialect_name):
+    """INSERT ... ON CONFLICT (facet, value) DO UPDATE SET count = count + excluded.count"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    statement = insert(PublicationFacet.__table__)
+    return statement.on_conflict_do_update(
+        index_elements=["facet", "value"],
+        set_={"count": PublicationFacet.__table__.c.count + statement.excluded.count},
+    )
+
+
+def _adjust(db, facet, value, delta):
+    if delta > 0:
+        db.execute(_upsert(db.get_bind().dialect.name), {"facet": facet, "value": value, "count": delta})
+        return
+    criteria = (PublicationFacet.facet == facet, PublicationFacet.value == value)
+    db.execute(
+        update(PublicationFacet)
+        .where(*criteria)
+        .values(count=PublicationFacet.count + delta)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        delete(PublicationFacet)
+        .where(*criteria, PublicationFacet.count <= 0)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def get_facets(db, limit: int = 50):
+    """Facet counts, largest first (years newest first)"""
+    result = {facet: [] for facet in FACETS}
+    rows = db.query(PublicationFacet).filter(PublicationFacet.count > 0).all()
+    for row in rows:
+        result[row.facet].append({"value": row.value, "count": row.count})
+
+    result["year"].sort(key=lambda item: item["value"], reverse=True)
+    for facet in ("journal", "author"):
+        result[facet].sort(key=lambda item: (-item["count"], item["value"]))
+        result[facet] = result[facet][:limit]
+    return result
+
+
+def rebuild_facets(db):
+    """Recompute author links and every facet count from scratch"""
+    db.query(PublicationFacet).delete()
+    counts = {}
+    for publication in db.query(Publication).all():
+        sync_authors(db, publication)
+        for facet, values in facet_values(publication).items():
+            for value in values:
+                counts[(facet, value)] = counts.get((facet, value), 0) + 1
+
+    db.add_all(PublicationFacet(facet=f, value=v, count=c) for (f, v), c in counts.items())
+    db.commit()
+    return len(counts)
+
+
+def ensure_facets(db):
+    """Build facets once for databases that predate them"""
+    has_facets = db.query(PublicationFacet).first() is not None
+    if not has_facets and db.query(func.count(Publication.id)).scalar():
+        rows = rebuild_facets(db)
+        print(f"✅ Built {rows} publication facet counts")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv != ["rebuild"]:
+        print("Usage: python -m app.facets rebuild")
+        return 1
+
+    from .database import SessionLocal, init_db
+
+    init_db()
+    db = SessionLocal()
+    try:
+        rows = rebuild_facets(db)
+    finally:
+        db.close()
+    print(f"✅ Rebuilt {rows} publication facet counts")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
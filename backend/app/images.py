@@ -0,0 +1,107 @@
+"""
+Research project image pipeline
+Uploaded originals are stored as-is; resized variants are generated in a
+background worker pool and recorded on the project as JSON:
+
+    {"thumbnail": {"width": 320, "webp": "<url>", "jpeg": "<url>"}, ...}
+"""
+
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import update
+
+from .config import settings
+from .database import WriteSessionLocal
+from .logs import get_logger
+from .media import media_url, store_bytes
+from .models import ResearchProject
+
+logger = get_logger(__name__)
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is optional - uploads are disabled without it
+    Image = None
+
+# Variant name -> maximum width in pixels
+VARIANT_WIDTHS = {
+    "thumbnail": 320,
+    "card": 640,
+    "full": 1600,
+}
+
+# Pillow releases the GIL while resizing and encoding, so threads scale
+executor = ThreadPoolExecutor(max_workers=settings.IMAGE_WORKERS, thread_name_prefix="image")
+
+
+def images_enabled():
+    return Image is not None
+
+
+def output_formats():
+    """Formats generated for each variant, best compression first"""
+    formats = []
+    if features.check("avif"):
+        formats.append(("avif", "AVIF", {"quality": 60}))
+    formats.append(("webp", "WEBP", {"quality": 80, "method": 4}))
+    formats.append(("jpeg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}))
+    return formats
+
+
+def render_variants(original: bytes):
+    """Resize the original into every variant and format, return the JSON dict"""
+    image = Image.open(io.BytesIO(original))
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    variants = {}
+    for name, max_width in VARIANT_WIDTHS.items():
+        resized = image.copy()
+        if resized.width > max_width:
+            height = round(resized.height * max_width / resized.width)
+            resized = resized.resize((max_width, height), Image.LANCZOS)
+
+        variant = {"width": resized.width, "height": resized.height}
+        for extension, pil_format, options in output_formats():
+            buffer = io.BytesIO()
+            resized.save(buffer, pil_format, **options)
+            _, relative_path = store_bytes(buffer.getvalue(), "research", extension)
+            variant[extension] = media_url(relative_path)
+        variants[name] = variant
+
+    return variants
+
+
+def _process_upload(project_id: int, original: bytes, original_url: str):
+    try:
+        variants = render_variants(original)
+    except Exception:
+        logger.exception("Error processing image for project %s", project_id)
+        return
+
+    db = WriteSessionLocal()
+    try:
+        # Skips projects that were deleted or got a newer image meanwhile.
+        # A plain UPDATE leaves the row version alone - variants are derived
+        # data and must not make an admin's open edit form stale.
+        result = db.execute(
+            update(ResearchProject)
+            .where(ResearchProject.id == project_id, ResearchProject.image_url == original_url)
+            .values(image_variants=json.dumps(variants))
+        )
+        db.commit()
+        if result.rowcount:
+            logger.info("Generated image variants for project %s", project_id)
+    except Exception:
+        db.rollback()
+        logger.exception("Error saving image variants for project %s", project_id)
+    finally:
+        db.close()
+
+
+def submit_variants(project_id: int, original: bytes, original_url: str):
+    """Queue variant generation for a freshly uploaded original"""
+    return executor.submit(_process_upload, project_id, original, original_url)
@@ -0,0 +1,76 @@
+"""
+Cross-worker invalidation bus
+Lets a write handled in one worker process evict cached state in all others.
+
+In a single process the bus simply calls the local subscribers. When the app
+runs under the pre-forking launcher (app/server.py), every worker is connected
+to the launcher through a Unix socketpair and the launcher forwards each
+message to all the other workers.
+"""
+
+import json
+import socket
+import threading
+from collections import defaultdict
+
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+
+class InvalidationBus:
+    """Publish/subscribe of small JSON messages between worker processes"""
+
+    def __init__(self):
+        self._handlers = defaultdict(list)
+        self._lock = threading.Lock()
+        self._sock = None
+
+    def subscribe(self, topic, handler):
+        """Call handler(payload) whenever a message is published on topic"""
+        with self._lock:
+            self._handlers[topic].append(handler)
+
+    def publish(self, topic, payload=None):
+        """Deliver a message to this worker and to every other worker"""
+        self._dispatch(topic, payload)
+
+        if self._sock is not None:
+            data = json.dumps({"topic": topic, "payload": payload}).encode()
+            try:
+                self._sock.send(data)
+            except OSError as e:
+                logger.warning("Invalidation bus send failed: %s", e)
+
+    def connect(self, sock: socket.socket):
+        """Attach this worker to the launcher and start listening for peers"""
+        self._sock = sock
+        thread = threading.Thread(target=self._listen, name="invalidation-bus", daemon=True)
+        thread.start()
+
+    def _listen(self):
+        while True:
+            try:
+                data = self._sock.recv(65536)
+            except OSError:
+                return
+            if not data:
+                return
+            try:
+                message = json.loads(data)
+            except ValueError:
+                continue
+            self._dispatch(message["topic"], message.get("payload"))
+
+    def _dispatch(self, topic, payload):
+        with self._lock:
+            handlers = list(self._handlers.get(topic, ()))
+        for handler in handlers:
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception("Error in invalidation handler for %s", topic)
+
+
+# Shared bus instance for the whole app
+bus = InvalidationBus()
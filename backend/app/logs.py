@@ -0,0 +1,303 @@
+"""
+Structured, non-blocking logging
+
+Log records are put on a bounded in-memory queue and written as one JSON
+object per line by a background thread (logging.handlers.QueueListener),
+so a slow stdout never blocks the event loop or a worker thread. If the
+queue is full the record is dropped and counted (metrics "logs.dropped")
+instead of waiting.
+
+Every request gets an id (X-Request-ID, generated if absent). It is added
+to all records logged while handling the request and echoed back in the
+response. The request log line also carries the route, status, duration,
+DB time and query count. Successful requests can be sampled per route
+(LOG_SAMPLE_RATES). Errors (status >= 500, or unhandled exceptions),
+4xx responses and requests slower than LOG_SLOW_REQUEST_MS are always
+logged.
+
+With TRACE_FILE set, every request is also appended to a compact JSONL
+traffic trace for benchmarks/replay.py: start time, method, route
+template, path / query parameters, status and duration. Bodies and
+headers are never recorded, and query parameters whose names look like
+secrets are dropped.
+
+Usage:
+    from ..logs import get_logger
+    logger = get_logger(__name__)
+    logger.exception("Error creating blog")  # inside an except block
+    logger.info("PDF deduplicated", extra={"fields": {"paper_id": 3}})
+"""
+
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from . import metrics
+from .config import settings
+
+
+class RequestContext:
+    """Mutable per-request state, shared with the worker threads the request uses"""
+
+    __slots__ = ("request_id", "db_seconds", "db_queries")
+
+    def __init__(self, request_id):
+        self.request_id = request_id
+        self.db_seconds = 0.0
+        self.db_queries = 0
+
+
+current_request = contextvars.ContextVar("current_request", default=None)
+
+
+# ============================================================================
+# Formatting / queueing
+# ============================================================================
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records instead of waiting"""
+
+    def prepare(self, record):
+        # Capture the request id now - the writer thread has no context
+        context = current_request.get()
+        record.request_id = context.request_id if context else None
+        # Render message and traceback here, where the arguments are valid
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.increment("logs.dropped")
+
+
+_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+_listener = None
+
+_root = logging.getLogger("app")
+_root.setLevel(getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO))
+_root.propagate = False
+_root.addHandler(NonBlockingQueueHandler(_queue))
+
+
+def get_logger(name):
+    """Logger under the "app" hierarchy (e.g. get_logger(__name__))"""
+    return logging.getLogger(name if name.startswith("app") else f"app.{name}")
+
+
+class TraceFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps(record.fields, separators=(",", ":"), default=str)
+
+
+TRACE_LOGGER = "app.trace"
+_trace_logger = logging.getLogger(TRACE_LOGGER)
+_trace_logger.setLevel(logging.INFO)  # Independent of LOG_LEVEL
+
+
+def start():
+    """Start the writer thread; call in each worker process (after fork)"""
+    global _listener
+    if _listener is not None:
+        return
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter())
+    output.addFilter(lambda record: record.name != TRACE_LOGGER)
+    handlers = [output]
+    if settings.TRACE_FILE:
+        # Append mode: every worker writes whole lines to the same file
+        trace = logging.FileHandler(settings.TRACE_FILE, delay=True)
+        trace.setFormatter(TraceFormatter())
+        trace.addFilter(lambda record: record.name == TRACE_LOGGER)
+        handlers.append(trace)
+    _listener = logging.handlers.QueueListener(_queue, *handlers, respect_handler_level=False)
+    _listener.start()
+
+
+def stop():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# ============================================================================
+# DB time per request
+# ============================================================================
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    request = current_request.get()
+    if request is not None:
+        request.db_seconds += elapsed
+        request.db_queries += 1
+
+
+# ============================================================================
+# Request log middleware
+# ============================================================================
+def parse_sample_rates(value: str):
+    """ "GET /api/blogs/=0.1, /media/=0.01" -> [("GET", "/api/blogs/", 0.1), (None, "/media/", 0.01)]"""
+    rates = []
+    for item in (value or "").split(","):
+        if "=" not in item:
+            continue
+        target, rate = item.rsplit("=", 1)
+        parts = target.split()
+        method, prefix = (parts[0].upper(), parts[1]) if len(parts) == 2 else (None, parts[0])
+        rates.append((method, prefix, float(rate)))
+    return rates
+
+
+_request_logger = logging.getLogger("app.request")
+_SECRET_PARAM = re.compile(r"token|passw|secret|key|auth|session|code", re.IGNORECASE)
+
+
+class RequestLogMiddleware:
+    """Pure ASGI middleware writing one structured record per request"""
+
+    def __init__(self, app):
+        self.app = app
+        self.sample_rates = parse_sample_rates(settings.LOG_SAMPLE_RATES)
+        self.default_rate = settings.LOG_DEFAULT_SAMPLE_RATE
+        self.slow_seconds = settings.LOG_SLOW_REQUEST_MS / 1000
+        self.trace = bool(settings.TRACE_FILE)
+
+    def _sample_rate(self, method, path):
+        for rate_method, prefix, rate in self.sample_rates:
+            if (rate_method is None or rate_method == method) and path.startswith(prefix):
+                return rate
+        return self.default_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        context = RequestContext(request_id or uuid.uuid4().hex[:16])
+        current_request.set(context)
+
+        status = 500
+        started_at = time.time()
+        start = time.perf_counter()
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", context.request_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        except Exception:
+            status = 500
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            if self.trace:
+                self._trace(scope, status, started_at, duration)
+            self._log(scope, status, duration, context)
+
+    def _trace(self, scope, status, started_at, duration):
+        route = scope.get("route")
+        entry = {
+            "ts": round(started_at, 4),
+            "method": scope["method"],
+            "route": getattr(route, "path", None),
+            "status": status,
+            "ms": round(duration * 1000, 2),
+        }
+        if route is None:
+            entry["path"] = scope["path"]  # Unmatched (404) - keep the raw path
+        elif scope.get("path_params"):
+            entry["params"] = {name: str(value) for name, value in scope["path_params"].items()}
+        query = [
+            (name, value)
+            for name, value in parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+            if not _SECRET_PARAM.search(name)
+        ]
+        if query:
+            entry["query"] = query
+        for name, _ in scope["headers"]:
+            if name == b"authorization":
+                entry["auth"] = True  # Replayed with the replay tool's own token
+                break
+        _trace_logger.info("trace", extra={"fields": entry})
+
+    def _log(self, scope, status, duration, context):
+        method, path = scope["method"], scope["path"]
+        slow = duration >= self.slow_seconds
+        rate = 1.0
+        if status < 400 and not slow:
+            rate = self._sample_rate(method, path)
+            if rate < 1.0 and random.random() >= rate:
+                return
+
+        route = scope.get("route")
+        fields = {
+            "method": method,
+            "path": path,
+            "route": getattr(route, "path", None),
+            "status": status,
+            "duration_ms": round(duration * 1000, 2),
+            "db_ms": round(context.db_seconds * 1000, 2),
+            "db_queries": context.db_queries,
+        }
+        if rate < 1.0:
+            fields["sample_rate"] = rate
+        if slow:
+            fields["slow"] = True
+
+        level = logging.ERROR if status >= 500 else logging.WARNING if status >= 400 or slow else logging.INFO
+        _request_logger.log(level, "request", extra={"fields": fields})
@@ -3,24 +3,39 @@ Academic Portfolio API - Main Application
 FastAPI backend with PostgreSQL database support
 """
 
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse
 from datetime import datetime
 import os
 from dotenv import load_dotenv
-from sqlalchemy import text  # Add this import at the top
 
 # Import local modules
-from .database import engine, Base, get_db, test_connection
-from .routers import blogs, contact, research, papers, auth
+from .config import settings
+from .database import SessionLocal, engine, test_connection, init_db
+from . import migrations
+from .facets import ensure_facets
+from .technologies import ensure_technologies
+from .related import ensure_related
+from .admin_stats import ensure_stats
+from . import spam, suggest, views, warmup
+from .notifications import notifier
+from .admission import AdmissionControlMiddleware
+from . import logs, profiler, telemetry
+from .routers import blogs, contact, research, papers, auth, media, admin, suggest as suggest_router
 
 # Load environment variables
 load_dotenv()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+logger = logs.get_logger(__name__)
+
+# Create database tables, then bring existing ones up to date
+init_db()
+if settings.AUTO_MIGRATE:
+    migrations.upgrade(engine)
+elif migrations.pending(engine):
+    print("⚠️  Pending schema migrations - run: python -m app.migrations upgrade")
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -35,6 +50,10 @@ app = FastAPI(
 # MIDDLEWARE CONFIGURATION
 # ============================================================================
 
+# Request timing for thread-wait telemetry (innermost, so it starts the
+# clock after admission control has let the request in)
+app.add_middleware(telemetry.RequestTimingMiddleware)
+
 # Security: Trusted Host Middleware (only in production)
 if os.getenv("ENVIRONMENT") == "production":
     allowed_hosts = os.getenv("ALLOWED_HOSTS", "https://academic-portfolio-api.onrender.com").split(",")
@@ -43,6 +62,11 @@ if os.getenv("ENVIRONMENT") == "production":
         allowed_hosts=[host.strip() for host in allowed_hosts]
     )
 
+# Admission control: shed load with a fast 503 instead of queueing
+# (added before CORS so rejections still carry CORS headers)
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
 # CORS Configuration
 allowed_origins_str = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000")
 origins = [origin.strip() for origin in allowed_origins_str.split(",")]
@@ -51,8 +75,9 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "Retry-After", "X-Request-ID", "X-Profile-Name"],
     max_age=3600,
 )
 
@@ -69,27 +94,13 @@ async def add_security_headers(request, call_next):
     return response
 
 
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request, call_next):
-    """Log all incoming requests with timing"""
-    start_time = datetime.now()
-    
-    # Process the request
-    response = await call_next(request)
-    
-    # Calculate duration
-    duration = (datetime.now() - start_time).total_seconds()
-    
-    # Log the request
-    print(
-        f"[{datetime.now().strftime('%H:%M:%S')}] "
-        f"{request.method} {request.url.path} "
-        f"→ {response.status_code} "
-        f"({duration:.3f}s)"
-    )
-    
-    return response
+# On-demand profiler (X-Profile header / admin toggle) - inside the request
+# log so profiles carry the request id, outside everything else
+app.add_middleware(profiler.ProfilerMiddleware)
+
+# Structured request logging (outermost, so it sees every response -
+# including admission rejections - and the request id covers all logging)
+app.add_middleware(logs.RequestLogMiddleware)
 
 
 # ============================================================================
@@ -102,6 +113,9 @@ app.include_router(blogs.router)
 app.include_router(contact.router)
 app.include_router(research.router)
 app.include_router(papers.router)
+app.include_router(media.router)
+app.include_router(admin.router)
+app.include_router(suggest_router.router)
 
 
 # ============================================================================
@@ -131,35 +145,54 @@ def health():
     return {"status": "ok", "timestamp": datetime.now().isoformat()}
     
 
+@app.get("/ready", tags=["Status"])
+def ready():
+    """
+    Readiness check for the platform health probe
+    Reports warm-up status and the last background database probe -
+    never touches the database itself, so probes add no DB load.
+    """
+    ready = warmup.is_ready()
+    return JSONResponse(status_code=200 if ready else 503, content={
+        "status": "ready" if ready else "warming",
+        "warm": warmup.state["warm"],
+        "warmed_at": warmup.state["warmed_at"],
+        "warmup_ms": warmup.state["duration_ms"],
+        "database": warmup.state["probe"],
+        "timestamp": datetime.now().isoformat()
+    })
+
+
 @app.get("/api/health", tags=["Status"])
-async def health_check(db: Session = Depends(get_db)):
-    try:
-        # Use text() wrapper for the SQL query
-        db.execute(text("SELECT 1"))
-        
-        database_url = os.getenv("DATABASE_URL", "sqlite:///./portfolio.db")
-        db_type = "PostgreSQL" if "postgresql" in database_url else "SQLite"
-        
-        return {
-            "status": "healthy",
-            "database": {
-                "connected": True,
-                "type": db_type
-            },
-            "timestamp": datetime.now().isoformat(),
-            "environment": os.getenv("ENVIRONMENT", "development"),
-            "version": "1.0.0"
-        }
-    except Exception as e:
-        print(f"❌ Health check failed: {e}")
+def health_check():
+    """Health status from the last background database probe"""
+    probe = warmup.state["probe"]
+    database_url = os.getenv("DATABASE_URL", "sqlite:///./portfolio.db")
+    db_type = "PostgreSQL" if "postgresql" in database_url else "SQLite"
+    
+    if probe["ok"] is False:
         return {
             "status": "unhealthy",
             "database": {
                 "connected": False,
-                "error": str(e)
+                "error": probe["error"],
+                "checked_at": probe["checked_at"]
             },
             "timestamp": datetime.now().isoformat()
         }
+    
+    return {
+        "status": "healthy",
+        "database": {
+            "connected": probe["ok"] is True,
+            "type": db_type,
+            "checked_at": probe["checked_at"]
+        },
+        "warm": warmup.state["warm"],
+        "timestamp": datetime.now().isoformat(),
+        "environment": os.getenv("ENVIRONMENT", "development"),
+        "version": "1.0.0"
+    }
 
 
 @app.get("/api/status", tags=["Status"])
@@ -201,10 +234,13 @@ async def startup_event():
     print("=" * 60)
     print("🚀 Academic Portfolio API is starting...")
     print("=" * 60)
+    logs.start()  # Writer thread for the log queue (one per worker process)
     
     # Environment info
     environment = os.getenv("ENVIRONMENT", "development")
     print(f"🌍 Environment: {environment}")
+    if not settings.MEDIA_BASE_URL:
+        print("⚠️  MEDIA_BASE_URL is not set - uploaded media get relative URLs")
     
     # Database info
     database_url = os.getenv("DATABASE_URL")
@@ -226,6 +262,32 @@ async def startup_event():
     else:
         print("❌ Database connection failed - check configuration")
     
+    # Worker threads for sync routes
+    telemetry.configure_threadpool(settings.THREADPOOL_SIZE)
+    print(
+        f"🧵 Threadpool: {settings.THREADPOOL_SIZE} threads | "
+        f"DB pools: read {settings.DB_READ_POOL_SIZE}+{settings.DB_READ_MAX_OVERFLOW}, "
+        f"write {settings.DB_WRITE_POOL_SIZE}+{settings.DB_WRITE_MAX_OVERFLOW}"
+    )
+    
+    # Build derived tables for databases that predate them, and in-memory indexes
+    db = SessionLocal()
+    try:
+        ensure_facets(db)
+        ensure_technologies(db)
+        ensure_related(db)
+        ensure_stats(db)
+        suggest.build(db)
+        spam.load_blocklist(db)
+    except Exception as e:
+        print(f"⚠️  Could not build derived tables: {e}")
+    finally:
+        db.close()
+    
+    # Warm pools, queries and caches in the background; /ready reports progress
+    warmup.start()
+    views.counter.start()  # Periodic flush of buffered blog view counts
+    
     # CORS origins
     print(f"📍 Allowed CORS origins: {origins}")
     
@@ -234,7 +296,7 @@ async def startup_event():
     
     # API endpoints
     print(f"📚 API Documentation: /docs")
-    print(f"💚 Health Check: /api/health")
+    print(f"💚 Health Check: /api/health (readiness: /ready)")
     
     print("=" * 60)
     print("✨ Academic Portfolio API is ready!")
@@ -246,9 +308,13 @@ async def shutdown_event():
     """
     Run on application shutdown
     """
+    warmup.stop()
+    notifier.flush()  # Don't lose queued digest notifications
+    views.counter.stop()  # ...or buffered view counts
     print("=" * 60)
     print("👋 Academic Portfolio API is shutting down...")
     print("=" * 60)
+    logs.stop()  # Flush queued log records
 
 
 # ============================================================================
@@ -258,22 +324,23 @@ async def shutdown_event():
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
     """Custom 404 handler"""
-    return {
+    return JSONResponse(status_code=404, content={
         "error": "Not Found",
+        "detail": getattr(exc, "detail", "Not Found"),
         "message": f"The endpoint {request.url.path} does not exist",
         "status_code": 404
-    }
+    })
 
 
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
     """Custom 500 handler"""
-    print(f"❌ Internal Server Error: {exc}")
-    return {
+    logger.error("Internal Server Error", exc_info=exc)
+    return JSONResponse(status_code=500, content={
         "error": "Internal Server Error",
         "message": "An unexpected error occurred",
         "status_code": 500
-    }
+    })
 
 
 # ============================================================================
@@ -0,0 +1,136 @@
+"""
+Content-addressed media storage on local disk
+Files are named after the SHA-256 of their bytes, so identical uploads
+share one file and a URL never changes meaning - it can be cached forever.
+"""
+
+import hashlib
+import os
+import tempfile
+
+from fastapi.responses import FileResponse, Response
+
+from .config import settings
+
+# One year - the maximum recommended for immutable assets
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def media_path(relative_path: str) -> str:
+    """Absolute path of a stored file, refusing anything outside MEDIA_ROOT"""
+    root = os.path.realpath(settings.MEDIA_ROOT)
+    path = os.path.realpath(os.path.join(root, relative_path))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError("Path escapes the media root")
+    return path
+
+
+def public_url(path: str) -> str:
+    """Absolute URL of an API path such as /media/..., using MEDIA_BASE_URL"""
+    return f"{settings.MEDIA_BASE_URL}{path}"
+
+
+def media_url(relative_path: str) -> str:
+    """Public URL for a stored file"""
+    return public_url(f"/media/{relative_path}")
+
+
+def store_bytes(data: bytes, folder: str, extension: str):
+    """
+    Store data under folder/<sha256>.<extension>.
+    Returns (sha256, relative_path); existing files are never rewritten.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    relative_path = f"{folder}/{digest}.{extension}"
+    path = media_path(relative_path)
+
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file and rename so readers never see partial files
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    return digest, relative_path
+
+
+def store_stream(fileobj, folder: str, extension: str, max_bytes: int, chunk_size: int = 1024 * 1024):
+    """
+    Like store_bytes(), but hashes and writes the upload in chunks so large
+    files never sit in memory. Returns (sha256, relative_path, size, existed);
+    raises ValueError if the file is larger than max_bytes.
+    """
+    tmp_dir = media_path(folder)
+    os.makedirs(tmp_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            while True:
+                chunk = fileobj.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValueError("File is too large")
+                digest.update(chunk)
+                f.write(chunk)
+
+        sha256 = digest.hexdigest()
+        relative_path = f"{folder}/{sha256}.{extension}"
+        path = media_path(relative_path)
+        existed = os.path.exists(path)
+        if existed:
+            # Same bytes already stored - keep the single copy
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+        return sha256, relative_path, size, existed
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def serve_file(relative_path: str, media_type: str = None, filename: str = None,
+               cache_control: str = IMMUTABLE_CACHE_CONTROL, if_none_match: str = None):
+    """
+    Response for a stored file.
+
+    The ETag is the content hash (the file name), so it is strong and
+    If-Range works across restarts and workers. Starlette's FileResponse
+    answers Range / If-Range with 206 Partial Content and hands the file
+    to the server through the ASGI pathsend extension when the server
+    supports it. With MEDIA_ACCEL_REDIRECT set, the app only returns an
+    X-Accel-Redirect header and the front proxy (nginx) sends the file
+    itself with sendfile().
+    """
+    path = media_path(relative_path)
+    if not os.path.isfile(path):
+        return None
+
+    sha256 = os.path.basename(path).split(".", 1)[0]
+    headers = {
+        "Cache-Control": cache_control,
+        "ETag": f'"{sha256}"',
+    }
+
+    if if_none_match and headers["ETag"] in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    if settings.MEDIA_ACCEL_REDIRECT:
+        headers["X-Accel-Redirect"] = f"{settings.MEDIA_ACCEL_REDIRECT}/{relative_path}"
+        if filename:
+            headers["Content-Disposition"] = f'inline; filename="{filename}"'
+        return Response(status_code=200, headers=headers, media_type=media_type)
+
+    return FileResponse(
+        path,
+        headers=headers,
+        media_type=media_type,
+        filename=filename,
+        content_disposition_type="inline",
+    )
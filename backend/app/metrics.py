@@ -0,0 +1,32 @@
+"""
+In-process counters
+Cheap, lock-protected counters for things worth watching but not worth a
+database row (e.g. rejected spam). Counts are per worker process and
+reset on restart; /api/admin/metrics reports the worker that answered.
+"""
+
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+
+_lock = threading.Lock()
+_counters = Counter()
+_started_at = datetime.now().isoformat()
+
+
+def increment(name: str, amount: int = 1):
+    with _lock:
+        _counters[name] += amount
+
+
+def snapshot():
+    """All counters, plus which worker they belong to"""
+    with _lock:
+        counters = dict(sorted(_counters.items()))
+    return {"pid": os.getpid(), "since": _started_at, "counters": counters}
+
+
+def reset():
+    with _lock:
+        _counters.clear()
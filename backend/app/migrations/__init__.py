@@ -0,0 +1,300 @@
+"""
+Versioned schema migrations
+
+Base.metadata.create_all() creates missing tables but never alters
+existing ones. Changes to existing tables (new columns, new indexes) live
+in versioned scripts under app/migrations/versions/, named
+NNNN_description.py, each defining:
+
+    description = "what it does"
+
+    def upgrade(ctx):
+        ctx.add_column("blog_posts", Column("views", Integer, default=0))
+        ctx.create_index("ix_blog_posts_published", "blog_posts", ["published"])
+
+Applied versions are recorded in the schema_migrations table. Operations
+are idempotent, so a migration interrupted halfway can simply be re-run.
+
+On PostgreSQL indexes are built with CREATE INDEX CONCURRENTLY, which
+does not block writes. On SQLite, changes ALTER TABLE cannot express are
+done with a batch rebuild: copy into a new table, then swap it in.
+
+Usage:
+    python -m app.migrations upgrade   # apply pending migrations
+    python -m app.migrations status    # list applied / pending versions
+    python -m app.migrations check     # compare models.py with the live schema
+"""
+
+import importlib
+import pkgutil
+import re
+import sys
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, text
+from sqlalchemy.schema import CreateColumn, CreateTable
+
+from . import versions
+
+_migrations_table = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String(20), primary_key=True),
+    Column("description", String(200)),
+    Column("applied_at", DateTime, default=datetime.utcnow),
+)
+
+
+class MigrationContext:
+    """Schema operations available to migration scripts"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.dialect = engine.dialect.name
+
+    @property
+    def is_sqlite(self):
+        return self.dialect == "sqlite"
+
+    @property
+    def is_postgresql(self):
+        return self.dialect == "postgresql"
+
+    def _inspector(self):
+        return inspect(self.engine)
+
+    def has_table(self, table):
+        return self._inspector().has_table(table)
+
+    def has_column(self, table, column):
+        return any(c["name"] == column for c in self._inspector().get_columns(table))
+
+    def get_index(self, table, name):
+        """The reflected index (dict with name / column_names / unique), or None"""
+        return next((i for i in self._inspector().get_indexes(table) if i["name"] == name), None)
+
+    def has_index(self, table, name):
+        return self.get_index(table, name) is not None
+
+    def execute(self, sql, **params):
+        """Run a statement in its own transaction"""
+        with self.engine.begin() as connection:
+            return connection.execute(text(sql), params)
+
+    # ------------------------------------------------------------------
+    # Columns
+    # ------------------------------------------------------------------
+    def add_column(self, table, column: Column):
+        """Add a column unless it already exists"""
+        if not self.has_table(table) or self.has_column(table, column.name):
+            return False
+
+        if self.is_sqlite and (column.unique or column.primary_key or column.foreign_keys):
+            # SQLite's ALTER TABLE cannot add constrained columns
+            self.rebuild_table(table)
+            return True
+
+        column_sql = CreateColumn(column).compile(dialect=self.engine.dialect)
+        self.execute(f'ALTER TABLE "{table}" ADD COLUMN {column_sql}')
+        print(f"  + column {table}.{column.name}")
+        return True
+
+    # ------------------------------------------------------------------
+    # Indexes
+    # ------------------------------------------------------------------
+    def create_index(self, name, table, columns, unique=False):
+        """Create an index without blocking writes where the database allows it"""
+        if not self.has_table(table):
+            return False
+
+        column_sql = ", ".join(f'"{c}"' for c in columns)
+        unique_sql = "UNIQUE " if unique else ""
+
+        if self.is_postgresql:
+            # A failed concurrent build leaves an INVALID index behind - drop and retry
+            with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                invalid = connection.execute(text(
+                    "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+                    "WHERE c.relname = :name AND NOT i.indisvalid"
+                ), {"name": name}).first()
+                if invalid:
+                    connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+                connection.execute(text(
+                    f'CREATE {unique_sql}INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" ({column_sql})'
+                ))
+        else:
+            if self.has_index(table, name):
+                return False
+            self.execute(f'CREATE {unique_sql}INDEX IF NOT EXISTS "{name}" ON "{table}" ({column_sql})')
+
+        print(f"  + index {name} on {table}({', '.join(columns)})")
+        return True
+
+    def drop_index(self, name, table):
+        if not self.has_table(table) or not self.has_index(table, name):
+            return False
+        if self.is_postgresql:
+            with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+        else:
+            self.execute(f'DROP INDEX IF EXISTS "{name}"')
+        print(f"  - index {name}")
+        return True
+
+    # ------------------------------------------------------------------
+    # SQLite batch rebuild
+    # ------------------------------------------------------------------
+    def rebuild_table(self, table):
+        """
+        Rebuild a SQLite table to match its definition in models.py:
+        create the new table, copy the shared columns, drop the old one,
+        rename, recreate indexes - all in one transaction.
+        """
+        from ..database import Base
+        from .. import models  # noqa: F401 - registers the tables on Base.metadata
+
+        model_table = Base.metadata.tables[table]
+        existing = {c["name"] for c in self._inspector().get_columns(table)}
+        shared = [c.name for c in model_table.columns if c.name in existing]
+        column_sql = ", ".join(f'"{c}"' for c in shared)
+        tmp_name = f"_{table}_rebuild"
+
+        create_sql = str(CreateTable(model_table).compile(dialect=self.engine.dialect))
+        create_sql = re.sub(rf'^\s*CREATE TABLE "?{table}"?', f'CREATE TABLE "{tmp_name}"', create_sql, count=1)
+
+        with self.engine.connect() as connection:
+            # foreign_keys can only be switched outside a transaction
+            connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            connection.commit()
+            with connection.begin():
+                connection.exec_driver_sql(f'DROP TABLE IF EXISTS "{tmp_name}"')
+                connection.exec_driver_sql(create_sql)
+                connection.exec_driver_sql(
+                    f'INSERT INTO "{tmp_name}" ({column_sql}) SELECT {column_sql} FROM "{table}"'
+                )
+                connection.exec_driver_sql(f'DROP TABLE "{table}"')
+                connection.exec_driver_sql(f'ALTER TABLE "{tmp_name}" RENAME TO "{table}"')
+                for index in model_table.indexes:
+                    index.create(connection, checkfirst=True)
+            connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+            connection.commit()
+
+        print(f"  ~ rebuilt table {table}")
+
+
+# ============================================================================
+# Runner
+# ============================================================================
+def discover():
+    """[(version, module)] for every script in versions/, in order"""
+    found = []
+    for info in pkgutil.iter_modules(versions.__path__):
+        match = re.match(r"^(\d{4})_", info.name)
+        if match:
+            module = importlib.import_module(f"{versions.__name__}.{info.name}")
+            found.append((match.group(1), module))
+    return sorted(found, key=lambda item: item[0])
+
+
+def applied_versions(engine):
+    _migrations_table.create(engine, checkfirst=True)
+    with engine.connect() as connection:
+        return {row[0] for row in connection.execute(_migrations_table.select())}
+
+
+def pending(engine):
+    done = applied_versions(engine)
+    return [(version, module) for version, module in discover() if version not in done]
+
+
+def upgrade(engine):
+    """Apply every pending migration, in order; returns the versions applied"""
+    from ..database import Base
+    from .. import models  # noqa: F401 - registers the tables on Base.metadata
+
+    # New tables come straight from the models
+    Base.metadata.create_all(bind=engine)
+
+    ctx = MigrationContext(engine)
+    applied = []
+    for version, module in pending(engine):
+        description = getattr(module, "description", module.__name__)
+        print(f"⏫ Applying migration {version}: {description}")
+        module.upgrade(ctx)
+        with engine.begin() as connection:
+            connection.execute(_migrations_table.insert().values(
+                version=version,
+                description=description[:200],
+                applied_at=datetime.utcnow(),
+            ))
+        applied.append(version)
+    return applied
+
+
+def check(engine):
+    """
+    Compare columns and indexes declared in models.py with the live schema.
+    Returns a list of human-readable problems (empty when in sync).
+    """
+    from ..database import Base
+    from .. import models  # noqa: F401 - registers the tables on Base.metadata
+
+    inspector = inspect(engine)
+    problems = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            problems.append(f"missing table {table.name}")
+            continue
+
+        live_columns = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in live_columns:
+                problems.append(f"missing column {table.name}.{column.name}")
+
+        live_indexes = {
+            tuple(i["column_names"]): i for i in inspector.get_indexes(table.name)
+        }
+        primary_key = tuple(c.name for c in table.primary_key.columns)
+        for index in table.indexes:
+            columns = tuple(c.name for c in index.columns)
+            if columns == primary_key:
+                continue  # The primary key is indexed already
+            live = live_indexes.get(columns)
+            if live is None:
+                problems.append(f"missing index {index.name} on {table.name}({', '.join(columns)})")
+            elif index.unique and not live.get("unique"):
+                problems.append(f"index {live['name']} on {table.name} should be unique")
+    return problems
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "status"
+
+    from ..database import engine
+
+    if command == "upgrade":
+        applied = upgrade(engine)
+        print(f"✅ Applied {len(applied)} migration(s)" if applied else "✅ Database is up to date")
+        return 0
+
+    if command == "status":
+        done = applied_versions(engine)
+        for version, module in discover():
+            mark = "applied" if version in done else "pending"
+            print(f"{version}  {mark:8} {getattr(module, 'description', '')}")
+        return 0
+
+    if command == "check":
+        problems = check(engine)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if not problems:
+            print("✅ Live schema matches models.py")
+        return 1 if problems else 0
+
+    print("Usage: python -m app.migrations [upgrade|status|check]")
+    return 1
+
+
+__all__ = ["MigrationContext", "check", "discover", "main", "pending", "upgrade"]
@@ -0,0 +1,11 @@
+"""Columns added for content-addressed media"""
+
+from sqlalchemy import Column, Integer, String, Text
+
+description = "Add research_projects.image_variants and publications.pdf_sha256 / pdf_size"
+
+
+def upgrade(ctx):
+    ctx.add_column("research_projects", Column("image_variants", Text))
+    ctx.add_column("publications", Column("pdf_sha256", String(64)))
+    ctx.add_column("publications", Column("pdf_size", Integer))
@@ -0,0 +1,69 @@
+"""Indexes for the public list / filter queries and the admin inbox"""
+
+from collections import defaultdict
+
+from sqlalchemy import text
+
+description = "Add indexes on published, created_at, read, doi (unique), year, journal, status/order"
+
+INDEXES = [
+    ("ix_blog_posts_published", "blog_posts", ["published"]),
+    ("ix_blog_posts_created_at", "blog_posts", ["created_at"]),
+    ("ix_contact_messages_read", "contact_messages", ["read"]),
+    ("ix_contact_messages_created_at", "contact_messages", ["created_at"]),
+    ("ix_publications_year", "publications", ["year"]),
+    ("ix_publications_journal", "publications", ["journal"]),
+    ("ix_research_projects_status_order", "research_projects", ["status", "order"]),
+]
+
+
+def normalize_existing_dois(ctx):
+    """
+    Bring old DOIs into the normalized form so the unique index can be
+    built. If two publications normalize to the same DOI nothing is
+    changed and the migration stops, listing them - an admin has to merge
+    or correct those rows before re-running it.
+    """
+    from app.bibimport import normalize_doi
+
+    with ctx.engine.begin() as connection:
+        rows = connection.execute(
+            text("SELECT id, doi FROM publications WHERE doi IS NOT NULL ORDER BY id")
+        ).fetchall()
+
+        ids_by_doi = defaultdict(list)
+        for publication_id, doi in rows:
+            normalized = normalize_doi(doi)
+            if normalized:
+                ids_by_doi[normalized].append(publication_id)
+        conflicts = {doi: ids for doi, ids in ids_by_doi.items() if len(ids) > 1}
+        if conflicts:
+            listing = "\n".join(
+                f"  {doi}: publications {', '.join(str(i) for i in ids)}"
+                for doi, ids in sorted(conflicts.items())
+            )
+            raise RuntimeError(
+                "Publications share a DOI, so the unique index on publications.doi "
+                "cannot be built. Merge or correct them, then re-run the migration:\n" + listing
+            )
+
+        for publication_id, doi in rows:
+            normalized = normalize_doi(doi)
+            if normalized != doi:
+                connection.execute(
+                    text("UPDATE publications SET doi = :doi WHERE id = :id"),
+                    {"doi": normalized, "id": publication_id},
+                )
+
+
+def upgrade(ctx):
+    for name, table, columns in INDEXES:
+        ctx.create_index(name, table, columns)
+
+    if ctx.has_table("publications"):
+        normalize_existing_dois(ctx)
+        # Older databases may have a plain index under the same name
+        existing = ctx.get_index("publications", "ix_publications_doi")
+        if existing and not existing["unique"]:
+            ctx.drop_index("ix_publications_doi", "publications")
+        ctx.create_index("ix_publications_doi", "publications", ["doi"], unique=True)
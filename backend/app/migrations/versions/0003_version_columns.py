@@ -0,0 +1,10 @@
+"""Row versions for optimistic concurrency on admin edits"""
+
+from sqlalchemy import Column, Integer
+
+description = "Add version columns to blog_posts, research_projects and publications"
+
+
+def upgrade(ctx):
+    for table in ("blog_posts", "research_projects", "publications"):
+        ctx.add_column(table, Column("version", Integer, nullable=False, server_default="1"))
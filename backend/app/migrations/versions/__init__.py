@@ -0,0 +1 @@
+"""Versioned migration scripts - see app/migrations/__init__.py"""
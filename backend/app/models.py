@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, Float, String, Text, Date, DateTime, Boolean, ForeignKey, Index, LargeBinary, UniqueConstraint
+from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
 
@@ -11,15 +12,85 @@ class BlogPost(Base):
     content = Column(Text, nullable=False)
     excerpt = Column(String(900))  # Short preview
     author = Column(String(500), default="Your Name")
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    published = Column(Boolean, default=True)
+    published = Column(Boolean, default=True, index=True)
     tags = Column(String(500))  # Comma-separated tags
+    version = Column(Integer, nullable=False, server_default="1")  # Optimistic concurrency
+    
+    __mapper_args__ = {"version_id_col": version}
     
     def __repr__(self):
         return f"<BlogPost {self.title}>"
 
 
+class BlogRevision(Base):
+    """One recorded change to a blog post (see app/revisions.py)"""
+    __tablename__ = "blog_revisions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    blog_id = Column(Integer, ForeignKey("blog_posts.id", ondelete="CASCADE"), nullable=False)
+    revision = Column(Integer, nullable=False)  # 1, 2, 3... per post
+    kind = Column(String(10), nullable=False)  # "snapshot" or "delta"
+    data = Column(LargeBinary, nullable=False)  # zlib-compressed JSON
+    size = Column(Integer, nullable=False, default=0)  # len(data)
+    changed_fields = Column(String(200))  # Comma-separated
+    restored_from = Column(Integer)  # Revision this one restored, if any
+    created_by = Column(String(100))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint("blog_id", "revision", name="uq_blog_revisions_blog_revision"),
+    )
+    
+    def __repr__(self):
+        return f"<BlogRevision {self.blog_id}#{self.revision}>"
+
+
+class BlogViewCount(Base):
+    """Views of a blog post per day, written in batches by app/views.py"""
+    __tablename__ = "blog_view_counts"
+    
+    blog_id = Column(Integer, ForeignKey("blog_posts.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True, index=True)
+    views = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<BlogViewCount {self.blog_id} {self.day}: {self.views}>"
+
+
+class RelatedTerm(Base):
+    """Term counts of one blog post or publication, for the related-content index"""
+    __tablename__ = "related_terms"
+    
+    kind = Column(String(10), primary_key=True)  # "blog" or "paper"
+    item_id = Column(Integer, primary_key=True)
+    term = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_related_terms_kind_term", "kind", "term"),
+    )
+
+
+class RelatedItem(Base):
+    """Precomputed top-k most similar items of the same kind (see app/related.py)"""
+    __tablename__ = "related_items"
+    
+    kind = Column(String(10), primary_key=True)
+    item_id = Column(Integer, primary_key=True)
+    rank = Column(Integer, primary_key=True)  # 0 = most similar
+    related_id = Column(Integer, nullable=False)
+    score = Column(Float, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_related_items_kind_related", "kind", "related_id"),
+    )
+    
+    def __repr__(self):
+        return f"<RelatedItem {self.kind} {self.item_id} -> {self.related_id}>"
+
+
 class ContactMessage(Base):
     """Model for contact form submissions"""
     __tablename__ = "contact_messages"
@@ -29,13 +100,26 @@ class ContactMessage(Base):
     email = Column(String(100), nullable=False)
     subject = Column(String(200))
     message = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    read = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    read = Column(Boolean, default=False, index=True)
     
     def __repr__(self):
         return f"<ContactMessage from {self.name}>"
 
 
+class BlockedSender(Base):
+    """Contact form blocklist entry: a full email address or a whole domain"""
+    __tablename__ = "blocked_senders"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    value = Column(String(200), nullable=False, unique=True, index=True)  # Lowercase
+    reason = Column(String(200))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<BlockedSender {self.value}>"
+
+
 class ResearchProject(Base):
     """Model for research projects"""
     __tablename__ = "research_projects"
@@ -44,17 +128,49 @@ class ResearchProject(Base):
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=False)
     image_url = Column(String(500))
+    image_variants = Column(Text)  # JSON: resized variants of an uploaded image
     project_url = Column(String(500))  # Link to GitHub, etc.
     technologies = Column(String(300))  # Comma-separated
     status = Column(String(50), default="Completed")  # Completed, Ongoing, Planned
     start_date = Column(String(50))
     end_date = Column(String(50))
     order = Column(Integer, default=0)  # For custom ordering
+    version = Column(Integer, nullable=False, server_default="1")  # Optimistic concurrency
+    
+    # Normalized copy of `technologies`, kept in sync by app/technologies.py
+    technology_links = relationship("ResearchProjectTechnology", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index("ix_research_projects_status_order", "status", "order"),
+    )
+    __mapper_args__ = {"version_id_col": version}
     
     def __repr__(self):
         return f"<ResearchProject {self.title}>"
 
 
+class Technology(Base):
+    """A distinct technology parsed from ResearchProject.technologies"""
+    __tablename__ = "technologies"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)
+    normalized_name = Column(String(100), nullable=False, unique=True, index=True)
+    
+    def __repr__(self):
+        return f"<Technology {self.name}>"
+
+
+class ResearchProjectTechnology(Base):
+    """Association between research projects and technologies"""
+    __tablename__ = "research_project_technologies"
+    
+    project_id = Column(Integer, ForeignKey("research_projects.id", ondelete="CASCADE"), primary_key=True)
+    technology_id = Column(Integer, ForeignKey("technologies.id", ondelete="CASCADE"), primary_key=True, index=True)
+    
+    technology = relationship("Technology")
+
+
 class Publication(Base):
     """Model for academic papers/publications"""
     __tablename__ = "publications"
@@ -62,13 +178,73 @@ class Publication(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(300), nullable=False)
     authors = Column(String(500), nullable=False)
-    journal = Column(String(200))
-    year = Column(Integer)
-    doi = Column(String(100))
+    journal = Column(String(200), index=True)
+    year = Column(Integer, index=True)
+    doi = Column(String(100), unique=True, index=True)  # Normalized (lowercase, no URL prefix)
     pdf_url = Column(String(500))
+    pdf_sha256 = Column(String(64))  # Self-hosted PDF (content-addressed)
+    pdf_size = Column(Integer)
     abstract = Column(Text)
     citation = Column(Text)  # Formatted citation
     order = Column(Integer, default=0)
+    version = Column(Integer, nullable=False, server_default="1")  # Optimistic concurrency
+    
+    # Normalized copy of `authors`, kept in sync by app/facets.py
+    author_links = relationship(
+        "PublicationAuthor",
+        cascade="all, delete-orphan",
+        order_by="PublicationAuthor.position",
+    )
+    
+    __mapper_args__ = {"version_id_col": version}
     
     def __repr__(self):
         return f"<Publication {self.title}>"
+
+
+class Author(Base):
+    """A distinct author name parsed from Publication.authors"""
+    __tablename__ = "authors"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(200), nullable=False)  # Display form, e.g. "Smith, John"
+    normalized_name = Column(String(200), nullable=False, unique=True, index=True)
+    
+    def __repr__(self):
+        return f"<Author {self.name}>"
+
+
+class PublicationAuthor(Base):
+    """Association between publications and their authors, in author order"""
+    __tablename__ = "publication_authors"
+    
+    publication_id = Column(Integer, ForeignKey("publications.id", ondelete="CASCADE"), primary_key=True)
+    author_id = Column(Integer, ForeignKey("authors.id", ondelete="CASCADE"), primary_key=True, index=True)
+    position = Column(Integer, default=0)
+    
+    author = relationship("Author")
+
+
+class PublicationFacet(Base):
+    """Precomputed publication counts per year / journal / author"""
+    __tablename__ = "publication_facets"
+    
+    facet = Column(String(20), primary_key=True)  # "year", "journal" or "author"
+    value = Column(String(200), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<PublicationFacet {self.facet}={self.value}: {self.count}>"
+
+
+class AdminStat(Base):
+    """Precomputed admin dashboard counts, adjusted with every write"""
+    __tablename__ = "admin_stats"
+    
+    stat = Column(String(20), primary_key=True)  # "blog", "paper", "research", "message" or "blog_month"
+    key = Column(String(20), primary_key=True)  # "total", "published", "draft", "unread" or "YYYY-MM"
+    count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<AdminStat {self.stat}.{self.key}: {self.count}>"
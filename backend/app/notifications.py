@@ -0,0 +1,93 @@
+"""
+Contact form notifications, optionally batched into digests
+
+With CONTACT_DIGEST_ENABLED, new messages are queued and sent as one
+summary email when CONTACT_DIGEST_MAX_MESSAGES have accumulated or
+CONTACT_DIGEST_INTERVAL_SECONDS after the first queued one, whichever
+comes first. The first message after CONTACT_DIGEST_QUIET_SECONDS without
+any notification is sent immediately, so a lone message is never delayed.
+Each worker process keeps its own queue; flush() runs on shutdown.
+"""
+
+import threading
+import time
+
+from .config import settings
+from .email_utils import send_contact_email, send_digest_email
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+
+class ContactNotifier:
+    def __init__(self, enabled, interval, max_messages, quiet_period):
+        self.enabled = enabled
+        self.interval = interval
+        self.max_messages = max_messages
+        self.quiet_period = quiet_period
+        self._pending = []
+        self._lock = threading.Lock()
+        self._timer = None
+        self._last_sent = float("-inf")
+
+    def notify(self, name, email, subject, message):
+        """Send (or queue) the notification for one new contact message"""
+        if not self.enabled:
+            return send_contact_email(name=name, email=email, subject=subject, message=message)
+
+        item = {"name": name, "email": email, "subject": subject, "message": message}
+        now = time.monotonic()
+        with self._lock:
+            if not self._pending and now - self._last_sent >= self.quiet_period:
+                # Quiet inbox - no reason to wait
+                self._last_sent = now
+                batch = [item]
+            else:
+                self._pending.append(item)
+                if len(self._pending) < self.max_messages:
+                    self._schedule()
+                    return None
+                batch = self._take()
+        return self._send(batch)
+
+    def flush(self):
+        """Send everything queued now"""
+        with self._lock:
+            batch = self._take()
+        if batch:
+            return self._send(batch)
+        return None
+
+    def _schedule(self):
+        # Caller holds the lock
+        if self._timer is None:
+            self._timer = threading.Timer(self.interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _take(self):
+        # Caller holds the lock
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self._last_sent = time.monotonic()
+        return batch
+
+    def _send(self, batch):
+        try:
+            if len(batch) > 1:
+                logger.info("Sending digest of %s contact messages", len(batch))
+            return send_digest_email(batch)
+        except Exception as e:
+            logger.warning("Email notification failed: %s", e)
+            return False
+
+
+notifier = ContactNotifier(
+    enabled=settings.CONTACT_DIGEST_ENABLED,
+    interval=settings.CONTACT_DIGEST_INTERVAL_SECONDS,
+    max_messages=settings.CONTACT_DIGEST_MAX_MESSAGES,
+    quiet_period=settings.CONTACT_DIGEST_QUIET_SECONDS,
+)
@@ -0,0 +1,340 @@
+"""
+On-demand sampling profiler
+
+Off by default and free when idle: the middleware does one dict lookup per
+request and no sampler thread exists. A request is profiled when
+
+- it carries "X-Profile: 1" and a valid admin bearer token, or
+- it matches a route armed from the admin API (next N requests per worker;
+  POST /api/admin/profiler/arm, broadcast to every worker).
+
+While a profiled request is in flight, a sampler thread records the stack
+of the event loop thread (middleware, dependency orchestration, async
+code) and of every busy threadpool worker (sync dependencies such as
+get_read_db / verify_token, the handler, SQLAlchemy, response validation)
+every PROFILE_INTERVAL_MS. Other requests running at the same time in the
+same worker can show up in the samples; the profile records how many
+there were (concurrent_requests).
+
+Profiles are written in collapsed-stack format ("frame;frame;frame N"),
+which flamegraph.pl, speedscope and inferno read directly, plus a small
+JSON sidecar. The store keeps the newest PROFILE_MAX_FILES profiles.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from .config import settings
+from .invalidation import bus
+from .logs import current_request, get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+_NAME = re.compile(r"^[\w.-]+$")
+
+
+# ============================================================================
+# Arming (admin toggle)
+# ============================================================================
+def _route_pattern(route: str):
+    """/api/blogs/{blog_id} -> regex matching concrete paths"""
+    parts = []
+    for piece in re.split(r"(\{[^}]+\})", route):
+        if piece.startswith("{"):
+            parts.append(".+" if piece.endswith(":path}") else "[^/]+")
+        else:
+            parts.append(re.escape(piece))
+    return re.compile("^" + "".join(parts) + "$")
+
+
+# (method, route) -> {"pattern", "remaining"}; empty when nothing is armed
+_armed = {}
+_armed_lock = threading.Lock()
+
+
+def _on_arm(payload):
+    key = (payload["method"], payload["route"])
+    with _armed_lock:
+        if payload["count"] > 0:
+            _armed[key] = {"pattern": _route_pattern(payload["route"]), "remaining": payload["count"]}
+        else:
+            _armed.pop(key, None)
+
+
+def _on_disarm(payload):
+    with _armed_lock:
+        _armed.clear()
+
+
+bus.subscribe("profiler.arm", _on_arm)
+bus.subscribe("profiler.disarm", _on_disarm)
+
+
+def arm(method: str, route: str, count: int):
+    """Profile the next `count` matching requests in every worker"""
+    bus.publish("profiler.arm", {"method": method.upper(), "route": route, "count": count})
+
+
+def disarm():
+    bus.publish("profiler.disarm")
+
+
+def armed():
+    with _armed_lock:
+        return [
+            {"method": method, "route": route, "remaining": spec["remaining"]}
+            for (method, route), spec in _armed.items()
+        ]
+
+
+def _take_armed(method, path):
+    """True (and one fewer remaining) if an armed route matches"""
+    with _armed_lock:
+        for key, spec in _armed.items():
+            if key[0] in (method, "*") and spec["pattern"].match(path):
+                spec["remaining"] -= 1
+                if spec["remaining"] <= 0:
+                    del _armed[key]
+                return True
+    return False
+
+
+# ============================================================================
+# Sampling
+# ============================================================================
+def _frame_label(code, module):
+    return f"{module}:{code.co_qualname}"
+
+
+def _stack(frame):
+    """Root-first frame labels of one thread"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code, frame.f_globals.get("__name__", "?")))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _is_idle_worker(stack):
+    # An AnyIO worker waiting for its next job sits in queue.get()
+    return stack[-1].startswith("threading:") and any(label.startswith("queue:Queue.get") for label in stack[-4:])
+
+
+class Profile:
+    """Samples the event loop and worker threads until stop() is called"""
+
+    def __init__(self, method, path, trigger, interval):
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.interval = interval
+        self.loop_thread = threading.get_ident()
+        self.samples = Counter()
+        self.sample_count = 0
+        self.route = None
+        self.status = None
+        self.request_id = None
+        self.concurrent_requests = 0
+        self.started = time.time()
+        self.duration = 0.0
+        slug = re.sub(r"[^\w]+", "_", path.strip("/"))[:80] or "root"
+        stamp = datetime.utcfromtimestamp(self.started).strftime("%Y%m%dT%H%M%S%f")
+        self.name = f"{stamp}-{os.getpid()}-{method.lower()}-{slug}"
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, route, status, duration):
+        self.route, self.status, self.duration = route, status, duration
+        self._done.set()  # The sampler thread writes the files
+
+    def _sample(self):
+        me = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            if ident == self.loop_thread:
+                role = "event-loop"
+            elif names.get(ident, "").startswith("AnyIO worker thread"):
+                role = "worker"
+            else:
+                continue
+            stack = _stack(frame)
+            if role == "worker" and _is_idle_worker(stack):
+                continue
+            self.samples[";".join([role] + stack)] += 1
+        self.sample_count += 1
+
+    def _run(self):
+        while not self._done.wait(self.interval):
+            self._sample()
+        try:
+            store.save(self)
+        except Exception:
+            logger.exception("Error saving profile")
+
+
+# ============================================================================
+# Store
+# ============================================================================
+class ProfileStore:
+    """Newest `max_files` profiles as <name>.folded + <name>.json"""
+
+    def __init__(self, directory, max_files):
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def save(self, profile):
+        os.makedirs(self.directory, exist_ok=True)
+        name = profile.name
+
+        with open(os.path.join(self.directory, f"{name}.folded"), "w") as f:
+            for stack, count in profile.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        meta = {
+            "name": name,
+            "method": profile.method,
+            "path": profile.path,
+            "route": profile.route,
+            "status": profile.status,
+            "request_id": profile.request_id,
+            "trigger": profile.trigger,
+            "started_at": datetime.utcfromtimestamp(profile.started).isoformat(),
+            "duration_ms": round(profile.duration * 1000, 2),
+            "interval_ms": round(profile.interval * 1000, 2),
+            "samples": profile.sample_count,
+            "concurrent_requests": profile.concurrent_requests,
+            "pid": os.getpid(),
+        }
+        with open(os.path.join(self.directory, f"{name}.json"), "w") as f:
+            json.dump(meta, f)
+        self._prune()
+        return name
+
+    def _prune(self):
+        with self._lock:
+            names = sorted(self._names())
+            for name in names[:-self.max_files] if self.max_files > 0 else names:
+                self.delete(name)
+
+    def _names(self):
+        try:
+            return [f[:-5] for f in os.listdir(self.directory) if f.endswith(".json")]
+        except FileNotFoundError:
+            return []
+
+    def list(self):
+        profiles = []
+        for name in sorted(self._names(), reverse=True):
+            try:
+                with open(os.path.join(self.directory, f"{name}.json")) as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def path(self, name):
+        """Path of a stored .folded file, or None"""
+        if not _NAME.match(name):
+            return None
+        path = os.path.join(self.directory, f"{name}.folded")
+        return path if os.path.isfile(path) else None
+
+    def delete(self, name):
+        if not _NAME.match(name):
+            return False
+        removed = False
+        for ext in (".folded", ".json"):
+            try:
+                os.remove(os.path.join(self.directory, name + ext))
+                removed = True
+            except FileNotFoundError:
+                pass
+        return removed
+
+
+store = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_MAX_FILES)
+
+
+# ============================================================================
+# Middleware
+# ============================================================================
+class ProfilerMiddleware:
+    """Pure ASGI middleware starting a Profile for selected requests"""
+
+    def __init__(self, app):
+        self.app = app
+        self.interval = settings.PROFILE_INTERVAL_MS / 1000
+        self.in_flight = 0
+        self.active = None  # At most one profile per worker at a time
+
+    def _trigger(self, scope):
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER and value == b"1":
+                return "header" if self._is_admin(scope) else None
+        if _armed and _take_armed(scope["method"], scope["path"]):
+            return "armed"
+        return None
+
+    @staticmethod
+    def _is_admin(scope):
+        from .auth import token_username
+
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                return scheme.lower() == "bearer" and token_username(token) is not None
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.in_flight += 1
+        try:
+            trigger = self._trigger(scope) if self.active is None else None
+            if trigger is None:
+                if self.active is not None:
+                    self.active.concurrent_requests += 1
+                await self.app(scope, receive, send)
+                return
+            await self._profile(scope, receive, send, trigger)
+        finally:
+            self.in_flight -= 1
+
+    async def _profile(self, scope, receive, send, trigger):
+        profile = Profile(scope["method"], scope["path"], trigger, self.interval)
+        profile.concurrent_requests = self.in_flight - 1
+        context = current_request.get()
+        profile.request_id = context.request_id if context else None
+        self.active = profile
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-name", profile.name.encode())]
+            await send(message)
+
+        profile.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.active = None
+            route = scope.get("route")
+            profile.stop(getattr(route, "path", None), status, time.perf_counter() - start)
@@ -0,0 +1,304 @@
+"""
+Related content: "related posts" and "related publications"
+
+Each published blog post (title, tags, content) and each publication
+(title, abstract) is tokenized into term counts stored in related_terms,
+which doubles as an inverted index (kind, term). Similarity is the cosine
+of TF-IDF vectors, and the top RELATED_TOP_K neighbours of every item are
+stored in related_items, so /related is a single indexed read.
+
+Updates are incremental and run inside the same transaction as the write:
+only the changed item's vector is recomputed, against the items sharing
+at least one of its terms, and those items' neighbour lists are patched
+with the new score. Scores of untouched pairs keep the IDF they were
+computed with, so run a rebuild after large imports if exact scores
+matter.
+
+Usage:
+    python -m app.related rebuild
+"""
+
+import math
+import re
+import sys
+from collections import Counter
+
+from sqlalchemy import func, insert
+
+from .config import settings
+from .models import BlogPost, Publication, RelatedItem, RelatedTerm
+
+KINDS = ("blog", "paper")
+
+# Fields whose change requires re-indexing an item
+INDEXED_FIELDS = {
+    "blog": {"title", "tags", "excerpt", "content", "published"},
+    "paper": {"title", "abstract", "journal"},
+}
+
+# Terms used to find candidates; rare terms come first, so this keeps the
+# candidate set small without changing which items can be related
+MAX_QUERY_TERMS = 50
+MAX_TERMS_PER_ITEM = 300
+
+_TOKEN = re.compile(r"[a-z][a-z0-9]+")
+_MARKUP = re.compile(r"<[^>]+>|!?\[[^\]]*\]\([^)]*\)|https?://\S+")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers herself him himself his how however i if in into is it its itself
+just let me more most my myself no nor not now of off on once only or other our ours ourselves out
+over own same she should so some such than that the their theirs them themselves then there these
+they this those through to too under until up upon us using very via was we were what when where
+which while who whom why will with within without would you your yours yourself yourselves
+paper papers post posts article study results result show shows shown new based approach use used
+""".split())
+
+
+def tokenize(text: str):
+    text = _MARKUP.sub(" ", (text or "").lower())
+    return [t for t in _TOKEN.findall(text) if len(t) > 2 and t not in STOPWORDS and len(t) <= 50]
+
+
+def item_terms(kind, item):
+    """Term counts for a blog post or publication (titles and tags weigh more)"""
+    counts = Counter()
+    if kind == "blog":
+        fields = ((item.title, 3), (item.tags, 3), (item.excerpt, 1), (item.content, 1))
+    else:
+        fields = ((item.title, 3), (item.abstract, 1), (item.journal, 1))
+    for text, weight in fields:
+        for term in tokenize(text):
+            counts[term] += weight
+    return dict(counts.most_common(MAX_TERMS_PER_ITEM))
+
+
+def is_indexed(kind, item):
+    """Only published posts are recommended (or get recommendations)"""
+    return kind == "paper" or bool(item.published)
+
+
+# ============================================================================
+# Scoring
+# ============================================================================
+def _idf(db, kind, terms):
+    documents = db.query(func.count(func.distinct(RelatedTerm.item_id)))\
+        .filter(RelatedTerm.kind == kind).scalar() or 0
+    frequencies = dict(
+        db.query(RelatedTerm.term, func.count())
+        .filter(RelatedTerm.kind == kind, RelatedTerm.term.in_(terms))
+        .group_by(RelatedTerm.term)
+        .all()
+    ) if terms else {}
+    return {term: math.log((1 + documents) / (1 + frequencies.get(term, 0))) + 1 for term in terms}
+
+
+def _vector(counts, idf):
+    vector = {term: (1 + math.log(count)) * idf[term] for term, count in counts.items()}
+    norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+    return {term: w / norm for term, w in vector.items()}
+
+
+def _neighbours(db, kind, item_id, counts):
+    """[(other_id, score)] for every item sharing a term with `counts`"""
+    if not counts:
+        return []
+
+    # Candidates via the (kind, term) index, using the item's rarest terms
+    query_idf = _idf(db, kind, list(counts))
+    query_terms = sorted(counts, key=lambda t: -query_idf[t])[:MAX_QUERY_TERMS]
+    candidate_ids = [row[0] for row in db.query(func.distinct(RelatedTerm.item_id)).filter(
+        RelatedTerm.kind == kind,
+        RelatedTerm.term.in_(query_terms),
+        RelatedTerm.item_id != item_id,
+    )]
+    if not candidate_ids:
+        return []
+
+    candidates = {}
+    for other_id, term, count in db.query(RelatedTerm.item_id, RelatedTerm.term, RelatedTerm.count)\
+            .filter(RelatedTerm.kind == kind, RelatedTerm.item_id.in_(candidate_ids)):
+        candidates.setdefault(other_id, {})[term] = count
+
+    all_terms = set(counts).union(*candidates.values())
+    idf = _idf(db, kind, list(all_terms))
+    vector = _vector(counts, idf)
+
+    scores = []
+    for other_id, other_counts in candidates.items():
+        other = _vector(other_counts, idf)
+        score = sum(w * other.get(term, 0.0) for term, w in vector.items())
+        if score > 0:
+            scores.append((other_id, score))
+    return scores
+
+
+# Rows are written with Core inserts and read as plain columns, so no
+# index rows ever sit in the session's identity map; the bulk deletes
+# can then skip session synchronization.
+def _insert(db, model, rows):
+    if rows:
+        db.execute(insert(model), rows)
+
+
+def _insert_terms(db, kind, item_id, counts):
+    _insert(db, RelatedTerm, [
+        {"kind": kind, "item_id": item_id, "term": term, "count": count}
+        for term, count in counts.items()
+    ])
+
+
+def _top(scores):
+    return sorted(scores, key=lambda pair: (-pair[1], pair[0]))[:settings.RELATED_TOP_K]
+
+
+def _insert_neighbours(db, kind, item_id, scores):
+    _insert(db, RelatedItem, [
+        {"kind": kind, "item_id": item_id, "rank": rank, "related_id": other_id, "score": round(score, 6)}
+        for rank, (other_id, score) in enumerate(_top(scores))
+    ])
+
+
+def _store(db, kind, item_id, scores):
+    db.query(RelatedItem).filter(RelatedItem.kind == kind, RelatedItem.item_id == item_id)\
+        .delete(synchronize_session=False)
+    _insert_neighbours(db, kind, item_id, scores)
+
+
+def _patch_neighbour_lists(db, kind, item_id, scores):
+    """Insert / update / drop `item_id` in the stored lists of other items"""
+    by_id = dict(scores)
+    affected = set(by_id)
+    affected.update(row[0] for row in db.query(RelatedItem.item_id).filter(
+        RelatedItem.kind == kind, RelatedItem.related_id == item_id
+    ))
+    if not affected:
+        return
+
+    lists = {other_id: [] for other_id in affected}
+    rows = db.query(RelatedItem.item_id, RelatedItem.related_id, RelatedItem.score)\
+        .filter(RelatedItem.kind == kind, RelatedItem.item_id.in_(affected))
+    for other_id, related_id, score in rows:
+        if related_id != item_id:
+            lists[other_id].append((related_id, score))
+
+    for other_id, current in lists.items():
+        if other_id in by_id:
+            current.append((item_id, by_id[other_id]))
+        _store(db, kind, other_id, current)
+
+
+# ============================================================================
+# Incremental updates (call before commit, like facets.apply_change)
+# ============================================================================
+def update_item(db, kind, item):
+    """Re-index one blog post / publication and patch the affected neighbour lists"""
+    if not is_indexed(kind, item):
+        remove_item(db, kind, item.id)
+        return
+
+    if item.id is None:
+        db.flush()
+    counts = item_terms(kind, item)
+    db.query(RelatedTerm).filter(RelatedTerm.kind == kind, RelatedTerm.item_id == item.id)\
+        .delete(synchronize_session=False)
+    _insert_terms(db, kind, item.id, counts)
+
+    scores = _neighbours(db, kind, item.id, counts)
+    _store(db, kind, item.id, scores)
+    _patch_neighbour_lists(db, kind, item.id, scores)
+
+
+def remove_item(db, kind, item_id):
+    """Drop an item from the index and from every neighbour list"""
+    db.query(RelatedTerm).filter(RelatedTerm.kind == kind, RelatedTerm.item_id == item_id)\
+        .delete(synchronize_session=False)
+    db.query(RelatedItem).filter(RelatedItem.kind == kind, RelatedItem.item_id == item_id)\
+        .delete(synchronize_session=False)
+    _patch_neighbour_lists(db, kind, item_id, [])
+
+
+# ============================================================================
+# Reads
+# ============================================================================
+def related_rows(db, kind, item_id, limit):
+    """(model, score) rows for an item's stored neighbours, best first"""
+    model = BlogPost if kind == "blog" else Publication
+    return db.query(model, RelatedItem.score)\
+        .join(RelatedItem, RelatedItem.related_id == model.id)\
+        .filter(RelatedItem.kind == kind, RelatedItem.item_id == item_id)\
+        .order_by(RelatedItem.rank)\
+        .limit(limit)\
+        .all()
+
+
+# ============================================================================
+# Full rebuild
+# ============================================================================
+def _indexed_items(db, kind):
+    if kind == "blog":
+        return db.query(BlogPost).filter(BlogPost.published.is_(True)).all()
+    return db.query(Publication).all()
+
+
+def rebuild_related(db, kind):
+    """Recompute every vector and neighbour list of one kind from scratch"""
+    db.query(RelatedTerm).filter(RelatedTerm.kind == kind).delete(synchronize_session=False)
+    db.query(RelatedItem).filter(RelatedItem.kind == kind).delete(synchronize_session=False)
+
+    terms = {item.id: item_terms(kind, item) for item in _indexed_items(db, kind)}
+    for item_id, counts in terms.items():
+        _insert_terms(db, kind, item_id, counts)
+
+    frequencies = Counter(term for counts in terms.values() for term in counts)
+    idf = {term: math.log((1 + len(terms)) / (1 + df)) + 1 for term, df in frequencies.items()}
+    vectors = {item_id: _vector(counts, idf) for item_id, counts in terms.items()}
+
+    # Inverted index, so each item is only compared with items sharing a term
+    postings = {}
+    for item_id, vector in vectors.items():
+        for term, weight in vector.items():
+            postings.setdefault(term, []).append((item_id, weight))
+
+    for item_id, vector in vectors.items():
+        scores = Counter()
+        for term, weight in vector.items():
+            for other_id, other_weight in postings[term]:
+                if other_id != item_id:
+                    scores[other_id] += weight * other_weight
+        _insert_neighbours(db, kind, item_id, scores.items())
+
+    db.commit()
+    return len(terms)
+
+
+def ensure_related(db):
+    """Build the index once for databases that predate it"""
+    for kind in KINDS:
+        has_terms = db.query(RelatedTerm).filter(RelatedTerm.kind == kind).first() is not None
+        if not has_terms and _indexed_items(db, kind):
+            items = rebuild_related(db, kind)
+            print(f"✅ Built related-content index for {items} {kind} items")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv != ["rebuild"]:
+        print("Usage: python -m app.related rebuild")
+        return 1
+
+    from .database import SessionLocal, init_db
+
+    init_db()
+    db = SessionLocal()
+    try:
+        counts = {kind: rebuild_related(db, kind) for kind in KINDS}
+    finally:
+        db.close()
+    print(f"✅ Rebuilt related-content index: {counts}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
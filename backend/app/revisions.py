@@ -0,0 +1,194 @@
+"""
+Blog revision history with compact delta storage
+
+Every change to a BlogPost is recorded as a BlogRevision. Most revisions
+are deltas against the previous one: unchanged fields are left out, short
+fields store their new value and long text (the post content) stores a
+line-level edit script - copy lines i..j of the previous text, or insert
+these lines - so an edit costs roughly the size of the change. Every
+BLOG_REVISION_SNAPSHOT_EVERY revisions a full snapshot is stored instead,
+which bounds how many rows a reconstruction has to replay. Revision data
+is zlib-compressed JSON.
+"""
+
+import difflib
+import json
+import zlib
+
+from sqlalchemy import func
+
+from .config import settings
+from .models import BlogRevision
+
+TRACKED_FIELDS = ("title", "content", "excerpt", "author", "published", "tags")
+
+# Text shorter than this is stored whole - an edit script would not be smaller
+_DELTA_MIN_LENGTH = 200
+
+
+def revision_fields(blog):
+    """The tracked state of a blog post"""
+    return {name: getattr(blog, name) for name in TRACKED_FIELDS}
+
+
+# ============================================================================
+# Encoding
+# ============================================================================
+def _text_delta(old: str, new: str):
+    """Edit script turning old into new: [start, end] copies old lines, strings are inserted"""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(new_lines[j1:j2]))
+    return ops
+
+
+def _apply_text_delta(old: str, ops):
+    old_lines = old.splitlines(keepends=True)
+    parts = []
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(old_lines[op[0]:op[1]])
+    return "".join(parts)
+
+
+def encode_delta(before, after):
+    """{field: {"set": value} | {"ops": edit script}} for the fields that changed"""
+    delta = {}
+    for name in TRACKED_FIELDS:
+        old, new = before.get(name), after.get(name)
+        if old == new:
+            continue
+        if isinstance(old, str) and isinstance(new, str) and len(new) >= _DELTA_MIN_LENGTH:
+            delta[name] = {"ops": _text_delta(old, new)}
+        else:
+            delta[name] = {"set": new}
+    return delta
+
+
+def apply_delta(state, delta):
+    state = dict(state)
+    for name, change in delta.items():
+        if "ops" in change:
+            state[name] = _apply_text_delta(state.get(name) or "", change["ops"])
+        else:
+            state[name] = change["set"]
+    return state
+
+
+def _pack(payload):
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def _unpack(data):
+    return json.loads(zlib.decompress(data).decode("utf-8"))
+
+
+# ============================================================================
+# Recording / reconstruction
+# ============================================================================
+def latest_revision(db, blog_id):
+    return db.query(func.max(BlogRevision.revision)).filter(BlogRevision.blog_id == blog_id).scalar() or 0
+
+
+def record_revision(db, blog, before=None, username=None, restored_from=None):
+    """
+    Record the blog's current state as a new revision. `before` is the
+    state prior to the change (revision_fields()), None for a new post.
+    Call after modifying the post and before committing.
+    """
+    after = revision_fields(blog)
+    if before is not None and before == after:
+        return None
+    previous = latest_revision(db, blog.id) if before is not None else 0
+
+    if before is not None and previous == 0:
+        # Post predates revision history - start it with the old state
+        data = _pack(before)
+        db.add(BlogRevision(blog_id=blog.id, revision=1, kind="snapshot", data=data, size=len(data),
+                            changed_fields=""))
+        previous = 1
+
+    number = previous + 1
+    if (number - 1) % settings.BLOG_REVISION_SNAPSHOT_EVERY == 0:
+        kind, payload = "snapshot", after
+        changed = TRACKED_FIELDS if before is None else [n for n in TRACKED_FIELDS if before[n] != after[n]]
+    else:
+        kind, payload = "delta", encode_delta(before, after)
+        changed = list(payload)
+
+    data = _pack(payload)
+    revision = BlogRevision(
+        blog_id=blog.id,
+        revision=number,
+        kind=kind,
+        data=data,
+        size=len(data),
+        changed_fields=",".join(changed),
+        restored_from=restored_from,
+        created_by=username,
+    )
+    db.add(revision)
+    db.flush()
+    return revision
+
+
+def reconstruct(db, blog_id, revision):
+    """The tracked fields as of a revision, or None if it does not exist"""
+    snapshot = db.query(func.max(BlogRevision.revision))\
+        .filter(BlogRevision.blog_id == blog_id,
+                BlogRevision.kind == "snapshot",
+                BlogRevision.revision <= revision)\
+        .scalar()
+    if snapshot is None:
+        return None
+
+    rows = db.query(BlogRevision)\
+        .filter(BlogRevision.blog_id == blog_id,
+                BlogRevision.revision >= snapshot,
+                BlogRevision.revision <= revision)\
+        .order_by(BlogRevision.revision)\
+        .all()
+    if not rows or rows[-1].revision != revision:
+        return None
+
+    state = {}
+    for row in rows:
+        payload = _unpack(row.data)
+        state = payload if row.kind == "snapshot" else apply_delta(state, payload)
+    return state
+
+
+def _diff_lines(text):
+    """Lines for difflib; the last one always ends with a newline so it is not glued to the next"""
+    lines = (text or "").splitlines(keepends=True)
+    if lines and not lines[-1].endswith(("\n", "\r")):
+        lines[-1] += "\n"
+    return lines
+
+
+def diff_revisions(old, new, from_label="", to_label=""):
+    """Changed short fields side by side, plus a unified diff of the content"""
+    fields = {
+        name: {"from": old.get(name), "to": new.get(name)}
+        for name in TRACKED_FIELDS
+        if name != "content" and old.get(name) != new.get(name)
+    }
+    content_diff = "".join(difflib.unified_diff(
+        _diff_lines(old.get("content")),
+        _diff_lines(new.get("content")),
+        fromfile=from_label,
+        tofile=to_label,
+    ))
+    return {"fields": fields, "content_diff": content_diff}
+
+
+def delete_revisions(db, blog_id):
+    db.query(BlogRevision).filter(BlogRevision.blog_id == blog_id).delete(synchronize_session=False)
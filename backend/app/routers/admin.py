@@ -0,0 +1,129 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import List
+from ..logs import get_logger
+from ..database import get_read_db, get_write_db
+from ..models import BlockedSender
+from ..schemas import BlockedSenderCreate, BlockedSenderResponse, ProfilerArmRequest
+from ..auth import verify_token
+from .. import admin_stats, admission, metrics, profiler, spam, telemetry
+from ..database import read_engine, write_engine
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+logger = get_logger(__name__)
+
+@router.get("/metrics")
+def get_metrics(username: str = Depends(verify_token)):
+    """In-process counters of the worker answering this request - REQUIRES AUTH"""
+    return {**metrics.snapshot(), "admission": admission.stats()}
+
+@router.get("/telemetry")
+def get_telemetry(username: str = Depends(verify_token)):
+    """Thread and connection-pool saturation of this worker - REQUIRES AUTH"""
+    pools = {"write": telemetry.pool_stats(write_engine)}
+    if read_engine is not write_engine:
+        pools["read"] = telemetry.pool_stats(read_engine)
+    return {
+        "pid": metrics.snapshot()["pid"],
+        "threadpool": telemetry.threadpool_stats(),
+        "db_pools": pools,
+        "admission": admission.stats(),
+    }
+
+@router.get("/stats")
+def get_dashboard_stats(
+    months: int = Query(12, ge=1, le=120),
+    db: Session = Depends(get_read_db),
+    username: str = Depends(verify_token)
+):
+    """Content counts, last-updated times and posts per month from admin_stats - REQUIRES AUTH"""
+    return admin_stats.get_stats(db, months)
+
+@router.get("/blocklist", response_model=List[BlockedSenderResponse])
+def get_blocklist(db: Session = Depends(get_read_db), username: str = Depends(verify_token)):
+    """Blocked contact senders and domains - REQUIRES AUTH"""
+    return db.query(BlockedSender).order_by(BlockedSender.value).all()
+
+@router.post("/blocklist", response_model=BlockedSenderResponse)
+def add_blocked_sender(
+    entry: BlockedSenderCreate,
+    db: Session = Depends(get_write_db),
+    username: str = Depends(verify_token)
+):
+    """Block an email address or a whole domain from the contact form - REQUIRES AUTH"""
+    try:
+        blocked = BlockedSender(**entry.model_dump())
+        db.add(blocked)
+        db.commit()
+        db.refresh(blocked)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Already blocked")
+    except Exception:
+        db.rollback()
+        logger.exception("Error blocking sender")
+        raise HTTPException(status_code=500, detail="Failed to block sender")
+    
+    spam.blocklist_changed()
+    return blocked
+
+@router.delete("/blocklist/{entry_id}")
+def remove_blocked_sender(
+    entry_id: int,
+    db: Session = Depends(get_write_db),
+    username: str = Depends(verify_token)
+):
+    """Unblock a sender or domain - REQUIRES AUTH"""
+    blocked = db.get(BlockedSender, entry_id)
+    if not blocked:
+        raise HTTPException(status_code=404, detail="Blocklist entry not found")
+    
+    try:
+        db.delete(blocked)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Error unblocking sender")
+        raise HTTPException(status_code=500, detail="Failed to unblock sender")
+    
+    # Bloom filters cannot forget - every worker rebuilds its filter
+    spam.blocklist_changed()
+    return {"status": "success", "message": f"'{blocked.value}' unblocked"}
+
+
+# ============================================================================
+# PROFILER
+# ============================================================================
+@router.get("/profiler")
+def get_profiler_status(username: str = Depends(verify_token)):
+    """Armed routes (in this worker) and stored profiles - REQUIRES AUTH"""
+    return {"armed": profiler.armed(), "profiles": profiler.store.list()}
+
+@router.post("/profiler/arm")
+def arm_profiler(request: ProfilerArmRequest, username: str = Depends(verify_token)):
+    """Profile the next `count` requests to a route in every worker - REQUIRES AUTH"""
+    profiler.arm(request.method, request.route, request.count)
+    return {"status": "success", "armed": profiler.armed()}
+
+@router.delete("/profiler/arm")
+def disarm_profiler(username: str = Depends(verify_token)):
+    """Cancel every armed route - REQUIRES AUTH"""
+    profiler.disarm()
+    return {"status": "success"}
+
+@router.get("/profiles/{name}")
+def download_profile(name: str, username: str = Depends(verify_token)):
+    """A stored profile in collapsed-stack format (flamegraph.pl, speedscope) - REQUIRES AUTH"""
+    path = profiler.store.path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=f"{name}.folded")
+
+@router.delete("/profiles/{name}")
+def delete_profile(name: str, username: str = Depends(verify_token)):
+    """Delete a stored profile - REQUIRES AUTH"""
+    if not profiler.store.delete(name):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return {"status": "success"}
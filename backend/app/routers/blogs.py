@@ -1,93 +1,153 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session, defer
 from typing import List
-from ..database import get_db
-from ..models import BlogPost
-from ..schemas import BlogPostCreate, BlogPostResponse
+from ..logs import get_logger
+from ..config import settings
+from ..database import get_read_db, get_write_db
+from ..models import BlogPost, BlogRevision
+from ..schemas import BlogPostCreate, BlogPostResponse, BlogPostUpdate, BlogRevisionDiff, BlogRevisionResponse, PopularBlogPost, RelatedBlogPost
 from ..auth import verify_token  # ✅ ADD THIS
+from ..cache import LocalCache
+from ..concurrency import StaleDataError, apply_patch, stale_error
+from ..revisions import delete_revisions, diff_revisions, reconstruct, record_revision, revision_fields
+from .. import admin_stats, related, suggest
+from ..views import counter as view_counter, popular_cache, popular_posts
 
 router = APIRouter(prefix="/api/blogs", tags=["blogs"])
+logger = get_logger(__name__)
+
+# Serialized pages of the public blog list, keyed by (skip, limit).
+# Cleared (in every worker) whenever a post is created, updated or deleted.
+blog_list_cache = LocalCache("blog_list", maxsize=64, ttl=300)
 
 @router.get("/", response_model=List[BlogPostResponse])
-def get_all_blogs(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+def get_all_blogs(skip: int = 0, limit: int = 10, db: Session = Depends(get_read_db)):
     """Get all published blog posts"""
-    try:
+    limit = min(limit, 100)
+    
+    def load():
         blogs = db.query(BlogPost)\
             .filter(BlogPost.published == True)\
             .order_by(BlogPost.created_at.desc())\
             .offset(skip)\
-            .limit(min(limit, 100))\
+            .limit(limit)\
             .all()
-        return blogs
-    except Exception as e:
-        print(f"Error fetching blogs: {e}")
+        return [BlogPostResponse.model_validate(blog).model_dump() for blog in blogs]
+    
+    try:
+        return blog_list_cache.get_or_load((skip, limit), load)
+    except Exception:
+        logger.exception("Error fetching blogs")
         raise HTTPException(status_code=500, detail="Failed to retrieve blogs")
 
+# Declared before /{blog_id} so "popular" is not parsed as an id
+@router.get("/popular", response_model=List[PopularBlogPost])
+def get_popular_blogs(
+    window: str = Query("week", pattern="^(day|week)$"),
+    limit: int = Query(5, ge=1, le=20),
+    db: Session = Depends(get_read_db)
+):
+    """Most viewed published posts today / over the last 7 days - PUBLIC"""
+    return popular_cache.get_or_load((window, limit), lambda: popular_posts(db, window, limit))
+
 @router.get("/{blog_id}", response_model=BlogPostResponse)
-def get_blog(blog_id: int, db: Session = Depends(get_db)):
-    """Get a specific blog post by ID"""
-    blog = db.query(BlogPost).filter(BlogPost.id == blog_id).first()
+def get_blog(blog_id: int, db: Session = Depends(get_read_db)):
+    """Get a specific blog post by ID (views are counted in memory, see app/views.py)"""
+    blog = db.get(BlogPost, blog_id)
     if not blog:
         raise HTTPException(status_code=404, detail="Blog post not found")
+    if blog.published:
+        view_counter.increment(blog_id)
     return blog
 
+@router.get("/{blog_id}/related", response_model=List[RelatedBlogPost])
+def get_related_blogs(blog_id: int, limit: int = 5, db: Session = Depends(get_read_db)):
+    """Most similar published posts, precomputed by app/related.py - PUBLIC"""
+    rows = related.related_rows(db, "blog", blog_id, min(limit, settings.RELATED_TOP_K))
+    return [
+        {
+            "id": blog.id,
+            "title": blog.title,
+            "excerpt": blog.excerpt,
+            "tags": blog.tags,
+            "created_at": blog.created_at,
+            "score": score,
+        }
+        for blog, score in rows
+        if blog.published
+    ]
+
 @router.post("/", response_model=BlogPostResponse)
 def create_blog(
     blog: BlogPostCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     username: str = Depends(verify_token)  # ✅ ADD AUTH
 ):
     """Create a new blog post"""
     try:
         db_blog = BlogPost(**blog.model_dump())
         db.add(db_blog)
+        db.flush()
+        record_revision(db, db_blog, username=username)
+        related.update_item(db, "blog", db_blog)
+        admin_stats.apply_change(db, "blog", [], admin_stats.stat_keys("blog", db_blog))
         db.commit()
+        blog_list_cache.invalidate()
+        suggest.item_changed("blog", db_blog)
         db.refresh(db_blog)
         return db_blog
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"Error creating blog: {e}")
+        logger.exception("Error creating blog")
         raise HTTPException(status_code=500, detail="Failed to create blog post")
 
 @router.delete("/{blog_id}")
 def delete_blog(
     blog_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     username: str = Depends(verify_token)  # ✅ ADD AUTH
 ):
     """Delete a blog post by ID"""
-    blog = db.query(BlogPost).filter(BlogPost.id == blog_id).first()
+    blog = db.get(BlogPost, blog_id)
     
     if not blog:
         raise HTTPException(status_code=404, detail="Blog post not found")
     
     try:
         title = blog.title
+        delete_revisions(db, blog_id)
+        related.remove_item(db, "blog", blog_id)
+        admin_stats.apply_change(db, "blog", admin_stats.stat_keys("blog", blog), [])
         db.delete(blog)
         db.commit()
+        blog_list_cache.invalidate()
+        suggest.item_deleted("blog", blog_id)
         return {
             "status": "success",
             "message": f"Blog post '{title}' deleted successfully"
         }
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"Error deleting blog: {e}")
+        logger.exception("Error deleting blog")
         raise HTTPException(status_code=500, detail="Failed to delete blog post")
     
 @router.put("/{blog_id}", response_model=BlogPostResponse)
 def update_blog(
     blog_id: int,
     blog_update: BlogPostCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     username: str = Depends(verify_token)
 ):
     """Update an existing blog post - REQUIRES AUTH"""
-    blog = db.query(BlogPost).filter(BlogPost.id == blog_id).first()
+    blog = db.get(BlogPost, blog_id)
     
     if not blog:
         raise HTTPException(status_code=404, detail="Blog post not found")
     
     try:
+        before = revision_fields(blog)
+        stats_before = admin_stats.stat_keys("blog", blog)
+        
         # Update fields
         for key, value in blog_update.model_dump().items():
             setattr(blog, key, value)
@@ -96,10 +156,134 @@ def update_blog(
         from datetime import datetime
         blog.updated_at = datetime.utcnow()
         
+        record_revision(db, blog, before, username=username)
+        related.update_item(db, "blog", blog)
+        admin_stats.apply_change(db, "blog", stats_before, admin_stats.stat_keys("blog", blog))
         db.commit()
+        blog_list_cache.invalidate()
+        suggest.item_changed("blog", blog)
         db.refresh(blog)
         return blog
-    except Exception as e:
+    except Exception:
+        db.rollback()
+        logger.exception("Error updating blog")
+        raise HTTPException(status_code=500, detail="Failed to update blog post")
+
+@router.patch("/{blog_id}", response_model=BlogPostResponse)
+def patch_blog(
+    blog_id: int,
+    blog_patch: BlogPostUpdate,
+    db: Session = Depends(get_write_db),
+    username: str = Depends(verify_token)
+):
+    """Update only the given fields of a blog post; 409 if `version` is stale - REQUIRES AUTH"""
+    blog = db.get(BlogPost, blog_id)
+    
+    if not blog:
+        raise HTTPException(status_code=404, detail="Blog post not found")
+    
+    before = revision_fields(blog)
+    stats_before = admin_stats.stat_keys("blog", blog)
+    changed = apply_patch(blog, blog_patch)
+    if not changed:
+        return blog
+    
+    try:
+        record_revision(db, blog, before, username=username)
+        if related.INDEXED_FIELDS["blog"] & set(changed):
+            related.update_item(db, "blog", blog)
+        admin_stats.apply_change(db, "blog", stats_before, admin_stats.stat_keys("blog", blog))
+        db.commit()
+        blog_list_cache.invalidate()
+        suggest.item_changed("blog", blog)
+        return blog
+    except StaleDataError:
+        db.rollback()
+        raise stale_error()
+    except Exception:
+        db.rollback()
+        logger.exception("Error updating blog")
+        raise HTTPException(status_code=500, detail="Failed to update blog post")
+
+
+# ============================================================================
+# REVISION HISTORY
+# ============================================================================
+def _get_revision_state(db, blog_id, revision):
+    state = reconstruct(db, blog_id, revision)
+    if state is None:
+        raise HTTPException(status_code=404, detail=f"Revision {revision} not found")
+    return state
+
+@router.get("/{blog_id}/revisions", response_model=List[BlogRevisionResponse])
+def list_revisions(
+    blog_id: int,
+    db: Session = Depends(get_read_db),
+    username: str = Depends(verify_token)
+):
+    """Revision history of a blog post, newest first - REQUIRES AUTH"""
+    return db.query(BlogRevision)\
+        .options(defer(BlogRevision.data))\
+        .filter(BlogRevision.blog_id == blog_id)\
+        .order_by(BlogRevision.revision.desc())\
+        .all()
+
+@router.get("/{blog_id}/revisions/diff", response_model=BlogRevisionDiff)
+def diff_blog_revisions(
+    blog_id: int,
+    from_revision: int,
+    to_revision: int,
+    db: Session = Depends(get_read_db),
+    username: str = Depends(verify_token)
+):
+    """Compare two revisions of a blog post - REQUIRES AUTH"""
+    old = _get_revision_state(db, blog_id, from_revision)
+    new = _get_revision_state(db, blog_id, to_revision)
+    return {
+        "from_revision": from_revision,
+        "to_revision": to_revision,
+        **diff_revisions(old, new, f"revision {from_revision}", f"revision {to_revision}"),
+    }
+
+@router.get("/{blog_id}/revisions/{revision}")
+def get_revision(
+    blog_id: int,
+    revision: int,
+    db: Session = Depends(get_read_db),
+    username: str = Depends(verify_token)
+):
+    """A blog post's fields as of a revision - REQUIRES AUTH"""
+    return {"revision": revision, **_get_revision_state(db, blog_id, revision)}
+
+@router.post("/{blog_id}/revisions/{revision}/restore", response_model=BlogPostResponse)
+def restore_revision(
+    blog_id: int,
+    revision: int,
+    db: Session = Depends(get_write_db),
+    username: str = Depends(verify_token)
+):
+    """Restore a blog post to an earlier revision (recorded as a new revision) - REQUIRES AUTH"""
+    blog = db.get(BlogPost, blog_id)
+    if not blog:
+        raise HTTPException(status_code=404, detail="Blog post not found")
+    
+    state = _get_revision_state(db, blog_id, revision)
+    try:
+        before = revision_fields(blog)
+        stats_before = admin_stats.stat_keys("blog", blog)
+        for key, value in state.items():
+            setattr(blog, key, value)
+        record_revision(db, blog, before, username=username, restored_from=revision)
+        related.update_item(db, "blog", blog)
+        admin_stats.apply_change(db, "blog", stats_before, admin_stats.stat_keys("blog", blog))
+        db.commit()
+        blog_list_cache.invalidate()
+        suggest.item_changed("blog", blog)
+        return blog
+    except StaleDataError:
+        db.rollback()
+        raise stale_error()
+    except Exception:
         db.rollback()
-        print(f"Error updating blog: {e}")
-        raise HTTPException(status_code=500, detail="Failed to update blog post")
\ No newline at end of file
+        logger.exception("Error restoring blog revision")
+        raise HTTPException(status_code=500, detail="Failed to restore blog post")
@@ -1,23 +1,47 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import delete, func, update
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime, timedelta
 from collections import defaultdict
-from ..database import get_db
+from ..logs import get_logger
+from ..database import get_read_db, get_write_db
 from ..models import ContactMessage
-from ..schemas import ContactMessageCreate, ContactMessageResponse
-from ..email_utils import send_contact_email
+from ..schemas import ContactBulkRequest, ContactBulkResponse, ContactMessageCreate, ContactMessageResponse
+from ..auth import verify_token
+from ..notifications import notifier
+from ..invalidation import bus
+from .. import admin_stats, spam
 
 router = APIRouter(prefix="/api/contact", tags=["contact"])
+logger = get_logger(__name__)
 
 # Simple in-memory rate limiter
+# Submissions are broadcast on the invalidation bus so every worker
+# process shares the same view of who has posted recently.
 last_submission = defaultdict(lambda: datetime.min)
 
 
+def _record_submission(payload):
+    submitted_at = datetime.fromisoformat(payload["at"])
+    if submitted_at > last_submission[payload["email"]]:
+        last_submission[payload["email"]] = submitted_at
+
+
+bus.subscribe("contact.submitted", _record_submission)
+
+
 @router.post("/", response_model=ContactMessageResponse)
-def create_contact_message(message: ContactMessageCreate, db: Session = Depends(get_db)):
+def create_contact_message(message: ContactMessageCreate, db: Session = Depends(get_write_db)):
     """Submit a contact form message with rate limiting and email notification"""
     
+    # Spam pre-filter: in-memory checks only, before any DB write or email
+    if spam.check_submission(message):
+        raise HTTPException(
+            status_code=400,
+            detail="Your message could not be accepted."
+        )
+    
     # Rate limit: 1 email per 5 minutes per email address
     email_key = message.email.lower()
     time_since_last = datetime.now() - last_submission[email_key]
@@ -28,42 +52,42 @@ def create_contact_message(message: ContactMessageCreate, db: Session = Depends(
             detail="Please wait 5 minutes before sending another message."
         )
     
-    # Update last submission time
-    last_submission[email_key] = datetime.now()
+    # Update last submission time (in all workers)
+    bus.publish("contact.submitted", {"email": email_key, "at": datetime.now().isoformat()})
+    spam.remember(message)
     
     # Save to database
     try:
-        db_message = ContactMessage(**message.model_dump())
+        db_message = ContactMessage(**message.model_dump(exclude={"website"}))
         db.add(db_message)
+        admin_stats.apply_change(db, "message", [], admin_stats.stat_keys("message", db_message))
         db.commit()
         db.refresh(db_message)
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"Database error: {e}")
+        logger.exception("Database error")
         raise HTTPException(
             status_code=500,
             detail="Failed to save message. Please try again."
         )
     
-    # Send email notification (don't fail if email fails)
+    # Send email notification, or queue it for the next digest (don't fail if email fails)
     try:
-        send_contact_email(
+        notifier.notify(
             name=message.name,
             email=message.email,
             subject=message.subject or "New Contact Form Submission",
             message=message.message
         )
-        print(f"✅ Email notification sent for message from {message.name}")
     except Exception as e:
         # Log error but don't fail the request - message is still saved
-        print(f"⚠️ Email notification failed: {e}")
-        # You could add this to a background retry queue here
+        logger.warning("Email notification failed: %s", e)
     
     return db_message
 
 
 @router.get("/", response_model=List[ContactMessageResponse])
-def get_all_messages(skip: int = 0, limit: int = 50, db: Session = Depends(get_db)):
+def get_all_messages(skip: int = 0, limit: int = 50, db: Session = Depends(get_read_db)):
     """Get all contact messages (for admin use)"""
     try:
         messages = db.query(ContactMessage)\
@@ -72,37 +96,99 @@ def get_all_messages(skip: int = 0, limit: int = 50, db: Session = Depends(get_d
             .limit(limit)\
             .all()
         return messages
-    except Exception as e:
-        print(f"Error fetching messages: {e}")
+    except Exception:
+        logger.exception("Error fetching messages")
         raise HTTPException(
             status_code=500,
             detail="Failed to retrieve messages"
         )
 
 
+def _bulk_criteria(selection: ContactBulkRequest):
+    """WHERE clauses for a bulk selection"""
+    criteria = []
+    if selection.ids:
+        criteria.append(ContactMessage.id.in_(selection.ids))
+    if selection.before is not None:
+        criteria.append(ContactMessage.created_at < selection.before)
+    if selection.sender:
+        criteria.append(func.lower(ContactMessage.email) == selection.sender.strip().lower())
+    return criteria
+
+
+@router.post("/bulk/mark-read", response_model=ContactBulkResponse)
+def bulk_mark_read(
+    selection: ContactBulkRequest,
+    db: Session = Depends(get_write_db),
+    username: str = Depends(verify_token)
+):
+    """Mark every matching message as read with a single UPDATE"""
+    statement = update(ContactMessage)\
+        .where(*_bulk_criteria(selection), ContactMessage.read.is_not(True))\
+        .values(read=True)\
+        .execution_options(synchronize_session=False)
+    try:
+        result = db.execute(statement)
+        admin_stats.recount(db, "message")
+        db.commit()
+        return {"status": "success", "affected": result.rowcount}
+    except Exception:
+        db.rollback()
+        logger.exception("Error bulk-updating messages")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to update messages"
+        )
+
+
+@router.post("/bulk/delete", response_model=ContactBulkResponse)
+def bulk_delete(
+    selection: ContactBulkRequest,
+    db: Session = Depends(get_write_db),
+    username: str = Depends(verify_token)
+):
+    """Delete every matching message with a single DELETE"""
+    statement = delete(ContactMessage)\
+        .where(*_bulk_criteria(selection))\
+        .execution_options(synchronize_session=False)
+    try:
+        result = db.execute(statement)
+        admin_stats.recount(db, "message")
+        db.commit()
+        return {"status": "success", "affected": result.rowcount}
+    except Exception:
+        db.rollback()
+        logger.exception("Error bulk-deleting messages")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to delete messages"
+        )
+
+
 @router.get("/{message_id}", response_model=ContactMessageResponse)
-def get_message(message_id: int, db: Session = Depends(get_db)):
+def get_message(message_id: int, db: Session = Depends(get_read_db)):
     """Get a specific contact message by ID"""
-    message = db.query(ContactMessage).filter(ContactMessage.id == message_id).first()
+    message = db.get(ContactMessage, message_id)
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
     return message
 
 
 @router.delete("/{message_id}")
-def delete_message(message_id: int, db: Session = Depends(get_db)):
+def delete_message(message_id: int, db: Session = Depends(get_write_db)):
     """Delete a contact message (admin only)"""
-    message = db.query(ContactMessage).filter(ContactMessage.id == message_id).first()
+    message = db.get(ContactMessage, message_id)
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
     
     try:
+        admin_stats.apply_change(db, "message", admin_stats.stat_keys("message", message), [])
         db.delete(message)
         db.commit()
         return {"status": "success", "message": "Contact message deleted"}
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"Error deleting message: {e}")
+        logger.exception("Error deleting message")
         raise HTTPException(
             status_code=500,
             detail="Failed to delete message"
@@ -110,20 +196,22 @@ def delete_message(message_id: int, db: Session = Depends(get_db)):
 
 
 @router.patch("/{message_id}/mark-read")
-def mark_message_read(message_id: int, db: Session = Depends(get_db)):
+def mark_message_read(message_id: int, db: Session = Depends(get_write_db)):
     """Mark a contact message as read"""
-    message = db.query(ContactMessage).filter(ContactMessage.id == message_id).first()
+    message = db.get(ContactMessage, message_id)
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
     
     try:
+        before = admin_stats.stat_keys("message", message)
         message.read = True
+        admin_stats.apply_change(db, "message", before, admin_stats.stat_keys("message", message))
         db.commit()
         db.refresh(message)
         return message
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"Error updating message: {e}")
+        logger.exception("Error updating message")
         raise HTTPException(
             status_code=500,
             detail="Failed to update message"
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, HTTPException, Header
+from typing import Optional
+from ..media import serve_file
+
+router = APIRouter(prefix="/media", tags=["media"])
+
+
+@router.get("/{file_path:path}")
+def get_media(file_path: str, if_none_match: Optional[str] = Header(None)):
+    """Serve an uploaded file - URLs are content-hashed, so cache forever"""
+    try:
+        response = serve_file(file_path, if_none_match=if_none_match)
+    except ValueError:
+        response = None
+    
+    if response is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    return response
@@ -1,92 +1,350 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Header, Query, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
-from ..database import get_db
-from ..models import Publication
-from ..schemas import PublicationCreate, PublicationResponse
+from typing import List, Optional
+from ..config import settings
+from ..logs import get_logger
+from ..database import ReadSessionLocal, get_read_db, get_write_db
+from ..models import Author, Publication, PublicationAuthor
+from ..schemas import PublicationCreate, PublicationResponse, PublicationUpdate, RelatedPublication
 from ..auth import verify_token
+from ..concurrency import StaleDataError, apply_patch, stale_error
+from ..media import public_url, serve_file, store_stream
+from ..citations import FORMATS, MEDIA_TYPES, invalidate_citations, render_citation
+from ..bibimport import detect_format, import_file, open_text
+from ..facets import apply_change, facet_values, get_facets, normalize_author, sync_authors
+from .. import admin_stats, related, suggest
 
 router = APIRouter(prefix="/api/papers", tags=["papers"])
+logger = get_logger(__name__)
+
+def _is_doi_conflict(error: IntegrityError):
+    """True if the unique DOI index (not e.g. an author or facet row) was violated"""
+    constraint = getattr(getattr(error.orig, "diag", None), "constraint_name", None)  # psycopg2
+    if constraint:
+        return constraint == "ix_publications_doi"
+    return "publications.doi" in str(error.orig)  # SQLite: "UNIQUE constraint failed: publications.doi"
 
 @router.get("/", response_model=List[PublicationResponse])
-def get_all_publications(db: Session = Depends(get_db)):
-    """Get all publications - PUBLIC"""
+def get_all_publications(
+    response: Response,
+    year: Optional[int] = None,
+    journal: Optional[str] = None,
+    author: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_read_db)
+):
+    """Get publications, optionally filtered by year / journal / author - PUBLIC
+    
+    The total number of matches is returned in the X-Total-Count header.
+    """
     try:
-        publications = db.query(Publication).order_by(Publication.year.desc(), Publication.order).limit(100).all()
+        query = db.query(Publication)
+        if year is not None:
+            query = query.filter(Publication.year == year)
+        if journal:
+            query = query.filter(Publication.journal == journal)
+        if author:
+            matching = select(PublicationAuthor.publication_id)\
+                .join(Author, Author.id == PublicationAuthor.author_id)\
+                .where(Author.normalized_name.like(f"%{normalize_author(author)}%"))
+            query = query.filter(Publication.id.in_(matching))
+        
+        response.headers["X-Total-Count"] = str(query.count())
+        publications = query.order_by(Publication.year.desc(), Publication.order)\
+            .offset(skip)\
+            .limit(min(limit, 500))\
+            .all()
         return publications
     except Exception as e:
-        print(f"Error fetching publications: {e}")
+        logger.exception("Error fetching publications")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _stream_bibliography(fmt: str):
+    """Yield one rendered citation at a time, reading rows in small batches"""
+    db = ReadSessionLocal()
+    try:
+        publications = db.query(Publication)\
+            .order_by(Publication.year.desc(), Publication.order)\
+            .yield_per(100)
+        for publication in publications:
+            yield render_citation(publication, fmt) + "\n"
+    finally:
+        db.close()
+
+@router.get("/facets")
+def get_publication_facets(db: Session = Depends(get_read_db)):
+    """Publication counts per year, journal and author - PUBLIC"""
+    return get_facets(db)
+
+@router.get("/export.bib")
+def export_bibtex():
+    """Export every publication as BibTeX (streamed) - PUBLIC"""
+    return StreamingResponse(
+        _stream_bibliography("bibtex"),
+        media_type=MEDIA_TYPES["bibtex"],
+        headers={"Content-Disposition": 'attachment; filename="publications.bib"'},
+    )
+
+@router.get("/export.ris")
+def export_ris():
+    """Export every publication as RIS (streamed) - PUBLIC"""
+    return StreamingResponse(
+        _stream_bibliography("ris"),
+        media_type=MEDIA_TYPES["ris"],
+        headers={"Content-Disposition": 'attachment; filename="publications.ris"'},
+    )
+
 @router.get("/{paper_id}", response_model=PublicationResponse)
-def get_publication(paper_id: int, db: Session = Depends(get_db)):
+def get_publication(paper_id: int, db: Session = Depends(get_read_db)):
     """Get a specific publication by ID - PUBLIC"""
-    publication = db.query(Publication).filter(Publication.id == paper_id).first()
+    publication = db.get(Publication, paper_id)
     if not publication:
         raise HTTPException(status_code=404, detail="Publication not found")
     return publication
 
+@router.get("/{paper_id}/related", response_model=List[RelatedPublication])
+def get_related_publications(paper_id: int, limit: int = 5, db: Session = Depends(get_read_db)):
+    """Most similar publications, precomputed by app/related.py - PUBLIC"""
+    rows = related.related_rows(db, "paper", paper_id, min(limit, settings.RELATED_TOP_K))
+    return [
+        {
+            "id": publication.id,
+            "title": publication.title,
+            "authors": publication.authors,
+            "journal": publication.journal,
+            "year": publication.year,
+            "score": score,
+        }
+        for publication, score in rows
+    ]
+
+@router.get("/{paper_id}/cite")
+def cite_publication(
+    paper_id: int,
+    format: str = Query("bibtex", pattern="^(" + "|".join(FORMATS) + ")$"),
+    db: Session = Depends(get_read_db)
+):
+    """Get a publication's citation as BibTeX, RIS, APA or MLA - PUBLIC"""
+    publication = db.get(Publication, paper_id)
+    if not publication:
+        raise HTTPException(status_code=404, detail="Publication not found")
+    return PlainTextResponse(render_citation(publication, format), media_type=MEDIA_TYPES[format])
+
+@router.get("/{paper_id}/pdf")
+def download_publication_pdf(
+    paper_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db)
+):
+    """Download the self-hosted PDF - supports Range requests - PUBLIC"""
+    publication = db.get(Publication, paper_id)
+    if not publication or not publication.pdf_sha256:
+        raise HTTPException(status_code=404, detail="PDF not found")
+    
+    response = serve_file(
+        f"papers/{publication.pdf_sha256}.pdf",
+        media_type="application/pdf",
+        filename=f"publication-{paper_id}.pdf",
+        # The URL is stable but the PDF can be replaced - revalidate via ETag
+        cache_control="public, max-age=0, must-revalidate",
+        if_none_match=if_none_match,
+    )
+    if response is None:
+        raise HTTPException(status_code=404, detail="PDF not found")
+    return response
+
 @router.post("/", response_model=PublicationResponse)
 def create_publication(
     publication: PublicationCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     username: str = Depends(verify_token)
 ):
     """Create a new publication - REQUIRES AUTH"""
     try:
         db_publication = Publication(**publication.model_dump())
         db.add(db_publication)
+        sync_authors(db, db_publication)
+        apply_change(db, None, facet_values(db_publication))
+        related.update_item(db, "paper", db_publication)
+        admin_stats.apply_change(db, "paper", [], admin_stats.stat_keys("paper", db_publication))
         db.commit()
         db.refresh(db_publication)
+        suggest.item_changed("paper", db_publication)
         return db_publication
-    except Exception as e:
+    except IntegrityError as e:
         db.rollback()
-        print(f"Error creating publication: {e}")
+        if _is_doi_conflict(e):
+            raise HTTPException(status_code=409, detail="A publication with this DOI already exists")
+        logger.exception("Error creating publication")
         raise HTTPException(status_code=500, detail="Failed to create publication")
+    except Exception:
+        db.rollback()
+        logger.exception("Error creating publication")
+        raise HTTPException(status_code=500, detail="Failed to create publication")
+
+@router.post("/import")
+def import_publications(
+    file: UploadFile = File(...),
+    overwrite: bool = False,
+    db: Session = Depends(get_write_db),
+    username: str = Depends(verify_token)
+):
+    """Bulk import a .bib or .ris file, deduplicating by DOI and title - REQUIRES AUTH"""
+    try:
+        report = import_file(db, open_text(file.file), detect_format(file.filename), overwrite=overwrite)
+    except Exception:
+        db.rollback()
+        logger.exception("Error importing publications")
+        raise HTTPException(status_code=500, detail="Failed to import publications")
+    if report["created"] or report["updated"]:
+        suggest.rebuild()
+    return {"status": "success", **report}
 
 @router.put("/{paper_id}", response_model=PublicationResponse)
 def update_publication(
     paper_id: int,
     publication_update: PublicationCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     username: str = Depends(verify_token)
 ):
     """Update a publication - REQUIRES AUTH"""
-    publication = db.query(Publication).filter(Publication.id == paper_id).first()
+    publication = db.get(Publication, paper_id)
     
     if not publication:
         raise HTTPException(status_code=404, detail="Publication not found")
     
     try:
+        before = facet_values(publication)
         for key, value in publication_update.model_dump().items():
             setattr(publication, key, value)
         
+        sync_authors(db, publication)
+        apply_change(db, before, facet_values(publication))
+        related.update_item(db, "paper", publication)
+        admin_stats.touch(db, "paper")
         db.commit()
+        invalidate_citations(paper_id)
+        suggest.item_changed("paper", publication)
         db.refresh(publication)
         return publication
-    except Exception as e:
+    except IntegrityError as e:
+        db.rollback()
+        if _is_doi_conflict(e):
+            raise HTTPException(status_code=409, detail="A publication with this DOI already exists")
+        logger.exception("Error updating publication")
+        raise HTTPException(status_code=500, detail="Failed to update publication")
+    except Exception:
+        db.rollback()
+        logger.exception("Error updating publication")
+        raise HTTPException(status_code=500, detail="Failed to update publication")
+
+@router.patch("/{paper_id}", response_model=PublicationResponse)
+def patch_publication(
+    paper_id: int,
+    publication_patch: PublicationUpdate,
+    db: Session = Depends(get_write_db),
+    username: str = Depends(verify_token)
+):
+    """Update only the given fields of a publication; 409 if `version` is stale - REQUIRES AUTH"""
+    publication = db.get(Publication, paper_id)
+    
+    if not publication:
+        raise HTTPException(status_code=404, detail="Publication not found")
+    
+    before = facet_values(publication)
+    changed = apply_patch(publication, publication_patch)
+    if not changed:
+        return publication
+    
+    try:
+        if "authors" in changed:
+            sync_authors(db, publication)
+        if {"authors", "journal", "year"} & set(changed):
+            apply_change(db, before, facet_values(publication))
+        if related.INDEXED_FIELDS["paper"] & set(changed):
+            related.update_item(db, "paper", publication)
+        admin_stats.touch(db, "paper")
+        db.commit()
+        invalidate_citations(paper_id)
+        suggest.item_changed("paper", publication)
+        return publication
+    except StaleDataError:
+        db.rollback()
+        raise stale_error()
+    except IntegrityError as e:
+        db.rollback()
+        if _is_doi_conflict(e):
+            raise HTTPException(status_code=409, detail="A publication with this DOI already exists")
+        logger.exception("Error updating publication")
+        raise HTTPException(status_code=500, detail="Failed to update publication")
+    except Exception:
         db.rollback()
-        print(f"Error updating publication: {e}")
+        logger.exception("Error updating publication")
         raise HTTPException(status_code=500, detail="Failed to update publication")
 
+@router.post("/{paper_id}/pdf", response_model=PublicationResponse)
+def upload_publication_pdf(
+    paper_id: int,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_write_db),
+    username: str = Depends(verify_token)
+):
+    """Upload the PDF for a publication; identical files are stored once - REQUIRES AUTH"""
+    publication = db.get(Publication, paper_id)
+    if not publication:
+        raise HTTPException(status_code=404, detail="Publication not found")
+    
+    if file.file.read(5) != b"%PDF-":
+        raise HTTPException(status_code=415, detail="File must be a PDF")
+    file.file.seek(0)
+    
+    try:
+        sha256, _, size, existed = store_stream(file.file, "papers", "pdf", settings.PDF_MAX_UPLOAD_BYTES)
+    except ValueError:
+        raise HTTPException(status_code=413, detail="PDF is too large")
+    
+    try:
+        publication.pdf_sha256 = sha256
+        publication.pdf_size = size
+        publication.pdf_url = public_url(f"/api/papers/{paper_id}/pdf")
+        db.commit()
+        invalidate_citations(paper_id)
+        db.refresh(publication)
+        if existed:
+            logger.info("PDF for publication %s deduplicated (%s)", paper_id, sha256[:12])
+        return publication
+    except Exception:
+        db.rollback()
+        logger.exception("Error saving publication PDF")
+        raise HTTPException(status_code=500, detail="Failed to save PDF")
+
 @router.delete("/{paper_id}")
 def delete_publication(
     paper_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     username: str = Depends(verify_token)
 ):
     """Delete a publication - REQUIRES AUTH"""
-    publication = db.query(Publication).filter(Publication.id == paper_id).first()
+    publication = db.get(Publication, paper_id)
     
     if not publication:
         raise HTTPException(status_code=404, detail="Publication not found")
     
     try:
         title = publication.title
+        apply_change(db, facet_values(publication), None)
+        related.remove_item(db, "paper", paper_id)
+        admin_stats.apply_change(db, "paper", admin_stats.stat_keys("paper", publication), [])
         db.delete(publication)
         db.commit()
+        invalidate_citations(paper_id)
+        suggest.item_deleted("paper", paper_id)
         return {"status": "success", "message": f"Publication '{title}' deleted successfully"}
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"Error deleting publication: {e}")
+        logger.exception("Error deleting publication")
         raise HTTPException(status_code=500, detail="Failed to delete publication")
\ No newline at end of file
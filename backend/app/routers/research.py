@@ -1,27 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Response
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from typing import List
-from ..database import get_db
-from ..models import ResearchProject
-from ..schemas import ResearchProjectCreate, ResearchProjectResponse
+from typing import List, Optional
+from ..config import settings
+from ..logs import get_logger
+from ..database import get_read_db, get_write_db
+from ..models import ResearchProject, ResearchProjectTechnology, Technology
+from ..schemas import ResearchProjectCreate, ResearchProjectResponse, ResearchProjectUpdate
 from ..auth import verify_token
+from ..concurrency import StaleDataError, apply_patch, stale_error
+from ..media import media_url, store_bytes
+from .. import admin_stats, images, suggest
+from ..technologies import normalize_technology, sync_technologies, technology_counts
 
 router = APIRouter(prefix="/api/research", tags=["research"])
+logger = get_logger(__name__)
 
 @router.get("/", response_model=List[ResearchProjectResponse])
-def get_all_projects(db: Session = Depends(get_db)):
-    """Get all research projects - PUBLIC"""
+def get_all_projects(
+    response: Response,
+    status: Optional[str] = None,
+    technology: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_read_db)
+):
+    """Get research projects, optionally filtered by status / technology - PUBLIC
+    
+    The total number of matches is returned in the X-Total-Count header.
+    """
     try:
-        projects = db.query(ResearchProject).order_by(ResearchProject.order).limit(100).all()
+        query = db.query(ResearchProject)
+        if status:
+            query = query.filter(ResearchProject.status == status)
+        if technology:
+            matching = select(ResearchProjectTechnology.project_id)\
+                .join(Technology, Technology.id == ResearchProjectTechnology.technology_id)\
+                .where(Technology.normalized_name == normalize_technology(technology))
+            query = query.filter(ResearchProject.id.in_(matching))
+        
+        response.headers["X-Total-Count"] = str(query.count())
+        projects = query.order_by(ResearchProject.order)\
+            .offset(skip)\
+            .limit(min(limit, 500))\
+            .all()
         return projects
     except Exception as e:
-        print(f"Error fetching projects: {e}")
+        logger.exception("Error fetching projects")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/counts")
+def get_project_counts(db: Session = Depends(get_read_db)):
+    """Project counts per status and technology, for filter chips - PUBLIC"""
+    statuses = db.query(ResearchProject.status, func.count(ResearchProject.id))\
+        .group_by(ResearchProject.status)\
+        .all()
+    return {
+        "total": sum(count for _, count in statuses),
+        "status": [{"value": value, "count": count} for value, count in statuses if value],
+        "technology": technology_counts(db),
+    }
+
 @router.get("/{project_id}", response_model=ResearchProjectResponse)
-def get_project(project_id: int, db: Session = Depends(get_db)):
+def get_project(project_id: int, db: Session = Depends(get_read_db)):
     """Get a specific research project by ID - PUBLIC"""
-    project = db.query(ResearchProject).filter(ResearchProject.id == project_id).first()
+    project = db.get(ResearchProject, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Research project not found")
     return project
@@ -29,64 +72,151 @@ def get_project(project_id: int, db: Session = Depends(get_db)):
 @router.post("/", response_model=ResearchProjectResponse)
 def create_project(
     project: ResearchProjectCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     username: str = Depends(verify_token)
 ):
     """Create a new research project - REQUIRES AUTH"""
     try:
         db_project = ResearchProject(**project.model_dump())
         db.add(db_project)
+        sync_technologies(db, db_project)
+        admin_stats.apply_change(db, "research", [], admin_stats.stat_keys("research", db_project))
         db.commit()
         db.refresh(db_project)
+        suggest.item_changed("research", db_project)
         return db_project
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"Error creating project: {e}")
+        logger.exception("Error creating project")
         raise HTTPException(status_code=500, detail="Failed to create project")
 
 @router.put("/{project_id}", response_model=ResearchProjectResponse)
 def update_project(
     project_id: int,
     project_update: ResearchProjectCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     username: str = Depends(verify_token)
 ):
     """Update a research project - REQUIRES AUTH"""
-    project = db.query(ResearchProject).filter(ResearchProject.id == project_id).first()
+    project = db.get(ResearchProject, project_id)
     
     if not project:
         raise HTTPException(status_code=404, detail="Research project not found")
     
     try:
+        # A new image URL makes previously generated variants stale
+        if project_update.image_url != project.image_url:
+            project.image_variants = None
+        
         for key, value in project_update.model_dump().items():
             setattr(project, key, value)
         
+        sync_technologies(db, project)
+        admin_stats.touch(db, "research")
         db.commit()
+        suggest.item_changed("research", project)
         db.refresh(project)
         return project
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"Error updating project: {e}")
+        logger.exception("Error updating project")
         raise HTTPException(status_code=500, detail="Failed to update project")
 
+@router.patch("/{project_id}", response_model=ResearchProjectResponse)
+def patch_project(
+    project_id: int,
+    project_patch: ResearchProjectUpdate,
+    db: Session = Depends(get_write_db),
+    username: str = Depends(verify_token)
+):
+    """Update only the given fields of a research project; 409 if `version` is stale - REQUIRES AUTH"""
+    project = db.get(ResearchProject, project_id)
+    
+    if not project:
+        raise HTTPException(status_code=404, detail="Research project not found")
+    
+    changed = apply_patch(project, project_patch)
+    if not changed:
+        return project
+    
+    try:
+        # A new image URL makes previously generated variants stale
+        if "image_url" in changed:
+            project.image_variants = None
+        if "technologies" in changed:
+            sync_technologies(db, project)
+        admin_stats.touch(db, "research")
+        db.commit()
+        suggest.item_changed("research", project)
+        return project
+    except StaleDataError:
+        db.rollback()
+        raise stale_error()
+    except Exception:
+        db.rollback()
+        logger.exception("Error updating project")
+        raise HTTPException(status_code=500, detail="Failed to update project")
+
+@router.post("/{project_id}/image", response_model=ResearchProjectResponse, status_code=202)
+def upload_project_image(
+    project_id: int,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_write_db),
+    username: str = Depends(verify_token)
+):
+    """Upload a project image; resized variants are generated in the background - REQUIRES AUTH"""
+    if not images.images_enabled():
+        raise HTTPException(status_code=503, detail="Image processing is not available (Pillow not installed)")
+    
+    if not (file.content_type or "").startswith("image/"):
+        raise HTTPException(status_code=415, detail="File must be an image")
+    
+    project = db.get(ResearchProject, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Research project not found")
+    
+    original = file.file.read(settings.IMAGE_MAX_UPLOAD_BYTES + 1)
+    if len(original) > settings.IMAGE_MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Image is too large")
+    
+    extension = (file.filename or "").rsplit(".", 1)[-1].lower()
+    if extension not in ("jpg", "jpeg", "png", "webp", "gif", "avif"):
+        extension = "img"
+    
+    try:
+        _, relative_path = store_bytes(original, "research/originals", extension)
+        project.image_url = media_url(relative_path)
+        project.image_variants = None
+        db.commit()
+        db.refresh(project)
+    except Exception:
+        db.rollback()
+        logger.exception("Error storing project image")
+        raise HTTPException(status_code=500, detail="Failed to store image")
+    
+    images.submit_variants(project.id, original, project.image_url)
+    return project
+
 @router.delete("/{project_id}")
 def delete_project(
     project_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     username: str = Depends(verify_token)
 ):
     """Delete a research project - REQUIRES AUTH"""
-    project = db.query(ResearchProject).filter(ResearchProject.id == project_id).first()
+    project = db.get(ResearchProject, project_id)
     
     if not project:
         raise HTTPException(status_code=404, detail="Research project not found")
     
     try:
         title = project.title
+        admin_stats.apply_change(db, "research", admin_stats.stat_keys("research", project), [])
         db.delete(project)
         db.commit()
+        suggest.item_deleted("research", project_id)
         return {"status": "success", "message": f"Project '{title}' deleted successfully"}
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"Error deleting project: {e}")
+        logger.exception("Error deleting project")
         raise HTTPException(status_code=500, detail="Failed to delete project")
\ No newline at end of file
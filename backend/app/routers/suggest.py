@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Query
+from typing import List, Optional
+from ..schemas import Suggestion
+from .. import suggest
+
+router = APIRouter(prefix="/api", tags=["suggest"])
+
+
+@router.get("/suggest", response_model=List[Suggestion])
+async def get_suggestions(
+    q: str = Query("", max_length=100),
+    limit: int = Query(8, ge=1, le=20),
+    kinds: Optional[str] = None
+):
+    """Search-as-you-type completions from the in-memory index - PUBLIC"""
+    # Async on purpose: no I/O, so skip the threadpool hop
+    wanted = {kind.strip() for kind in kinds.split(",")} if kinds else None
+    return suggest.index.suggest(q, limit=limit, kinds=wanted)
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, computed_field, field_validator, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
+import json
 
 # Blog Schemas
 class BlogPostBase(BaseModel):
@@ -14,14 +15,68 @@ class BlogPostBase(BaseModel):
 class BlogPostCreate(BlogPostBase):
     pass
 
+# PATCH bodies: only the fields being changed, plus the version being edited.
+# Required columns default to None but reject an explicit null.
+class BlogPostUpdate(BaseModel):
+    version: int
+    title: str = None
+    content: str = None
+    excerpt: Optional[str] = None
+    author: Optional[str] = None
+    published: bool = None
+    tags: Optional[str] = None
+
 class BlogPostResponse(BlogPostBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    version: int
+    
+    class Config:
+        from_attributes = True
+
+
+class BlogRevisionResponse(BaseModel):
+    revision: int
+    kind: str
+    changed_fields: List[str] = []
+    restored_from: Optional[int] = None
+    created_by: Optional[str] = None
+    created_at: datetime
+    size: int  # Stored (compressed) bytes
+    
+    @field_validator("changed_fields", mode="before")
+    @classmethod
+    def split_fields(cls, value):
+        # Stored comma-separated on the model
+        if isinstance(value, str):
+            return [name for name in value.split(",") if name]
+        return value or []
     
     class Config:
         from_attributes = True
 
+class BlogRevisionDiff(BaseModel):
+    from_revision: int
+    to_revision: int
+    fields: Dict[str, Dict[str, object]]
+    content_diff: str
+
+class RelatedBlogPost(BaseModel):
+    id: int
+    title: str
+    excerpt: Optional[str] = None
+    tags: Optional[str] = None
+    created_at: datetime
+    score: float
+
+class PopularBlogPost(BaseModel):
+    id: int
+    title: str
+    excerpt: Optional[str] = None
+    created_at: datetime
+    views: int
+
 
 # Contact Schemas
 class ContactMessageBase(BaseModel):
@@ -31,7 +86,7 @@ class ContactMessageBase(BaseModel):
     message: str
 
 class ContactMessageCreate(ContactMessageBase):
-    pass
+    website: Optional[str] = None  # Honeypot - hidden in the form, only bots fill it
 
 class ContactMessageResponse(ContactMessageBase):
     id: int
@@ -41,6 +96,52 @@ class ContactMessageResponse(ContactMessageBase):
     class Config:
         from_attributes = True
 
+class ContactBulkRequest(BaseModel):
+    """Selects messages for a bulk operation; all given filters must match"""
+    ids: Optional[List[int]] = Field(default=None, max_length=5000)
+    before: Optional[datetime] = None  # created before this time
+    sender: Optional[str] = None  # email address, case-insensitive
+    
+    @model_validator(mode="after")
+    def require_filter(self):
+        # An empty body must never mean "every message"
+        if not self.ids and self.before is None and not self.sender:
+            raise ValueError("Provide ids, before or sender")
+        return self
+
+class ContactBulkResponse(BaseModel):
+    status: str
+    affected: int
+
+
+# Admin Schemas
+class BlockedSenderCreate(BaseModel):
+    value: str  # "someone@example.com" or "example.com"
+    reason: Optional[str] = None
+    
+    @field_validator("value")
+    @classmethod
+    def normalize_value(cls, value):
+        from .spam import normalize_sender
+        value = normalize_sender(value)
+        if not value or " " in value or "." not in value:
+            raise ValueError("Enter an email address or a domain")
+        return value
+
+class BlockedSenderResponse(BaseModel):
+    id: int
+    value: str
+    reason: Optional[str] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class ProfilerArmRequest(BaseModel):
+    route: str  # Route template, e.g. "/api/blogs/{blog_id}"
+    method: str = Field("GET", pattern=r"^(\*|GET|POST|PUT|PATCH|DELETE)$")  # "*" for any
+    count: int = Field(1, ge=1, le=100)  # Requests to profile, per worker
+
 
 # Research Project Schemas
 class ResearchProjectBase(BaseModel):
@@ -57,8 +158,44 @@ class ResearchProjectBase(BaseModel):
 class ResearchProjectCreate(ResearchProjectBase):
     pass
 
+class ResearchProjectUpdate(BaseModel):
+    version: int
+    title: str = None
+    description: str = None
+    image_url: Optional[str] = None
+    project_url: Optional[str] = None
+    technologies: Optional[str] = None
+    status: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    order: Optional[int] = None
+
 class ResearchProjectResponse(ResearchProjectBase):
     id: int
+    version: int
+    image_variants: Optional[Dict[str, Dict[str, object]]] = None
+    
+    @field_validator("image_variants", mode="before")
+    @classmethod
+    def parse_image_variants(cls, value):
+        # Stored as a JSON string on the model
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+    
+    @computed_field
+    @property
+    def srcset(self) -> Optional[Dict[str, str]]:
+        """srcset strings per image format, e.g. {"webp": "a.webp 320w, ..."}"""
+        if not self.image_variants:
+            return None
+        srcset = {}
+        for variant in self.image_variants.values():
+            for image_format, url in variant.items():
+                if image_format in ("width", "height"):
+                    continue
+                srcset.setdefault(image_format, []).append(f"{url} {variant['width']}w")
+        return {image_format: ", ".join(urls) for image_format, urls in srcset.items()}
     
     class Config:
         from_attributes = True
@@ -76,12 +213,54 @@ class PublicationBase(BaseModel):
     citation: Optional[str] = None
     order: Optional[int] = 0
 
+    @field_validator("doi")
+    @classmethod
+    def normalize_doi(cls, value):
+        # DOIs are unique - store one canonical spelling, and no empty strings
+        from .bibimport import normalize_doi
+        return normalize_doi(value)
+
 class PublicationCreate(PublicationBase):
     pass
 
+class PublicationUpdate(BaseModel):
+    version: int
+    title: str = None
+    authors: str = None
+    journal: Optional[str] = None
+    year: Optional[int] = None
+    doi: Optional[str] = None
+    pdf_url: Optional[str] = None
+    abstract: Optional[str] = None
+    citation: Optional[str] = None
+    order: Optional[int] = None
+    
+    @field_validator("doi")
+    @classmethod
+    def normalize_doi(cls, value):
+        return PublicationBase.normalize_doi(value)
+
 class PublicationResponse(PublicationBase):
     id: int
+    version: int
+    pdf_sha256: Optional[str] = None
+    pdf_size: Optional[int] = None
     
     class Config:
         from_attributes = True
-        
\ No newline at end of file
+        
+
+class RelatedPublication(BaseModel):
+    id: int
+    title: str
+    authors: str
+    journal: Optional[str] = None
+    year: Optional[int] = None
+    score: float
+
+
+# Typeahead Schemas
+class Suggestion(BaseModel):
+    kind: str  # blog, paper, research, tag or author
+    id: Optional[int] = None  # Set for blog / paper / research
+    text: str
@@ -0,0 +1,169 @@
+"""
+Pre-forking launcher for running the API on several CPU cores
+
+The app is imported once in the parent process and then forked into
+worker processes that share one listening socket. The parent also relays
+invalidation bus messages between workers (see app/invalidation.py).
+
+Usage:
+    python -m app.server --host 0.0.0.0 --port 8000 --workers 4
+
+The worker count defaults to the WEB_CONCURRENCY environment variable.
+"""
+
+import argparse
+import os
+import selectors
+import signal
+import socket
+import sys
+import threading
+import time
+
+import uvicorn
+
+
+class Supervisor:
+    """Forks the workers, restarts crashed ones and relays bus messages"""
+
+    def __init__(self, app, sock, workers, log_level):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.log_level = log_level
+        self.children = {}  # pid -> parent end of the bus socketpair
+        self.selector = selectors.DefaultSelector()
+        self.lock = threading.Lock()
+        self.shutting_down = False
+
+    def run(self):
+        for _ in range(self.workers):
+            self.spawn()
+
+        relay = threading.Thread(target=self.relay, name="bus-relay", daemon=True)
+        relay.start()
+
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        print(f"🚀 Supervisor {os.getpid()} running {self.workers} workers")
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, 0)
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            self.reap(pid)
+            if not self.shutting_down:
+                print(f"⚠️ Worker {pid} exited (status {status}), restarting")
+                time.sleep(1)
+                self.spawn()
+
+        print("👋 All workers stopped")
+
+    def spawn(self):
+        parent_end, child_end = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        pid = os.fork()
+
+        if pid == 0:
+            parent_end.close()
+            self.run_worker(child_end)
+            os._exit(0)
+
+        child_end.close()
+        with self.lock:
+            self.children[pid] = parent_end
+            self.selector.register(parent_end, selectors.EVENT_READ, pid)
+
+    def reap(self, pid):
+        with self.lock:
+            parent_end = self.children.pop(pid, None)
+            if parent_end is not None:
+                self.selector.unregister(parent_end)
+                parent_end.close()
+
+    def relay(self):
+        """Forward every message from one worker to all the others"""
+        while True:
+            try:
+                events = self.selector.select(timeout=1)
+            except (OSError, ValueError):
+                # Selector changed under us while a worker was replaced
+                time.sleep(0.1)
+                continue
+            for key, _ in events:
+                try:
+                    data = key.fileobj.recv(65536)
+                except OSError:
+                    continue
+                with self.lock:
+                    peers = [s for pid, s in self.children.items() if pid != key.data]
+                for peer in peers:
+                    try:
+                        peer.send(data)
+                    except OSError:
+                        pass
+
+    def stop(self, signum, frame):
+        self.shutting_down = True
+        with self.lock:
+            pids = list(self.children)
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run_worker(self, bus_sock):
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        _after_fork(bus_sock)
+
+        config = uvicorn.Config(self.app, log_level=self.log_level, proxy_headers=True)
+        server = uvicorn.Server(config)
+        server.run(sockets=[self.sock])
+
+
+def _after_fork(bus_sock):
+    """Give the worker its own DB connections and connect it to the bus"""
+    from .database import read_engine, write_engine
+    from .invalidation import bus
+
+    # Never reuse pooled connections inherited from the parent
+    write_engine.dispose(close=False)
+    read_engine.dispose(close=False)
+    bus.connect(bus_sock)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the API with pre-forked workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")))
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    # Preload: import the app (and create tables) once, before forking
+    from .main import app
+    from .database import read_engine, write_engine
+
+    write_engine.dispose()
+    read_engine.dispose()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    if args.workers <= 1:
+        config = uvicorn.Config(app, log_level=args.log_level, proxy_headers=True)
+        uvicorn.Server(config).run(sockets=[sock])
+        return
+
+    Supervisor(app, sock, args.workers, args.log_level).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
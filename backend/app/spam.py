@@ -0,0 +1,202 @@
+"""
+Contact form spam pre-filter
+Runs before the contact router touches the database or the email API:
+
+- honeypot: a hidden "website" field real visitors never fill in
+- heuristics: too many links, links in the name/subject, link markup,
+  text that is mostly not letters
+- duplicates: a fingerprint of the normalized text, remembered for
+  SPAM_DEDUP_WINDOW_SECONDS (shared between workers over the bus)
+- blocklist: senders and domains from the blocked_senders table, held in
+  a Bloom filter; only a filter hit (rare) costs an indexed lookup
+
+Rejections are counted in app/metrics.py, never stored.
+"""
+
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from . import metrics
+from .config import settings
+from .invalidation import bus
+
+_LINK = re.compile(r"https?://|www\.", re.IGNORECASE)
+_MARKUP = re.compile(r"\[url=|\[link=|<a\s+href", re.IGNORECASE)
+
+
+class BloomFilter:
+    """Compact set membership with no false negatives and ~error_rate false positives"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, value: str):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(value))
+
+
+class RecentFingerprints:
+    """Fingerprints seen within the last `window` seconds (bounded in size)"""
+
+    def __init__(self, window: float, maxsize: int = 10000):
+        self.window = window
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now):
+        while self._items:
+            oldest, seen_at = next(iter(self._items.items()))
+            if now - seen_at < self.window and len(self._items) <= self.maxsize:
+                break
+            self._items.popitem(last=False)
+
+    def seen(self, fingerprint: str, now: float = None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._evict(now)
+            return fingerprint in self._items
+
+    def add(self, fingerprint: str, at: float = None):
+        with self._lock:
+            self._items[fingerprint] = time.time() if at is None else at
+            self._items.move_to_end(fingerprint)
+
+
+_blocklist = BloomFilter(settings.SPAM_BLOOM_CAPACITY)
+_recent = RecentFingerprints(settings.SPAM_DEDUP_WINDOW_SECONDS)
+
+
+# ============================================================================
+# Blocklist
+# ============================================================================
+def normalize_sender(value: str):
+    """Lowercase email address or domain, as stored in blocked_senders"""
+    return (value or "").strip().lower().lstrip("@")
+
+
+def _sender_keys(email: str):
+    """The address and every parent domain: a@mail.spam.io -> a@..., mail.spam.io, spam.io"""
+    address = normalize_sender(email)
+    domain = address.rsplit("@", 1)[-1]
+    labels = domain.split(".")
+    return [address] + [".".join(labels[i:]) for i in range(len(labels) - 1)]
+
+
+def load_blocklist(db):
+    """Rebuild this worker's Bloom filter from the blocked_senders table"""
+    global _blocklist
+    from .models import BlockedSender
+
+    values = [value for (value,) in db.query(BlockedSender.value)]
+    blocklist = BloomFilter(max(settings.SPAM_BLOOM_CAPACITY, len(values) * 2))
+    for value in values:
+        blocklist.add(value)
+    _blocklist = blocklist
+    return len(values)
+
+
+def _reload_blocklist(payload=None):
+    from .database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        load_blocklist(db)
+    finally:
+        db.close()
+
+
+def blocklist_changed():
+    """Reload the filter in every worker after blocked_senders changed"""
+    bus.publish("spam.blocklist_changed")
+
+
+def is_blocked(email: str):
+    candidates = [key for key in _sender_keys(email) if key in _blocklist]
+    if not candidates:
+        return False
+
+    # Confirm the hit - the filter can report false positives
+    from .database import ReadSessionLocal
+    from .models import BlockedSender
+
+    db = ReadSessionLocal()
+    try:
+        return db.query(BlockedSender.id).filter(BlockedSender.value.in_(candidates)).first() is not None
+    finally:
+        db.close()
+
+
+# ============================================================================
+# Checks
+# ============================================================================
+def fingerprint(message):
+    text = f"{message.subject or ''}\n{message.message}"
+    normalized = " ".join(text.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def heuristic_reason(message):
+    text = message.message or ""
+    if not text.strip():
+        return "empty"
+    if len(_LINK.findall(text)) > settings.SPAM_MAX_LINKS:
+        return "too_many_links"
+    if _LINK.search(message.name or "") or _LINK.search(message.subject or ""):
+        return "link_in_header"
+    if _MARKUP.search(text):
+        return "link_markup"
+    if len(text) >= 40 and sum(c.isalpha() for c in text) / len(text) < 0.3:
+        return "not_text"
+    return None
+
+
+def check_submission(message):
+    """
+    Reason a submission should be rejected, or None to accept it.
+    Every outcome is counted in metrics.
+    """
+    if getattr(message, "website", None):
+        reason = "honeypot"
+    else:
+        reason = heuristic_reason(message)
+        if reason is None and _recent.seen(fingerprint(message)):
+            reason = "duplicate"
+        if reason is None and is_blocked(message.email):
+            reason = "blocked_sender"
+
+    if reason:
+        metrics.increment("contact.rejected")
+        metrics.increment(f"contact.rejected.{reason}")
+    else:
+        metrics.increment("contact.accepted")
+    return reason
+
+
+def remember(message):
+    """Record an accepted submission's fingerprint (in all workers)"""
+    bus.publish("contact.fingerprint", {"fingerprint": fingerprint(message), "at": time.time()})
+
+
+def _record_fingerprint(payload):
+    _recent.add(payload["fingerprint"], payload["at"])
+
+
+bus.subscribe("contact.fingerprint", _record_fingerprint)
+bus.subscribe("spam.blocklist_changed", _reload_blocklist)
@@ -0,0 +1,235 @@
+"""
+Typeahead suggestions from an in-memory prefix index
+
+Titles of published blog posts, publications and research projects, blog
+tags and author names are kept in one sorted list of (key, kind, id)
+entries. A lookup is a bisect to the first key >= the query and a short
+scan while keys still start with it, so no query touches the database.
+
+Every word of a title starts a key ("asyncio patterns" also finds
+"Advanced asyncio patterns"). Tags and authors are shared by several
+items, so they are reference-counted.
+
+The index is built at startup in each worker and patched by the routers
+after every write. Changes are published on the invalidation bus, so all
+workers apply them.
+"""
+
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+
+from sqlalchemy.orm import load_only
+
+from .facets import author_names
+from .invalidation import bus
+
+# Kinds, in the order they are ranked when scores tie
+KINDS = ("blog", "paper", "research", "tag", "author")
+MAX_KEY_WORDS = 8  # Word positions per title that start a key
+MAX_SCAN = 500  # Entries scanned per lookup before ranking
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text: str):
+    return " ".join(_WORD.findall((text or "").lower()))
+
+
+def _keys(text):
+    """The full normalized text plus the suffix starting at each later word"""
+    words = normalize(text).split()
+    return [" ".join(words[i:]) for i in range(min(len(words), MAX_KEY_WORDS))]
+
+
+def _split(value, separator):
+    return [part.strip() for part in (value or "").split(separator) if part.strip()]
+
+
+class SuggestIndex:
+    """Sorted (key, kind, id) entries plus what each source item contributed"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = []  # sorted (key, kind, id)
+        self._labels = {}  # (kind, id) -> (display text, normalized text)
+        self._refs = {}  # (kind, id) -> number of items using a tag / author
+        self._contributions = {}  # (kind, item_id) -> [(kind, id, label), ...]
+        self.built_at = None
+
+    # ------------------------------------------------------------------------
+    # Maintenance (callers hold the lock)
+    # ------------------------------------------------------------------------
+    def _add(self, kind, id, label):
+        ref = (kind, id)
+        if ref in self._refs:
+            self._refs[ref] += 1
+            return
+        self._refs[ref] = 1
+        self._labels[ref] = (label, normalize(label))
+        for key in _keys(label):
+            insort(self._entries, (key, kind, id))
+
+    def _remove(self, kind, id):
+        ref = (kind, id)
+        if ref not in self._refs:
+            return
+        self._refs[ref] -= 1
+        if self._refs[ref] > 0:
+            return
+        del self._refs[ref]
+        for key in _keys(self._labels.pop(ref)[0]):
+            entry = (key, kind, id)
+            position = bisect_left(self._entries, entry)
+            if position < len(self._entries) and self._entries[position] == entry:
+                del self._entries[position]
+
+    def _set_item(self, kind, item_id, contributions):
+        for old in self._contributions.pop((kind, item_id), []):
+            self._remove(old[0], old[1])
+        for new in contributions:
+            self._add(*new)
+        if contributions:
+            self._contributions[(kind, item_id)] = contributions
+
+    def set_item(self, kind, item_id, contributions):
+        """Replace everything one blog post / publication / project contributes"""
+        with self._lock:
+            self._set_item(kind, item_id, contributions)
+
+    def replace_all(self, items):
+        """items: {(kind, item_id): contributions}"""
+        with self._lock:
+            self._entries, self._labels, self._refs, self._contributions = [], {}, {}, {}
+            for (kind, item_id), contributions in items.items():
+                self._set_item(kind, item_id, contributions)
+            self.built_at = time.time()
+
+    # ------------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------------
+    def suggest(self, query: str, limit: int = 8, kinds=None):
+        """Ranked completions: whole-label prefix matches first, then word matches"""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        best = {}
+        with self._lock:
+            position = bisect_left(self._entries, (prefix,))
+            end = min(len(self._entries), position + MAX_SCAN)
+            while position < end:
+                key, kind, id = self._entries[position]
+                if not key.startswith(prefix):
+                    break
+                position += 1
+                if kinds and kind not in kinds:
+                    continue
+                label, normalized = self._labels[(kind, id)]
+                # Lower is better: match at the start of the label, exact match,
+                # more items using a tag / author, shorter label
+                rank = (
+                    0 if normalized.startswith(prefix) else 1,
+                    0 if key == prefix else 1,
+                    -self._refs[(kind, id)],
+                    len(label),
+                    KINDS.index(kind),
+                )
+                if (kind, id) not in best or rank < best[(kind, id)][0]:
+                    best[(kind, id)] = (rank, label)
+
+        ranked = sorted(best.items(), key=lambda item: item[1][0])[:limit]
+        return [
+            {"kind": kind, "id": id if isinstance(id, int) else None, "text": label}
+            for (kind, id), (_, label) in ranked
+        ]
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "labels": len(self._labels), "built_at": self.built_at}
+
+
+index = SuggestIndex()
+
+
+# ============================================================================
+# What each source item contributes
+# ============================================================================
+def contributions(kind, data):
+    """[(kind, id, label)] for a blog / paper / research item given as a dict"""
+    if kind == "blog":
+        if not data.get("published"):
+            return []
+        return [("blog", data["id"], data["title"])] + [
+            ("tag", normalize(tag), tag) for tag in _split(data.get("tags"), ",")
+        ] + ([("author", normalize(data["author"]), data["author"])] if data.get("author") else [])
+    if kind == "paper":
+        return [("paper", data["id"], data["title"])] + [
+            ("author", normalize(name), name) for name in author_names(data.get("authors"))
+        ]
+    return [("research", data["id"], data["title"])]
+
+
+def item_data(kind, item):
+    """The fields of a model instance the index needs (small enough for the bus)"""
+    if kind == "blog":
+        return {"id": item.id, "title": item.title, "tags": item.tags, "author": item.author, "published": item.published}
+    if kind == "paper":
+        return {"id": item.id, "title": item.title, "authors": item.authors}
+    return {"id": item.id, "title": item.title}
+
+
+def build(db):
+    """Load every source item from the database into the index"""
+    from .models import BlogPost, Publication, ResearchProject
+
+    sources = (
+        ("blog", BlogPost, (BlogPost.title, BlogPost.tags, BlogPost.author, BlogPost.published)),
+        ("paper", Publication, (Publication.title, Publication.authors)),
+        ("research", ResearchProject, (ResearchProject.title,)),
+    )
+    items = {}
+    for kind, model, columns in sources:
+        for item in db.query(model).options(load_only(*columns)):
+            items[(kind, item.id)] = contributions(kind, item_data(kind, item))
+    index.replace_all(items)
+    return index.stats()["labels"]
+
+
+# ============================================================================
+# Updates from the routers (after commit), applied in every worker
+# ============================================================================
+def _apply(payload):
+    kind = payload["kind"]
+    if payload.get("deleted"):
+        index.set_item(kind, payload["id"], [])
+    else:
+        index.set_item(kind, payload["id"], contributions(kind, payload["data"]))
+
+
+def _rebuild(payload):
+    from .database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        build(db)
+    finally:
+        db.close()
+
+
+bus.subscribe("suggest.item", _apply)
+bus.subscribe("suggest.rebuild", _rebuild)
+
+
+def item_changed(kind, item):
+    bus.publish("suggest.item", {"kind": kind, "id": item.id, "data": item_data(kind, item)})
+
+
+def item_deleted(kind, item_id):
+    bus.publish("suggest.item", {"kind": kind, "id": item_id, "deleted": True})
+
+
+def rebuild():
+    """Reload the index from the database in every worker (e.g. after a bulk import)"""
+    bus.publish("suggest.rebuild")
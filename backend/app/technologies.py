@@ -0,0 +1,68 @@
+"""
+Normalized research project technologies
+ResearchProject.technologies stays a comma-separated string; this module
+mirrors it into the technologies / research_project_technologies tables so
+projects can be filtered and counted by technology through indexes.
+"""
+
+from sqlalchemy import func
+
+from .models import ResearchProject, ResearchProjectTechnology, Technology
+
+
+def normalize_technology(name: str):
+    return " ".join((name or "").lower().split())
+
+
+def technology_names(technologies: str):
+    names = []
+    seen = set()
+    for name in (technologies or "").split(","):
+        name = " ".join(name.split())[:100]
+        if name and normalize_technology(name) not in seen:
+            seen.add(normalize_technology(name))
+            names.append(name)
+    return names
+
+
+def _get_or_create_technology(db, name):
+    normalized = normalize_technology(name)
+    technology = db.query(Technology).filter(Technology.normalized_name == normalized).first()
+    if technology is None:
+        technology = Technology(name=name, normalized_name=normalized)
+        db.add(technology)
+        db.flush()
+    return technology
+
+
+def sync_technologies(db, project):
+    """Rebuild a project's technology links from its technologies field"""
+    links = []
+    for name in technology_names(project.technologies):
+        technology = _get_or_create_technology(db, name)
+        links.append(ResearchProjectTechnology(technology=technology, technology_id=technology.id))
+    project.technology_links = links
+
+
+def ensure_technologies(db):
+    """Backfill links once for databases that predate them"""
+    has_links = db.query(ResearchProjectTechnology).first() is not None
+    if has_links:
+        return
+
+    projects = db.query(ResearchProject).filter(ResearchProject.technologies.isnot(None)).all()
+    for project in projects:
+        sync_technologies(db, project)
+    if projects:
+        db.commit()
+        print(f"✅ Linked technologies for {len(projects)} research projects")
+
+
+def technology_counts(db):
+    """[{"value": name, "count": n}, ...] for every technology in use"""
+    rows = db.query(Technology.name, func.count(ResearchProjectTechnology.project_id))\
+        .join(ResearchProjectTechnology, ResearchProjectTechnology.technology_id == Technology.id)\
+        .group_by(Technology.id, Technology.name)\
+        .order_by(func.count(ResearchProjectTechnology.project_id).desc(), Technology.name)\
+        .all()
+    return [{"value": name, "count": count} for name, count in rows]
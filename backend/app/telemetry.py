@@ -0,0 +1,180 @@
+"""
+Saturation telemetry for worker threads and DB connection pools
+
+Sync routes need a thread from the AnyIO threadpool, then a pooled DB
+connection. This module measures both queues:
+
+- thread slots: limiter size, slots in use and peak use, tasks waiting
+- thread wait: time from the request entering the app until its first
+  sync dependency (get_read_db / get_write_db) starts running on a thread
+- pool checkout: time spent in QueuePool checkout (including connecting
+  a new overflow connection), overflow in use and peak, checkout timeouts
+  and other checkout (connect) errors
+
+Numbers are per worker process; /api/admin/telemetry reports the worker
+that answered.
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+# [perf_counter() when the request entered the app, wait recorded yet?]
+# Worker threads get a copy of the request's context, so the list itself is
+# shared and the flag survives across several dependencies
+request_started = contextvars.ContextVar("request_started", default=None)
+
+_limiter = None
+_peak_threads = 0
+
+
+class LatencyStats:
+    """Count / mean / max plus percentiles over the most recent samples"""
+
+    def __init__(self, window: int = 2000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def snapshot(self):
+        with self._lock:
+            samples = sorted(self._samples)
+            count, total, peak = self.count, self.total, self.max
+
+        def percentile(p):
+            if not samples:
+                return None
+            return round(samples[min(len(samples) - 1, int(p / 100 * len(samples)))] * 1000, 2)
+
+        return {
+            "count": count,
+            "mean_ms": round(total / count * 1000, 2) if count else None,
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "p99_ms": percentile(99),
+            "max_ms": round(peak * 1000, 2),
+        }
+
+
+thread_wait = LatencyStats()
+
+
+# ============================================================================
+# Threadpool
+# ============================================================================
+def configure_threadpool(size: int):
+    """Resize AnyIO's default thread limiter; must run inside the event loop"""
+    global _limiter
+    from anyio import to_thread
+
+    _limiter = to_thread.current_default_thread_limiter()
+    _limiter.total_tokens = size
+    return _limiter
+
+
+def record_thread_wait():
+    """Called at the start of sync dependencies - records the wait once per request"""
+    stamp = request_started.get()
+    if stamp is None or stamp[1]:
+        return
+    stamp[1] = True
+    thread_wait.add(time.perf_counter() - stamp[0])
+
+    global _peak_threads
+    if _limiter is not None:
+        _peak_threads = max(_peak_threads, _limiter.borrowed_tokens)
+
+
+def threadpool_stats():
+    if _limiter is None:
+        return None
+    statistics = _limiter.statistics()
+    return {
+        "size": _limiter.total_tokens,
+        "in_use": statistics.borrowed_tokens,
+        "peak_in_use": _peak_threads,
+        "waiting": statistics.tasks_waiting,
+        "utilization": round(statistics.borrowed_tokens / _limiter.total_tokens, 3),
+        "wait": thread_wait.snapshot(),
+    }
+
+
+class RequestTimingMiddleware:
+    """Stamps request_started for every HTTP request (pure ASGI)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            request_started.set([time.perf_counter(), False])
+        await self.app(scope, receive, send)
+
+
+# ============================================================================
+# Connection pools
+# ============================================================================
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkout wait, overflow peak, timeouts and other checkout errors"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = LatencyStats()
+        self.peak_overflow = 0
+        self.timeouts = 0
+        self.errors = 0  # Connect / auth failures while opening a connection
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.checkout_wait.add(time.perf_counter() - start)
+        self.peak_overflow = max(self.peak_overflow, self.overflow())
+        return connection
+
+    def recreate(self):
+        # Engine.dispose() swaps in a fresh pool - carry the counters over
+        pool = super().recreate()
+        if isinstance(pool, InstrumentedQueuePool):
+            pool.checkout_wait = self.checkout_wait
+            pool.peak_overflow = self.peak_overflow
+            pool.timeouts = self.timeouts
+            pool.errors = self.errors
+        return pool
+
+
+def pool_stats(engine):
+    pool = engine.pool
+    stats = {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow_in_use": max(pool.overflow(), 0),
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        stats["peak_overflow"] = max(pool.peak_overflow, 0)
+        stats["checkout_timeouts"] = pool.timeouts
+        stats["checkout_errors"] = pool.errors
+        stats["checkout_wait"] = pool.checkout_wait.snapshot()
+    return stats
@@ -0,0 +1,142 @@
+"""
+Blog view counters
+
+get_blog only bumps an in-memory counter, and only for a published post
+it found; nothing is written on the read path. Each worker flushes its
+buffered counts every VIEW_FLUSH_INTERVAL_SECONDS (or once
+VIEW_FLUSH_MAX_PENDING posts are pending, with at most one early flush
+queued at a time) as one batched upsert into blog_view_counts, one row
+per post and day. The shutdown event flushes whatever is left.
+
+A failed flush puts the counts back into the buffer, so they are retried
+with the next one.
+"""
+
+import threading
+from collections import Counter
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+from . import metrics
+from .cache import LocalCache
+from .config import settings
+from .database import write_engine
+from .logs import get_logger
+from .models import BlogPost, BlogViewCount
+
+logger = get_logger(__name__)
+
+WINDOWS = {"day": 1, "week": 7}
+
+# Popular posts keyed by (window, limit); cleared after every flush
+popular_cache = LocalCache("popular_blogs", maxsize=16, ttl=settings.POPULAR_CACHE_SECONDS)
+
+
+def _upsert(dialect_name):
+    """INSERT ... ON CONFLICT (blog_id, day) DO UPDATE SET views = views + excluded.views"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    statement = insert(BlogViewCount.__table__)
+    return statement.on_conflict_do_update(
+        index_elements=["blog_id", "day"],
+        set_={"views": BlogViewCount.__table__.c.views + statement.excluded.views},
+    )
+
+
+class ViewCounter:
+    def __init__(self, engine, interval, max_pending):
+        self.engine = engine
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending = Counter()  # (blog_id, day) -> views
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flush_requested = False  # An early flush thread is already queued
+        self._thread = None
+        self._upsert = _upsert(engine.dialect.name)
+
+    def increment(self, blog_id):
+        with self._lock:
+            self._pending[(blog_id, date.today())] += 1
+            full = len(self._pending) >= self.max_pending and not self._flush_requested
+            if full:
+                self._flush_requested = True
+        if full:
+            threading.Thread(target=self.flush, name="view-flush", daemon=True).start()
+
+    def flush(self):
+        """Write all buffered counts in one transaction; returns the number of rows"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, Counter()
+                self._flush_requested = False
+            if not batch:
+                return 0
+
+            try:
+                with self.engine.begin() as connection:
+                    # Posts deleted since they were viewed would violate the FK
+                    blog_ids = {blog_id for blog_id, _ in batch}
+                    existing = set(connection.scalars(select(BlogPost.id).where(BlogPost.id.in_(blog_ids))))
+                    rows = [
+                        {"blog_id": blog_id, "day": day, "views": views}
+                        for (blog_id, day), views in batch.items()
+                        if blog_id in existing
+                    ]
+                    if rows:
+                        connection.execute(self._upsert, rows)
+            except Exception:
+                with self._lock:
+                    self._pending.update(batch)
+                logger.exception("Error flushing view counts")
+                return 0
+
+            metrics.increment("views.flushed_rows", len(rows))
+            popular_cache.invalidate()
+            return len(rows)
+
+    def start(self):
+        """Flush periodically in a background thread (one per worker process)"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="view-counter", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and flush what is left"""
+        self._stop.set()
+        self._thread = None
+        self.flush()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+
+counter = ViewCounter(
+    write_engine,
+    interval=settings.VIEW_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.VIEW_FLUSH_MAX_PENDING,
+)
+
+
+# ============================================================================
+# Popular posts
+# ============================================================================
+def popular_posts(db, window="week", limit=5):
+    """[{id, title, excerpt, created_at, views}] of published posts, most viewed first"""
+    since = date.today() - timedelta(days=WINDOWS[window] - 1)
+    views = func.sum(BlogViewCount.views).label("views")
+    rows = db.query(BlogPost.id, BlogPost.title, BlogPost.excerpt, BlogPost.created_at, views)\
+        .join(BlogViewCount, BlogViewCount.blog_id == BlogPost.id)\
+        .filter(BlogViewCount.day >= since, BlogPost.published.is_(True))\
+        .group_by(BlogPost.id, BlogPost.title, BlogPost.excerpt, BlogPost.created_at)\
+        .order_by(views.desc(), BlogPost.id.desc())\
+        .limit(limit)\
+        .all()
+    return [row._asdict() for row in rows]
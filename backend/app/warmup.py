@@ -0,0 +1,161 @@
+"""
+Warm-up and readiness
+Hides cold starts: at startup a background thread opens the pools'
+baseline connections, runs each hot public query once (so SQLAlchemy and
+Pydantic compile and cache everything) and fills the response caches.
+A second thread probes the database periodically, so /ready and
+/api/health report the last result instead of querying on every probe.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+from fastapi import Response
+from sqlalchemy import text
+
+from .config import settings
+from .database import ReadSessionLocal, read_engine, write_engine
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+# Shared, read by /ready and /api/health
+state = {
+    "warm": False,
+    "started_at": None,
+    "warmed_at": None,
+    "duration_ms": None,
+    "steps": {},
+    "probe": {"ok": None, "checked_at": None, "latency_ms": None, "error": None},
+}
+
+_stop = threading.Event()
+
+
+def open_baseline_connections(engine):
+    """Check out pool_size connections at once so they are all established"""
+    connections = []
+    try:
+        for _ in range(engine.pool.size()):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+def run_hot_queries():
+    """Call each hot public read route once, exactly as a request would"""
+    from .routers import blogs, papers, research
+    from .schemas import BlogPostResponse, PublicationResponse, ResearchProjectResponse
+
+    db = ReadSessionLocal()
+    try:
+        for limit in (10, 100):
+            blogs.get_all_blogs(skip=0, limit=limit, db=db)
+
+        rows = papers.get_all_publications(response=Response(), year=None, journal=None, author=None, skip=0, limit=100, db=db)
+        for row in rows:
+            PublicationResponse.model_validate(row)
+        papers.get_publication_facets(db=db)
+
+        rows = research.get_all_projects(response=Response(), status=None, technology=None, skip=0, limit=100, db=db)
+        for row in rows:
+            ResearchProjectResponse.model_validate(row)
+        research.get_project_counts(db=db)
+
+        first_blog = db.query(blogs.BlogPost.id).first()
+        if first_blog:
+            BlogPostResponse.model_validate(blogs.get_blog(first_blog[0], db=db))
+    finally:
+        db.close()
+
+
+def fill_citation_cache():
+    """Render the citation formats shown on the papers page"""
+    from .citations import render_citation
+    from .models import Publication
+
+    db = ReadSessionLocal()
+    try:
+        publications = db.query(Publication).limit(500).all()
+        for publication in publications:
+            render_citation(publication, "bibtex")
+            render_citation(publication, "apa")
+        return len(publications)
+    finally:
+        db.close()
+
+
+def warm_up():
+    """Run every warm-up step; failures are recorded but never fatal"""
+    state["started_at"] = datetime.now().isoformat()
+    start = time.perf_counter()
+
+    steps = [
+        ("write_pool", lambda: open_baseline_connections(write_engine)),
+        ("read_pool", lambda: open_baseline_connections(read_engine)),
+        ("hot_queries", run_hot_queries),
+        ("citations", fill_citation_cache),
+    ]
+    for name, step in steps:
+        step_start = time.perf_counter()
+        try:
+            result = step()
+            state["steps"][name] = {
+                "ok": True,
+                "ms": round((time.perf_counter() - step_start) * 1000, 1),
+                "result": result,
+            }
+        except Exception as e:
+            state["steps"][name] = {"ok": False, "error": str(e)}
+            logger.exception("Error in warm-up step %s", name)
+
+    state["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    state["warmed_at"] = datetime.now().isoformat()
+    state["warm"] = True
+    logger.info("Warm-up finished in %s ms", state["duration_ms"])
+
+
+def probe_database():
+    """Run SELECT 1 on the read pool and record the outcome"""
+    start = time.perf_counter()
+    try:
+        with read_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        state["probe"] = {
+            "ok": True,
+            "checked_at": datetime.now().isoformat(),
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            "error": None,
+        }
+    except Exception as e:
+        state["probe"] = {
+            "ok": False,
+            "checked_at": datetime.now().isoformat(),
+            "latency_ms": None,
+            "error": str(e),
+        }
+        logger.warning("Database probe failed: %s", e)
+
+
+def _probe_loop():
+    while not _stop.is_set():
+        probe_database()
+        _stop.wait(settings.DB_PROBE_INTERVAL_SECONDS)
+
+
+def start():
+    """Start the warm-up and the periodic DB probe in background threads"""
+    _stop.clear()
+    threading.Thread(target=warm_up, name="warmup", daemon=True).start()
+    threading.Thread(target=_probe_loop, name="db-probe", daemon=True).start()
+
+
+def stop():
+    _stop.set()
+
+
+def is_ready():
+    return state["warm"] and state["probe"]["ok"] is True
@@ -0,0 +1,91 @@
+"""
+Micro-benchmark: per-call overhead of hot single-row lookups
+
+Compares the legacy Query pattern the routers used with Session.get().
+Uses an in-memory SQLite database so the numbers are dominated by
+Python-side ORM overhead.
+
+Usage (from backend/):
+    python -m benchmarks.lookups [--calls 20000]
+"""
+
+import argparse
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import BlogPost
+
+
+def setup(rows):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    with Session() as db:
+        db.add_all(BlogPost(title=f"Post {i}", content="x" * 2000, tags="a,b") for i in range(rows))
+        db.commit()
+    return Session
+
+
+def timed(name, calls, fn):
+    fn(0)  # compile once before timing
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    per_call = elapsed / calls * 1e6
+    print(f"{name:<44} {per_call:8.1f} µs/call  {calls / elapsed:10.0f} calls/s")
+    return per_call
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    Session = setup(args.rows)
+    rows = args.rows
+
+    # One session per call, like one request per call
+    def legacy_query(i):
+        with Session() as db:
+            db.query(BlogPost).filter(BlogPost.id == i % rows + 1).first()
+
+    def session_get(i):
+        with Session() as db:
+            db.get(BlogPost, i % rows + 1)
+
+    # Repeated lookup inside one request (e.g. handler + dependency).
+    # The identity map is weak, so keep the row referenced like a handler would.
+    shared = Session()
+    loaded = shared.get(BlogPost, 1)
+
+    def legacy_query_repeat(i):
+        shared.query(BlogPost).filter(BlogPost.id == 1).first()
+
+    def session_get_repeat(i):
+        shared.get(BlogPost, 1)
+
+    print(f"{args.calls} calls, {rows} rows\n")
+    before = timed("before: query().filter(id == x).first()", args.calls, legacy_query)
+    after = timed("after:  session.get(Model, x)", args.calls, session_get)
+    print(f"{'':<44} {before / after:8.2f}x\n")
+
+    before = timed("before: repeated query() in one session", args.calls, legacy_query_repeat)
+    after = timed("after:  repeated get() (identity map hit)", args.calls, session_get_repeat)
+    print(f"{'':<44} {before / after:8.2f}x")
+
+    del loaded
+    shared.close()
+
+
+if __name__ == "__main__":
+    main()
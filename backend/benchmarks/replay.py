@@ -0,0 +1,176 @@
+"""
+Load test: replay a recorded traffic trace against a running instance
+
+Record a trace by starting the server with TRACE_FILE=trace.jsonl (see
+app/logs.py), then replay it against a local instance. Requests keep their
+recorded spacing divided by --speed, so 10 / 100 replay the same mix at
+10x / 100x the original rate. Traces hold no bodies, so only GET / HEAD
+requests are replayed unless --include-writes is given (writes are then
+sent without a body and mostly fail validation - useful for routing cost
+only). Requests recorded with an Authorization header are sent with a
+token obtained from --username / --password.
+
+Prints, per route: requests, errors, replayed p50 / p95 / p99 / max and
+the recorded p50 for comparison, plus how far the scheduler fell behind.
+
+Usage (from backend/):
+    python -m benchmarks.replay trace.jsonl [--base-url http://localhost:8000] [--speed 10]
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlencode
+
+import requests
+
+READ_METHODS = ("GET", "HEAD")
+_PARAM = re.compile(r"\{(\w+)(?::\w+)?\}")
+
+
+def load(path):
+    entries = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # A line cut off by a crash
+    entries.sort(key=lambda entry: entry["ts"])
+    return entries
+
+
+def url_for(entry):
+    """Concrete path (+ query) of a trace entry"""
+    if entry.get("route"):
+        params = entry.get("params", {})
+        path = _PARAM.sub(lambda m: quote(params.get(m.group(1), ""), safe="/"), entry["route"])
+    else:
+        path = entry["path"]
+    if entry.get("query"):
+        path += "?" + urlencode([tuple(pair) for pair in entry["query"]])
+    return path
+
+
+def login(base_url, username, password):
+    response = requests.post(f"{base_url}/api/auth/login", json={"username": username, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+class Results:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)  # route -> [ms]
+        self.recorded = defaultdict(list)  # route -> [ms] from the trace
+        self.errors = defaultdict(int)
+        self.max_lag = 0.0
+
+    def add(self, key, ms, recorded_ms, failed, lag):
+        with self._lock:
+            self.latencies[key].append(ms)
+            self.recorded[key].append(recorded_ms)
+            if failed:
+                self.errors[key] += 1
+            self.max_lag = max(self.max_lag, lag)
+
+    def report(self):
+        header = f"{'route':<48} {'reqs':>6} {'errs':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'rec p50':>8}"
+        print(header)
+        print("-" * len(header))
+        ordered = sorted(self.latencies.items(), key=lambda item: -len(item[1]))
+        for key, values in ordered:
+            values.sort()
+            recorded = sorted(self.recorded[key])
+            print(
+                f"{key[:48]:<48} {len(values):>6} {self.errors[key]:>5} "
+                f"{percentile(values, 0.5):>8.1f} {percentile(values, 0.95):>8.1f} "
+                f"{percentile(values, 0.99):>8.1f} {values[-1]:>8.1f} {percentile(recorded, 0.5):>8.1f}"
+            )
+        print(f"\nLatencies in ms; max scheduling lag {self.max_lag * 1000:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("trace")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--speed", type=float, default=1.0, help="1 = recorded rate, 10 = ten times faster")
+    parser.add_argument("--workers", type=int, default=64, help="Maximum requests in flight")
+    parser.add_argument("--limit", type=int, default=0, help="Replay only the first N requests")
+    parser.add_argument("--include-writes", action="store_true")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password")
+    args = parser.parse_args(argv)
+
+    base_url = args.base_url.rstrip("/")
+    entries = load(args.trace)
+    skipped = 0
+    if not args.include_writes:
+        kept = [entry for entry in entries if entry["method"] in READ_METHODS]
+        skipped = len(entries) - len(kept)
+        entries = kept
+    if args.limit:
+        entries = entries[:args.limit]
+    if not entries:
+        print("Nothing to replay")
+        return
+
+    token = None
+    if any(entry.get("auth") for entry in entries):
+        if args.password:
+            token = login(base_url, args.username, args.password)
+        else:
+            print("⚠️  Trace has authenticated requests but no --password; sending them anonymously")
+
+    span = entries[-1]["ts"] - entries[0]["ts"]
+    print(f"🔁 Replaying {len(entries)} requests ({skipped} writes skipped) recorded over {span:.1f}s "
+          f"at {args.speed:g}x against {base_url}")
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=args.workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    results = Results()
+
+    def send(entry, due):
+        headers = {"Authorization": f"Bearer {token}"} if entry.get("auth") and token else {}
+        key = f"{entry['method']} {entry.get('route') or '(unmatched)'}"
+        lag = time.perf_counter() - due
+        start = time.perf_counter()
+        try:
+            response = session.request(entry["method"], base_url + url_for(entry), headers=headers, allow_redirects=False)
+            # Errors are status changes from the recording, not 4xx the original also got
+            failed = response.status_code >= 500 or (response.status_code >= 400) != (entry["status"] >= 400)
+        except requests.RequestException:
+            failed = True
+        results.add(key, (time.perf_counter() - start) * 1000, entry["ms"], failed, lag)
+
+    first = entries[0]["ts"]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        for entry in entries:
+            due = started + (entry["ts"] - first) / args.speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, entry, due)
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ Done in {elapsed:.1f}s ({len(entries) / elapsed:.0f} req/s)\n")
+    results.report()
+
+
+if __name__ == "__main__":
+    main()
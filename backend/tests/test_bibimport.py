@@ -0,0 +1,34 @@
+import io
+
+from app.bibimport import PARSE_ERROR, iter_bibtex, iter_records
+
+
+def _entries(text):
+    return list(iter_bibtex(io.StringIO(text)))
+
+
+def test_at_sign_in_comment_does_not_swallow_next_entry():
+    text = (
+        "% contact me@x.org for corrections\n"
+        "@article{k1,\n  title={First},\n  author={Smith, J}\n}\n"
+        "@article{k2, title={Second}, author={Doe, K}}\n"
+    )
+    assert [entry["_key"] for entry in _entries(text)] == ["k1", "k2"]
+
+
+def test_preamble_text_with_email_is_ignored():
+    text = "Exported by someone@example.com\n@misc{k1, title={Only}}\n"
+    assert [entry["title"] for entry in _entries(text)] == ["Only"]
+
+
+def test_parenthesized_entry():
+    entries = _entries("@article(k1, title={With (parens) inside}, year=2020)\n")
+    assert entries[0]["title"] == "With (parens) inside"
+    assert entries[0]["year"] == "2020"
+
+
+def test_unparseable_entries_are_reported():
+    text = "@article{no key here}\n@article{k2, title={Fine}}\n@article{k3, title={Never closed}\n"
+    records = list(iter_records(io.StringIO(text), "bibtex"))
+    assert [PARSE_ERROR in record for record in records] == [True, False, True]
+    assert records[1]["title"] == "Fine"
@@ -0,0 +1,21 @@
+from types import SimpleNamespace
+
+from app.citations import citation_key, format_mla
+
+
+def _publication(authors, id=1, title="A paper", year=2022):
+    return SimpleNamespace(id=id, authors=authors, title=title, journal="J", year=year, doi=None)
+
+
+def test_mla_two_authors_without_given_names():
+    assert format_mla(_publication("Smith and Doe")) == "Smith and Doe. “A paper.” J, 2022."
+
+
+def test_mla_two_authors_with_given_names():
+    assert format_mla(_publication("John Smith and Jane Doe")) == "Smith, John, and Jane Doe. “A paper.” J, 2022."
+
+
+def test_citation_keys_are_unique():
+    first = citation_key(_publication("Smith", id=1, title="Paper one"))
+    second = citation_key(_publication("Smith", id=2, title="Paper two"))
+    assert first != second
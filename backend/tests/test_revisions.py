@@ -0,0 +1,20 @@
+from app.revisions import diff_revisions
+
+
+def test_diff_without_trailing_newline_keeps_lines_apart():
+    diff = diff_revisions({"content": "a\nb"}, {"content": "a\nc"})["content_diff"]
+    lines = diff.splitlines()
+    assert "-b" in lines
+    assert "+c" in lines
+    assert "-b+c" not in diff
+
+
+def test_diff_with_trailing_newline_unchanged():
+    diff = diff_revisions({"content": "a\nb\n"}, {"content": "a\nc\n"})["content_diff"]
+    assert diff.endswith("-b\n+c\n")
+
+
+def test_short_field_changes():
+    result = diff_revisions({"title": "Old", "content": "x"}, {"title": "New", "content": "x"})
+    assert result["fields"] == {"title": {"from": "Old", "to": "New"}}
+    assert result["content_diff"] == ""
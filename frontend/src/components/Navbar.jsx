@@ -1,6 +1,7 @@
 import { useState } from 'react';
 import { Link, useLocation } from 'react-router-dom';
 import { Menu, X } from 'lucide-react';
+import SearchBox from './SearchBox';
 
 const Navbar = () => {
   const [isOpen, setIsOpen] = useState(false);
@@ -43,6 +44,7 @@ const Navbar = () => {
                 {link.name}
               </Link>
             ))}
+            <SearchBox />
           </div>
 
           {/* Mobile menu button */}
@@ -0,0 +1,99 @@
+import { useState, useEffect, useRef } from 'react';
+import { useNavigate } from 'react-router-dom';
+import { Search } from 'lucide-react';
+import { suggestAPI } from '../utils/api';
+
+const KIND_LABELS = {
+  blog: 'Blog',
+  paper: 'Publication',
+  research: 'Research',
+  tag: 'Tag',
+  author: 'Author',
+};
+
+// Where a suggestion leads: detail pages where they exist, list pages otherwise
+const suggestionPath = (item) => {
+  switch (item.kind) {
+    case 'blog':
+      return `/blog/${item.id}`;
+    case 'research':
+      return `/research/${item.id}`;
+    case 'tag':
+      return '/blog';
+    default:
+      return '/papers';
+  }
+};
+
+const SearchBox = () => {
+  const [query, setQuery] = useState('');
+  const [suggestions, setSuggestions] = useState([]);
+  const [open, setOpen] = useState(false);
+  const latest = useRef('');
+  const navigate = useNavigate();
+
+  useEffect(() => {
+    const q = query.trim();
+    latest.current = q;
+    if (!q) {
+      setSuggestions([]);
+      return;
+    }
+    // Short debounce - the endpoint is in-memory, this only saves round trips
+    const timer = setTimeout(async () => {
+      try {
+        const response = await suggestAPI.get(q);
+        // Ignore answers for a query the user has already typed past
+        if (latest.current === q) {
+          setSuggestions(response.data);
+        }
+      } catch (err) {
+        setSuggestions([]);
+      }
+    }, 120);
+    return () => clearTimeout(timer);
+  }, [query]);
+
+  const choose = (item) => {
+    setQuery('');
+    setSuggestions([]);
+    setOpen(false);
+    navigate(suggestionPath(item));
+  };
+
+  return (
+    <div className="relative">
+      <div className="flex items-center border border-gray-300 rounded-md px-2 py-1 focus-within:border-primary-500">
+        <Search className="w-4 h-4 text-gray-400 mr-2" />
+        <input
+          type="search"
+          value={query}
+          onChange={(e) => setQuery(e.target.value)}
+          onFocus={() => setOpen(true)}
+          onBlur={() => setTimeout(() => setOpen(false), 150)}
+          placeholder="Search..."
+          className="text-sm outline-none w-40"
+          aria-label="Search"
+        />
+      </div>
+      {open && suggestions.length > 0 && (
+        <ul className="absolute right-0 mt-1 w-72 bg-white border rounded-md shadow-lg z-50">
+          {suggestions.map((item) => (
+            <li key={`${item.kind}-${item.id ?? item.text}`}>
+              <button
+                type="button"
+                onMouseDown={() => choose(item)}
+                className="w-full text-left px-3 py-2 hover:bg-gray-50 flex justify-between gap-2"
+              >
+                <span className="text-sm text-gray-800 truncate">{item.text}</span>
+                <span className="text-xs text-gray-400 shrink-0">{KIND_LABELS[item.kind]}</span>
+              </button>
+            </li>
+          ))}
+        </ul>
+      )}
+    </div>
+  );
+};
+
+export default SearchBox;
@@ -63,7 +63,7 @@ const Admin = () => {
     try {
       if (editingId) {
         // ✅ UPDATE existing blog
-        await blogAPI.update(editingId, formData);
+        await blogAPI.update(editingId, formData, blogs.find((item) => item.id === editingId));
         alert('✅ Blog post updated successfully!');
       } else {
         // CREATE new blog
@@ -85,7 +85,11 @@ const Admin = () => {
       fetchBlogs();
     } catch (err) {
       console.error('Error:', err);
-      alert('❌ Error saving blog post');
+      if (err.response?.status === 409) {
+        alert('⚠️ This blog post was changed in another tab. Reload and try again.');
+      } else {
+        alert('❌ Error saving blog post');
+      }
     }
   };
 
@@ -8,16 +8,19 @@ import {
   User,
   Shield,
   Activity,
-  Calendar
+  Calendar,
+  Mail
 } from 'lucide-react';
-import { authAPI, blogAPI, researchAPI, papersAPI } from '../utils/api';
+import { adminAPI, authAPI } from '../utils/api';
 
 const AdminDashboard = () => {
   const navigate = useNavigate();
   const [stats, setStats] = useState({
-    blogs: 0,
-    research: 0,
-    papers: 0,
+    blogs: { total: 0, published: 0, draft: 0, last_updated: null },
+    papers: { total: 0, last_updated: null },
+    research: { total: 0, last_updated: null },
+    messages: { total: 0, unread: 0, last_updated: null },
+    posts_per_month: [],
   });
   const [username, setUsername] = useState('');
 
@@ -45,17 +48,8 @@ const AdminDashboard = () => {
 
   const fetchStats = async () => {
     try {
-      const [blogsRes, researchRes, papersRes] = await Promise.all([
-        blogAPI.getAll(0, 100),
-        researchAPI.getAll(),
-        papersAPI.getAll(),
-      ]);
-      
-      setStats({
-        blogs: blogsRes.data.length,
-        research: researchRes.data.length,
-        papers: papersRes.data.length,
-      });
+      const response = await adminAPI.getStats();
+      setStats(response.data);
     } catch (err) {
       console.error('Error fetching stats:', err);
     }
@@ -68,33 +62,49 @@ const AdminDashboard = () => {
     }
   };
 
+  const formatUpdated = (timestamp) => {
+    if (!timestamp) return 'Never updated';
+    // Stored in UTC without a timezone suffix
+    return `Updated ${new Date(`${timestamp}Z`).toLocaleString('en-US', {
+      month: 'short',
+      day: 'numeric',
+      hour: 'numeric',
+      minute: '2-digit',
+    })}`;
+  };
+
   const adminSections = [
     {
       title: 'Blog Posts',
       icon: BookOpen,
-      count: stats.blogs,
+      count: stats.blogs.total,
       color: 'blue',
       path: '/admin/blogs',
-      description: 'Manage blog posts and articles',
+      description: `${stats.blogs.published} published, ${stats.blogs.draft} drafts`,
+      updated: stats.blogs.last_updated,
     },
     {
       title: 'Research Projects',
       icon: FlaskConical,
-      count: stats.research,
+      count: stats.research.total,
       color: 'green',
       path: '/admin/research',
       description: 'Manage research projects and work',
+      updated: stats.research.last_updated,
     },
     {
       title: 'Publications',
       icon: FileText,
-      count: stats.papers,
+      count: stats.papers.total,
       color: 'purple',
       path: '/admin/papers',
       description: 'Manage academic papers and publications',
+      updated: stats.papers.last_updated,
     },
   ];
 
+  const maxPostsPerMonth = Math.max(1, ...stats.posts_per_month.map((item) => item.count));
+
   const getColorClasses = (color) => {
     const colors = {
       blue: 'bg-blue-100 text-blue-600 border-blue-200',
@@ -157,11 +167,57 @@ const AdminDashboard = () => {
                 <p className="text-gray-600 text-sm">
                   {section.description}
                 </p>
+                <p className="text-gray-400 text-xs mt-2">
+                  {formatUpdated(section.updated)}
+                </p>
               </button>
             );
           })}
         </div>
 
+        {/* Activity */}
+        <div className="grid grid-cols-1 md:grid-cols-3 gap-6 mb-8">
+          <div className="bg-white rounded-lg shadow-md p-6">
+            <div className="flex items-start justify-between mb-4">
+              <div className="p-3 rounded-lg bg-orange-100 text-orange-600 border-orange-200">
+                <Mail className="w-6 h-6" />
+              </div>
+              <span className="text-3xl font-bold text-gray-900">
+                {stats.messages.unread}
+              </span>
+            </div>
+            <h3 className="text-xl font-semibold text-gray-900 mb-2">Unread Messages</h3>
+            <p className="text-gray-600 text-sm">
+              {stats.messages.total} contact messages in total
+            </p>
+            <p className="text-gray-400 text-xs mt-2">
+              {formatUpdated(stats.messages.last_updated)}
+            </p>
+          </div>
+
+          <div className="bg-white rounded-lg shadow-md p-6 md:col-span-2">
+            <h3 className="text-xl font-semibold text-gray-900 mb-4">Posts per Month</h3>
+            {stats.posts_per_month.length === 0 ? (
+              <p className="text-gray-500 text-sm">No blog posts yet</p>
+            ) : (
+              <div className="space-y-2">
+                {stats.posts_per_month.map((item) => (
+                  <div key={item.month} className="flex items-center gap-3 text-sm">
+                    <span className="w-16 text-gray-600">{item.month}</span>
+                    <div className="flex-1 bg-gray-100 rounded h-3">
+                      <div
+                        className="bg-blue-500 h-3 rounded"
+                        style={{ width: `${(item.count / maxPostsPerMonth) * 100}%` }}
+                      />
+                    </div>
+                    <span className="w-6 text-right text-gray-700">{item.count}</span>
+                  </div>
+                ))}
+              </div>
+            )}
+          </div>
+        </div>
+
         {/* Quick Actions */}
         <div className="bg-white rounded-lg shadow-md p-6">
           <h2 className="text-2xl font-bold text-gray-900 mb-6">Quick Actions</h2>
@@ -56,7 +56,7 @@ const AdminPapers = () => {
     e.preventDefault();
     try {
       if (editingId) {
-        await papersAPI.update(editingId, formData);
+        await papersAPI.update(editingId, formData, papers.find((item) => item.id === editingId));
         alert('✅ Publication updated successfully!');
       } else {
         await papersAPI.create(formData);
@@ -67,7 +67,11 @@ const AdminPapers = () => {
       fetchPapers();
     } catch (err) {
       console.error('Error:', err);
-      alert('❌ Error saving publication');
+      if (err.response?.status === 409) {
+        alert('⚠️ This publication was changed in another tab. Reload and try again.');
+      } else {
+        alert('❌ Error saving publication');
+      }
     }
   };
 
@@ -55,7 +55,7 @@ const AdminResearch = () => {
     e.preventDefault();
     try {
       if (editingId) {
-        await researchAPI.update(editingId, formData);
+        await researchAPI.update(editingId, formData, projects.find((item) => item.id === editingId));
         alert('✅ Research project updated successfully!');
       } else {
         await researchAPI.create(formData);
@@ -66,7 +66,11 @@ const AdminResearch = () => {
       fetchProjects();
     } catch (err) {
       console.error('Error:', err);
-      alert('❌ Error saving research project');
+      if (err.response?.status === 409) {
+        alert('⚠️ This research project was changed in another tab. Reload and try again.');
+      } else {
+        alert('❌ Error saving research project');
+      }
     }
   };
 
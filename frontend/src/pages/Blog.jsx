@@ -7,9 +7,11 @@ const Blog = () => {
   const [blogs, setBlogs] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [popular, setPopular] = useState([]);
 
   useEffect(() => {
     fetchBlogs();
+    fetchPopular();
   }, []);
 
   const fetchBlogs = async () => {
@@ -25,6 +27,16 @@ const Blog = () => {
     }
   };
 
+  const fetchPopular = async () => {
+    try {
+      const response = await blogAPI.getPopular('week', 5);
+      setPopular(response.data);
+    } catch (err) {
+      // The "Most read" list is optional
+      setPopular([]);
+    }
+  };
+
   const formatDate = (dateString) => {
     const date = new Date(dateString);
     return date.toLocaleDateString('en-US', {
@@ -66,6 +78,25 @@ const Blog = () => {
           </p>
         </div>
 
+        {/* Most Read This Week */}
+        {popular.length > 0 && (
+          <div className="bg-white rounded-lg shadow-md p-6 mb-12">
+            <h2 className="text-xl font-bold text-gray-900 mb-4">Most Read This Week</h2>
+            <ol className="space-y-2 list-decimal list-inside">
+              {popular.map((post) => (
+                <li key={post.id} className="text-gray-700">
+                  <Link to={`/blog/${post.id}`} className="text-primary-600 hover:text-primary-700 font-medium">
+                    {post.title}
+                  </Link>
+                  <span className="text-sm text-gray-500 ml-2">
+                    {post.views} {post.views === 1 ? 'view' : 'views'}
+                  </span>
+                </li>
+              ))}
+            </ol>
+          </div>
+        )}
+
         {/* Blog Posts */}
         {blogs.length === 0 ? (
           <div className="text-center py-12">
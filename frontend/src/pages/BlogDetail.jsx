@@ -12,9 +12,11 @@ const BlogDetail = () => {
   const [blog, setBlog] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [related, setRelated] = useState([]);
 
   useEffect(() => {
     fetchBlog();
+    fetchRelated();
   }, [id]);
 
   const fetchBlog = async () => {
@@ -30,6 +32,16 @@ const BlogDetail = () => {
     }
   };
 
+  const fetchRelated = async () => {
+    try {
+      const response = await blogAPI.getRelated(id);
+      setRelated(response.data);
+    } catch (err) {
+      // Related posts are optional - the post itself still renders
+      setRelated([]);
+    }
+  };
+
   const formatDate = (dateString) => {
     const date = new Date(dateString);
     return date.toLocaleDateString('en-US', {
@@ -174,6 +186,28 @@ const BlogDetail = () => {
           </div>
         </div>
 
+        {/* Related Posts */}
+        {related.length > 0 && (
+          <section className="mt-8">
+            <h2 className="text-2xl font-bold text-gray-900 mb-4">Related Posts</h2>
+            <div className="grid gap-4 md:grid-cols-3">
+              {related.map((post) => (
+                <Link
+                  key={post.id}
+                  to={`/blog/${post.id}`}
+                  className="bg-white rounded-lg shadow-md p-5 hover:shadow-lg transition-shadow"
+                >
+                  <h3 className="font-semibold text-gray-900 mb-2">{post.title}</h3>
+                  {post.excerpt && (
+                    <p className="text-sm text-gray-600 line-clamp-3">{post.excerpt}</p>
+                  )}
+                  <p className="text-xs text-gray-500 mt-3">{formatDate(post.created_at)}</p>
+                </Link>
+              ))}
+            </div>
+          </section>
+        )}
+
         {/* Back to Blog Button */}
         <div className="mt-8 text-center">
           <Link to="/blog" className="btn-primary">
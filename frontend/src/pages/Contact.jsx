@@ -8,6 +8,7 @@ const Contact = () => {
     email: '',
     subject: '',
     message: '',
+    website: '',  // Honeypot - hidden from people, filled in by bots
   });
 
   const [status, setStatus] = useState({
@@ -30,7 +31,7 @@ const Contact = () => {
     try {
       await contactAPI.send(formData);
       setStatus({ submitting: false, submitted: true, error: null });
-      setFormData({ name: '', email: '', subject: '', message: '' });
+      setFormData({ name: '', email: '', subject: '', message: '', website: '' });
       
       // Reset success message after 5 seconds
       setTimeout(() => {
@@ -150,6 +151,20 @@ const Contact = () => {
               )}
 
               <form onSubmit={handleSubmit} className="space-y-6">
+                {/* Honeypot: off-screen, skipped by keyboard and autofill */}
+                <div aria-hidden="true" style={{ position: 'absolute', left: '-10000px' }}>
+                  <label htmlFor="website">Website</label>
+                  <input
+                    type="text"
+                    id="website"
+                    name="website"
+                    tabIndex={-1}
+                    autoComplete="off"
+                    value={formData.website}
+                    onChange={handleChange}
+                  />
+                </div>
+
                 {/* Name */}
                 <div>
                   <label
@@ -78,11 +78,22 @@ const Research = () => {
                 {/* Project Image */}
                 {project.image_url && (
                   <div className="mb-4 overflow-hidden rounded-lg">
-                    <img
-                      src={project.image_url}
-                      alt={project.title}
-                      className="w-full h-48 object-cover group-hover:scale-110 transition-transform duration-300"
-                    />
+                    <picture>
+                      {project.srcset?.avif && (
+                        <source type="image/avif" srcSet={project.srcset.avif} sizes="(min-width: 768px) 33vw, 100vw" />
+                      )}
+                      {project.srcset?.webp && (
+                        <source type="image/webp" srcSet={project.srcset.webp} sizes="(min-width: 768px) 33vw, 100vw" />
+                      )}
+                      <img
+                        src={project.image_variants?.card?.jpeg || project.image_url}
+                        srcSet={project.srcset?.jpeg}
+                        sizes="(min-width: 768px) 33vw, 100vw"
+                        alt={project.title}
+                        loading="lazy"
+                        className="w-full h-48 object-cover group-hover:scale-110 transition-transform duration-300"
+                      />
+                    </picture>
                   </div>
                 )}
 
@@ -28,10 +28,30 @@ api.interceptors.response.use(
       localStorage.removeItem('adminToken');
       window.location.href = '/admin/login';
     }
+    // Server shedding load: retry a read once, after the advertised delay
+    const config = error.config;
+    if (error.response?.status === 503 && config?.method === 'get' && !config._retried) {
+      config._retried = true;
+      const seconds = Math.min(Number(error.response.headers['retry-after']) || 2, 10);
+      await new Promise((resolve) => setTimeout(resolve, seconds * 1000));
+      return api(config);
+    }
     return Promise.reject(error);
   }
 );
 
+// PATCH body: only the fields that differ from `original`, plus the
+// version being edited (the API answers 409 if someone saved first)
+const changedFields = (original, data) => {
+  const changes = { version: original.version };
+  Object.keys(data).forEach((key) => {
+    if (String(data[key] ?? '') !== String(original[key] ?? '')) {
+      changes[key] = data[key];
+    }
+  });
+  return changes;
+};
+
 // Auth API
 export const authAPI = {
   login: (username, password) => 
@@ -43,33 +63,79 @@ export const authAPI = {
 export const blogAPI = {
   getAll: (skip = 0, limit = 10) => api.get(`/api/blogs/?skip=${skip}&limit=${limit}`),
   getById: (id) => api.get(`/api/blogs/${id}`),
+  getPopular: (window = 'week', limit = 5) => api.get('/api/blogs/popular', { params: { window, limit } }),
+  getRelated: (id, limit = 3) => api.get(`/api/blogs/${id}/related?limit=${limit}`),
   create: (data) => api.post('/api/blogs/', data),
-  update: (id, data) => api.put(`/api/blogs/${id}`, data),  // ✅ ADD
+  update: (id, data, original) => original
+    ? api.patch(`/api/blogs/${id}`, changedFields(original, data))
+    : api.put(`/api/blogs/${id}`, data),
   delete: (id) => api.delete(`/api/blogs/${id}`),
 };
 
 // Research API
 export const researchAPI = {
-  getAll: () => api.get('/api/research/'),
+  getAll: (params = {}) => api.get('/api/research/', { params }),  // status, technology, skip, limit
+  getCounts: () => api.get('/api/research/counts'),
   getById: (id) => api.get(`/api/research/${id}`),
   create: (data) => api.post('/api/research/', data),
-  update: (id, data) => api.put(`/api/research/${id}`, data),  // ✅ ADD
+  update: (id, data, original) => original
+    ? api.patch(`/api/research/${id}`, changedFields(original, data))
+    : api.put(`/api/research/${id}`, data),
   delete: (id) => api.delete(`/api/research/${id}`),  // ✅ ADD
+  uploadImage: (id, file) => {
+    const formData = new FormData();
+    formData.append('file', file);
+    return api.post(`/api/research/${id}/image`, formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+  },
 };
 
 // Papers API
 export const papersAPI = {
-  getAll: () => api.get('/api/papers/'),
+  getAll: (params = {}) => api.get('/api/papers/', { params }),  // year, journal, author, skip, limit
+  getFacets: () => api.get('/api/papers/facets'),
   getById: (id) => api.get(`/api/papers/${id}`),
+  getRelated: (id, limit = 5) => api.get(`/api/papers/${id}/related?limit=${limit}`),
   create: (data) => api.post('/api/papers/', data),
-  update: (id, data) => api.put(`/api/papers/${id}`, data),  // ✅ ADD
+  update: (id, data, original) => original
+    ? api.patch(`/api/papers/${id}`, changedFields(original, data))
+    : api.put(`/api/papers/${id}`, data),
   delete: (id) => api.delete(`/api/papers/${id}`),  // ✅ ADD
+  uploadPdf: (id, file) => {
+    const formData = new FormData();
+    formData.append('file', file);
+    return api.post(`/api/papers/${id}/pdf`, formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+  },
+  importFile: (file, overwrite = false) => {
+    const formData = new FormData();
+    formData.append('file', file);
+    return api.post(`/api/papers/import?overwrite=${overwrite}`, formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+  },
 };
 
 // Contact API
 export const contactAPI = {
   send: (data) => api.post('/api/contact/', data),
   getAll: () => api.get('/api/contact/'),
+  // selection: { ids, before, sender } - all given filters must match
+  bulkMarkRead: (selection) => api.post('/api/contact/bulk/mark-read', selection),
+  bulkDelete: (selection) => api.post('/api/contact/bulk/delete', selection),
+};
+
+// Admin API
+export const adminAPI = {
+  // Counts, last-updated times and posts per month from one small table
+  getStats: (months = 12) => api.get('/api/admin/stats', { params: { months } }),
+};
+
+// Typeahead API (in-memory index, safe to call per keystroke)
+export const suggestAPI = {
+  get: (q, limit = 8) => api.get('/api/suggest', { params: { q, limit } }),
 };
 
 export default api;
\ No newline at end of file